@@ -0,0 +1 @@
+"""Бенчмарки executor против локальной заглушки Hyperliquid."""
@@ -0,0 +1,44 @@
+"""
+Модуль заглушки Hyperliquid для бенчмарков: симулированная биржа с постоянной ценой.
+"""
+
+from typing import List
+
+from trade_executor.replay.simulated_exchange import SimulatedExchange
+
+
+class MockHyperliquid(SimulatedExchange):
+    """Симулированная биржа, где все монеты стоят price, а ордера исполняются полностью."""
+
+    def __init__(
+        self,
+        coins: List[str],
+        price: float = 10.0,
+        account_value: float = 1_000_000.0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        reject_rate: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None
+    ):
+        """
+        Args:
+            coins: Монеты perp-вселенной.
+            price: Mid-цена всех монет.
+            account_value: Баланс аккаунта в clearinghouseState.
+            latency_ms: Задержка ответа на каждый запрос (мс).
+            jitter_ms: Случайная добавка к задержке, от 0 до jitter_ms (мс).
+            reject_rate: Доля ордеров, отклоняемых биржей.
+            error_rate: Доля запросов /exchange, отвечающих 500.
+            seed: Seed генератора случайных чисел.
+        """
+        super().__init__(
+            coins=coins,
+            price_at=lambda coin: price,
+            account_value=account_value,
+            latency_ms=latency_ms,
+            jitter_ms=jitter_ms,
+            reject_rate=reject_rate,
+            error_rate=error_rate,
+            seed=seed,
+        )
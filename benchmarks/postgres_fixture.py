@@ -0,0 +1,91 @@
+"""
+Модуль временной схемы PostgreSQL с таблицей new_positions для бенчмарков.
+"""
+
+import os
+import uuid
+from typing import Any, Dict, List
+
+import psycopg
+from psycopg.conninfo import make_conninfo
+
+_CREATE_TABLE = """
+    CREATE TABLE new_positions (
+        id SERIAL PRIMARY KEY,
+        position_signature TEXT NOT NULL,
+        coin TEXT NOT NULL,
+        side TEXT NOT NULL,
+        size NUMERIC,
+        entry_price NUMERIC,
+        current_price NUMERIC,
+        unrealized_pnl NUMERIC,
+        pnl_percent NUMERIC,
+        leverage INTEGER,
+        margin_used NUMERIC,
+        liquidation_price NUMERIC,
+        detected_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+"""
+
+_INSERT = """
+    INSERT INTO new_positions (
+        position_signature, coin, side, size, entry_price, current_price,
+        unrealized_pnl, pnl_percent, leverage, margin_used, liquidation_price
+    ) VALUES (
+        %(position_signature)s, %(coin)s, %(side)s, %(size)s, %(entry_price)s, %(entry_price)s,
+        0, 0, %(leverage)s, 0, NULL
+    );
+"""
+
+
+class PostgresFixture:
+    """
+    Отдельная схема в существующей базе: executor видит в ней только свою
+    new_positions через search_path, рабочие таблицы не затрагиваются.
+    Схема удаляется в drop().
+    """
+
+    def __init__(self, dsn: str):
+        """
+        Args:
+            dsn: Строка подключения к базе, в которой можно создавать схемы.
+        """
+        self.schema = f"bench_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self._admin_dsn = dsn
+        # Все подключения executor по этому DSN работают внутри схемы
+        self.dsn = make_conninfo(dsn, options=f"-c search_path={self.schema}")
+
+    def create(self) -> None:
+        """Создаёт схему и таблицу new_positions."""
+        with psycopg.connect(self._admin_dsn, autocommit=True) as conn:
+            conn.execute(f'CREATE SCHEMA "{self.schema}"')
+        with psycopg.connect(self.dsn, autocommit=True) as conn:
+            conn.execute(_CREATE_TABLE)
+
+    def drop(self) -> None:
+        """Удаляет схему со всеми таблицами."""
+        with psycopg.connect(self._admin_dsn, autocommit=True) as conn:
+            conn.execute(f'DROP SCHEMA IF EXISTS "{self.schema}" CASCADE')
+
+    def insert_signals(self, signals: List[Dict[str, Any]]) -> None:
+        """
+        Вставляет пачку сигналов одной транзакцией (detected_at = now()).
+
+        Args:
+            signals: Словари с полями position_signature, coin, side, size, entry_price, leverage.
+        """
+        with psycopg.connect(self.dsn) as conn:
+            with conn.cursor() as cursor:
+                cursor.executemany(_INSERT, signals)
+
+    def pending_count(self) -> int:
+        """Сколько записей осталось в new_positions."""
+        with psycopg.connect(self.dsn) as conn:
+            return conn.execute("SELECT count(*) FROM new_positions").fetchone()[0]
+
+    def __enter__(self) -> "PostgresFixture":
+        self.create()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.drop()
@@ -0,0 +1,279 @@
+"""
+Бенчмарк цикла executor: сигнал -> ордер на локальной заглушке Hyperliquid.
+
+Запуск (нужна PostgreSQL, в которой можно создавать схемы):
+
+    python -m benchmarks.run_benchmark --database-url postgresql://... \\
+        --signals 50 --bursts 5 --latency-ms 30 --reject-rate 0.02
+
+Каждый прогон дописывает строку JSON в файл результатов и сравнивает её
+с последним прогоном с теми же параметрами.
+"""
+
+import argparse
+import dataclasses
+import json
+import logging
+import os
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from eth_account import Account
+
+from trade_executor.config.get_settings import build_settings
+from trade_executor.database.claim_new_positions import ensure_claim_columns
+from trade_executor.database.record_processed_signatures import ensure_processed_signatures_table
+from trade_executor.database.get_connection import get_connection, init_connection_pool, close_connection_pool
+from trade_executor.pipeline.build_context import build_context, close_context
+from trade_executor.pipeline.reconcile_ledger import reconcile_ledger
+from trade_executor.pipeline.run_single_cycle import run_single_cycle
+from trade_executor.replay.run_replay import DiscardingNotifier
+from trade_executor.utils.get_logger import get_logger
+from trade_executor.utils.percentile import percentile
+
+from .mock_hyperliquid import MockHyperliquid
+from .postgres_fixture import PostgresFixture
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _build_signals(burst: int, size: int, leverage: int, price: float) -> List[Dict[str, Any]]:
+    # Каждый сигнал — своя монета, иначе реестр позиций пропустит повтор
+    return [
+        {
+            "position_signature": f"bench-{burst}-{index}",
+            "coin": f"B{burst}C{index}",
+            "side": "LONG" if index % 2 == 0 else "SHORT",
+            "size": 1,
+            "entry_price": price,
+            "leverage": leverage,
+        }
+        for index in range(size)
+    ]
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Прогоняет серии сигналов через run_single_cycle.
+
+    Args:
+        args: Параметры из командной строки.
+
+    Returns:
+        Результат прогона (то, что пишется в файл результатов).
+    """
+    coins = [f"B{burst}C{index}" for burst in range(args.bursts) for index in range(args.signals)]
+    mock = MockHyperliquid(
+        coins=coins,
+        price=args.price,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        reject_rate=args.reject_rate,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    mock.start()
+
+    logger = get_logger("trade_executor.benchmark")
+    logger.setLevel(logging.WARNING)
+
+    samples: Dict[str, List[float]] = defaultdict(list)
+    cycle_durations: List[float] = []
+    drain_durations: List[float] = []
+
+    try:
+        with PostgresFixture(args.database_url) as fixture:
+            settings = dataclasses.replace(
+                build_settings(),
+                database_url=fixture.dsn,
+                hyperliquid_api_url=mock.url,
+                hyperliquid_private_key=args.private_key,
+                wallet_address=Account.from_key(args.private_key).address,
+                websocket_enabled=False,
+                intake_mode="poll",
+                metrics_port=0,
+                claim_batch_size=args.claim_batch_size,
+                max_concurrent_signals=args.concurrency,
+                bulk_orders_enabled=not args.no_bulk,
+                # Сверка с REST только при старте, как в установившемся режиме
+                ledger_reconcile_seconds=3600,
+                ledger_max_age_seconds=3600,
+            )
+
+            init_connection_pool(settings.database_url, min_size=1, max_size=settings.db_pool_max_size)
+            try:
+                with get_connection(settings.database_url) as conn:
+                    ensure_claim_columns(conn)
+                    ensure_processed_signatures_table(conn)
+
+                ctx = build_context(settings, logger)
+                try:
+                    ctx.notifier.close()
+                    ctx.notifier = DiscardingNotifier()
+                    reconcile_ledger(ctx)
+                    # Как в main: фоновая сверка идёт параллельно с циклами
+                    ctx.refresher.start(logger)
+
+                    # Сырые значения этапов нужны для точных перцентилей
+                    observe_stage = ctx.metrics.observe_stage
+
+                    def _record(stage: str, seconds: float | None) -> None:
+                        if seconds is not None:
+                            samples[stage].append(seconds)
+                        observe_stage(stage, seconds)
+
+                    ctx.metrics.observe_stage = _record
+
+                    for burst in range(args.bursts):
+                        fixture.insert_signals(_build_signals(burst, args.signals, args.leverage, args.price))
+                        started = time.perf_counter()
+                        while True:
+                            cycle_started = time.perf_counter()
+                            claimed = run_single_cycle(ctx)
+                            if claimed == 0:
+                                break
+                            cycle_durations.append(time.perf_counter() - cycle_started)
+                        drain_durations.append(time.perf_counter() - started)
+                        if args.pause_seconds:
+                            time.sleep(args.pause_seconds)
+                    leftover = fixture.pending_count()
+                finally:
+                    close_context(ctx)
+            finally:
+                close_connection_pool()
+    finally:
+        mock.stop()
+
+    total_signals = args.signals * args.bursts
+    total_seconds = sum(drain_durations)
+    signals = ctx.metrics.signals
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "params": {
+            "signals": args.signals,
+            "bursts": args.bursts,
+            "concurrency": args.concurrency,
+            "bulk": not args.no_bulk,
+            "claim_batch_size": args.claim_batch_size,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "reject_rate": args.reject_rate,
+            "error_rate": args.error_rate,
+        },
+        "signals_per_sec": total_signals / total_seconds if total_seconds else None,
+        "latency": {
+            stage: {
+                "p50": percentile(values, 50),
+                "p99": percentile(values, 99),
+                "max": max(values),
+                "count": len(values),
+            }
+            for stage, values in sorted(samples.items())
+        },
+        "cycle_seconds_p50": percentile(cycle_durations, 50),
+        "burst_drain_seconds_p50": percentile(drain_durations, 50),
+        "outcomes": {
+            outcome: signals.value(outcome=outcome)
+            for outcome in ("opened", "skipped", "failed", "unknown", "released")
+        },
+        "leftover_rows": leftover,
+        "mock_requests": dict(mock.requests),
+    }
+
+
+def _previous_result(path: str, params: Dict[str, Any]) -> Dict[str, Any] | None:
+    if not os.path.exists(path):
+        return None
+    previous = None
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if result.get("params") == params:
+                previous = result
+    return previous
+
+
+def _format_ms(seconds: float | None) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.1f} ms"
+
+
+def _print_report(result: Dict[str, Any], previous: Dict[str, Any] | None) -> None:
+    print(f"Ревизия: {result['revision']}  параметры: {json.dumps(result['params'])}")
+    print(f"Пропускная способность: {result['signals_per_sec']:.1f} сигналов/сек")
+    print(f"Итоги сигналов: {result['outcomes']}, осталось в очереди: {result['leftover_rows']}")
+    print(f"{'этап':<16}{'p50':>12}{'p99':>12}{'max':>12}{'n':>8}")
+    for stage, stats in result["latency"].items():
+        print(f"{stage:<16}{_format_ms(stats['p50']):>12}{_format_ms(stats['p99']):>12}{_format_ms(stats['max']):>12}{stats['count']:>8}")
+
+    if previous is None:
+        return
+    print(f"\nСравнение с {previous.get('revision')} ({previous.get('timestamp')}):")
+    if previous.get("signals_per_sec") and result["signals_per_sec"]:
+        change = (result["signals_per_sec"] / previous["signals_per_sec"] - 1) * 100
+        print(f"  сигналов/сек: {previous['signals_per_sec']:.1f} -> {result['signals_per_sec']:.1f} ({change:+.1f}%)")
+    before = previous.get("latency", {}).get("end_to_end", {})
+    after = result["latency"].get("end_to_end", {})
+    for key in ("p50", "p99"):
+        if before.get(key) and after.get(key):
+            change = (after[key] / before[key] - 1) * 100
+            print(f"  end_to_end {key}: {_format_ms(before[key])} -> {_format_ms(after[key])} ({change:+.1f}%)")
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Бенчмарк Trade Executor на заглушке Hyperliquid")
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL"),
+                        help="PostgreSQL для временной схемы (или BENCH_DATABASE_URL)")
+    parser.add_argument("--signals", type=int, default=50, help="Сигналов в серии")
+    parser.add_argument("--bursts", type=int, default=5, help="Число серий")
+    parser.add_argument("--pause-seconds", type=float, default=0.0, help="Пауза между сериями")
+    parser.add_argument("--concurrency", type=int, default=4, help="MAX_CONCURRENT_SIGNALS")
+    parser.add_argument("--claim-batch-size", type=int, default=50, help="CLAIM_BATCH_SIZE")
+    parser.add_argument("--no-bulk", action="store_true", help="Отключить пакетную отправку ордеров")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Задержка заглушки на запрос")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="Случайная добавка к задержке")
+    parser.add_argument("--reject-rate", type=float, default=0.0, help="Доля отклоняемых ордеров")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Доля ответов 500 на /exchange")
+    parser.add_argument("--leverage", type=int, default=10, help="Плечо в сигналах")
+    parser.add_argument("--price", type=float, default=10.0, help="Цена всех монет заглушки")
+    parser.add_argument("--seed", type=int, default=1, help="Seed случайных отказов и задержек")
+    parser.add_argument("--private-key", default="0x" + "11" * 32, help="Ключ для подписи (только для заглушки)")
+    parser.add_argument("--output", default="benchmark_results.jsonl", help="Файл результатов (JSON Lines)")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("нужен --database-url или BENCH_DATABASE_URL")
+
+    # build_settings требует обязательные переменные; реальные значения подставляются выше
+    os.environ.setdefault("DATABASE_URL", args.database_url)
+    os.environ.setdefault("HYPERLIQUID_PRIVATE_KEY", args.private_key)
+    os.environ.setdefault("WALLET_ADDRESS", Account.from_key(args.private_key).address)
+    os.environ.setdefault("TELEGRAM_BOT_TOKEN", "benchmark")
+    os.environ.setdefault("TELEGRAM_CHAT_ID", "0")
+
+    result = run_benchmark(args)
+    previous = _previous_result(args.output, result["params"])
+    _print_report(result, previous)
+
+    with open(args.output, "a", encoding="utf-8") as file:
+        file.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Общие фикстуры тестов.
+"""
+
+import pytest
+
+
+class FakeClock:
+    """Подменяет модуль time: monotonic меняется только по advance."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """
+    Фабрика поддельных часов: подменяет time в переданных модулях.
+
+    Пример: clock = fake_clock(rate_limiter); clock.advance(3).
+    """
+    def _patch(*modules) -> FakeClock:
+        clock = FakeClock()
+        for module in modules:
+            monkeypatch.setattr(module, "time", clock)
+        return clock
+    return _patch
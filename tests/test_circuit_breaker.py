@@ -0,0 +1,104 @@
+"""
+Тесты автомата отключения: переходы closed -> open -> half_open -> closed.
+"""
+
+import pytest
+import requests
+
+from trade_executor.utils import circuit_breaker
+from trade_executor.utils.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(circuit_breaker)
+
+
+def _fail(breaker: CircuitBreaker, error: Exception | None = None) -> None:
+    with pytest.raises(type(error) if error is not None else ConnectionError):
+        with breaker.guard():
+            raise error if error is not None else ConnectionError("обрыв")
+
+
+def _succeed(breaker: CircuitBreaker) -> None:
+    with breaker.guard():
+        pass
+
+
+def _open_breaker(clock) -> CircuitBreaker:
+    breaker = CircuitBreaker("test", window_size=4, min_calls=4, failure_rate=0.5, open_seconds=5)
+    for _ in range(4):
+        _fail(breaker)
+    assert breaker.state == STATE_OPEN
+    return breaker
+
+
+def test_opens_when_failure_rate_reached(clock):
+    breaker = CircuitBreaker("test", window_size=4, min_calls=4, failure_rate=0.5)
+    _succeed(breaker)
+    _succeed(breaker)
+    _fail(breaker)
+    # 1 неудача из 3 — меньше min_calls
+    assert breaker.state == STATE_CLOSED
+
+    _fail(breaker)
+    assert breaker.state == STATE_OPEN
+
+
+def test_client_errors_do_not_open(clock):
+    breaker = CircuitBreaker("test", window_size=4, min_calls=4, failure_rate=0.5)
+    response = requests.Response()
+    response.status_code = 400
+    for _ in range(4):
+        _fail(breaker, requests.HTTPError(response=response))
+    assert breaker.state == STATE_CLOSED
+
+
+def test_open_rejects_without_calling(clock):
+    breaker = _open_breaker(clock)
+    called = False
+
+    with pytest.raises(CircuitOpenError):
+        with breaker.guard():
+            called = True
+    assert not called
+
+
+def test_half_open_probe_success_closes(clock):
+    breaker = _open_breaker(clock)
+
+    clock.advance(5)
+    assert breaker.state == STATE_HALF_OPEN
+
+    _succeed(breaker)
+    assert breaker.state == STATE_CLOSED
+    # Окно очищено: одна новая ошибка автомат не размыкает
+    _fail(breaker)
+    assert breaker.state == STATE_CLOSED
+
+
+def test_half_open_probe_failure_reopens(clock):
+    breaker = _open_breaker(clock)
+
+    clock.advance(5)
+    _fail(breaker)
+    assert breaker.state == STATE_OPEN
+    assert breaker.retry_in == pytest.approx(5.0)
+
+
+def test_half_open_allows_single_probe(clock):
+    breaker = _open_breaker(clock)
+    clock.advance(5)
+
+    with breaker.guard():
+        # Пока идёт пробный запрос, остальные отклоняются
+        with pytest.raises(CircuitOpenError):
+            with breaker.guard():
+                pass
+    assert breaker.state == STATE_CLOSED
@@ -0,0 +1,95 @@
+"""
+Тесты SQL claim-протокола new_positions на временной схеме PostgreSQL.
+
+Нужна база из TEST_DATABASE_URL, в которой можно создавать схемы;
+без неё тесты пропускаются.
+"""
+
+import os
+
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+from benchmarks.postgres_fixture import PostgresFixture  # noqa: E402
+from trade_executor.database.claim_new_positions import claim_new_positions, ensure_claim_columns  # noqa: E402
+from trade_executor.database.complete_positions import complete_positions  # noqa: E402
+from trade_executor.database.count_intake_backlog import count_intake_backlog  # noqa: E402
+from trade_executor.database.listen_new_positions import CHANNEL  # noqa: E402
+
+
+@pytest.fixture
+def fixture():
+    dsn = os.environ.get("TEST_DATABASE_URL")
+    if not dsn:
+        pytest.skip("TEST_DATABASE_URL не задан")
+    try:
+        psycopg.connect(dsn, connect_timeout=3).close()
+    except psycopg.OperationalError as e:
+        pytest.skip(f"PostgreSQL недоступен: {e}")
+
+    with PostgresFixture(dsn) as local:
+        with psycopg.connect(local.dsn) as conn:
+            ensure_claim_columns(conn)
+        local.insert_signals([
+            {"position_signature": f"sig-{index}", "coin": f"C{index}", "side": "LONG",
+             "size": 1, "entry_price": 100, "leverage": 5}
+            for index in range(5)
+        ])
+        yield local
+
+
+@pytest.fixture
+def conn(fixture):
+    with psycopg.connect(fixture.dsn) as connection:
+        yield connection
+
+
+def test_claim_is_exclusive_between_workers(conn):
+    first = claim_new_positions(conn, "worker-a", limit=3)
+    second = claim_new_positions(conn, "worker-b", limit=10)
+
+    assert len(first) == 3
+    assert len(second) == 2
+    assert not {p["id"] for p in first} & {p["id"] for p in second}
+    assert claim_new_positions(conn, "worker-c", limit=10) == []
+    assert count_intake_backlog(conn, "worker-a") == (0, 3)
+
+
+def test_complete_deletes_done_and_releases_rest(fixture, conn):
+    claimed = [p["id"] for p in claim_new_positions(conn, "worker-a", limit=5)]
+
+    complete_positions(conn, "worker-a", done_ids=claimed[:2], released_ids=claimed[2:], notify=False)
+
+    assert fixture.pending_count() == 3
+    assert count_intake_backlog(conn, "worker-a") == (3, 0)
+    # Возвращённые записи снова доступны любой реплике
+    assert sorted(p["id"] for p in claim_new_positions(conn, "worker-b", limit=5)) == sorted(claimed[2:])
+
+
+def test_complete_ignores_rows_claimed_by_another_worker(fixture, conn):
+    claimed = [p["id"] for p in claim_new_positions(conn, "worker-a", limit=5)]
+
+    complete_positions(conn, "worker-b", done_ids=claimed[:1], released_ids=claimed[1:], notify=False)
+
+    assert fixture.pending_count() == 5
+    assert count_intake_backlog(conn, "worker-a") == (0, 5)
+
+
+def test_expired_lease_is_claimed_again(conn):
+    claim_new_positions(conn, "worker-a", limit=5)
+
+    # Аренда 0 сек: захват worker-a уже считается брошенным
+    assert count_intake_backlog(conn, "worker-a", lease_seconds=0) == (5, 0)
+    assert len(claim_new_positions(conn, "worker-b", limit=5, lease_seconds=0)) == 5
+
+
+def test_release_notifies_listeners(fixture, conn):
+    claimed = [p["id"] for p in claim_new_positions(conn, "worker-a", limit=2)]
+
+    with psycopg.connect(fixture.dsn, autocommit=True) as listener:
+        listener.execute(f"LISTEN {CHANNEL}")
+        complete_positions(conn, "worker-a", done_ids=[], released_ids=claimed, notify=True)
+        notifies = list(listener.notifies(timeout=2, stop_after=1))
+
+    assert [notify.channel for notify in notifies] == [CHANNEL]
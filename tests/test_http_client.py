@@ -0,0 +1,150 @@
+"""
+Тесты HTTP клиента: был ли запрос отправлен и повторы с учётом идемпотентности.
+"""
+
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from trade_executor.hyperliquid.client import _may_have_executed
+from trade_executor.utils.http_client import HttpClient, was_not_sent
+
+
+class LocalServer:
+    """HTTP-сервер на свободном порту: отвечает заданным статусом или молчит."""
+
+    def __init__(self):
+        self.status = 200
+        self.delay = 0.0
+        self.requests = 0
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                server.requests += 1
+                if server.delay:
+                    time.sleep(server.delay)
+                self.send_response(server.status)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/info"
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def server():
+    local = LocalServer()
+    yield local
+    local.close()
+
+
+@pytest.fixture
+def closed_port_url():
+    # Порт освобождён сразу после выбора: подключение к нему отклоняется
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/exchange"
+
+
+def _client(**params) -> HttpClient:
+    params.setdefault("backoff_seconds", 0)
+    return HttpClient(**params)
+
+
+def _error(call) -> requests.RequestException:
+    with pytest.raises(requests.RequestException) as info:
+        call()
+    return info.value
+
+
+def test_refused_connection_was_not_sent(closed_port_url):
+    error = _error(lambda: _client(max_retries=0).post(closed_port_url, json={}))
+
+    assert isinstance(error, requests.ConnectionError)
+    assert was_not_sent(error)
+    assert not _may_have_executed(error)
+
+
+def test_connect_timeout_was_not_sent():
+    error = requests.ConnectTimeout("connect timeout")
+
+    assert was_not_sent(error)
+    assert not _may_have_executed(error)
+
+
+def test_read_timeout_may_have_been_sent(server):
+    server.delay = 0.5
+    error = _error(lambda: _client(max_retries=0).post(server.url, json={}, timeout=0.1))
+
+    assert isinstance(error, requests.ReadTimeout)
+    assert not was_not_sent(error)
+    assert _may_have_executed(error)
+
+
+def test_server_error_may_have_been_executed(server):
+    server.status = 503
+    response = _client(max_retries=0).post(server.url, json={})
+    error = _error(response.raise_for_status)
+
+    assert not was_not_sent(error)
+    assert _may_have_executed(error)
+
+
+def test_idempotent_request_retries_server_errors(server):
+    server.status = 503
+
+    response = _client(max_retries=2).post(server.url, json={}, idempotent=True)
+
+    assert response.status_code == 503
+    assert server.requests == 3
+
+
+def test_non_idempotent_request_is_not_retried_after_reaching_server(server):
+    server.status = 503
+    _client(max_retries=2).post(server.url, json={})
+    assert server.requests == 1
+
+    server.delay = 0.5
+    _error(lambda: _client(max_retries=2).post(server.url, json={}, timeout=0.1))
+    assert server.requests == 2
+
+
+def test_idempotent_request_retries_read_timeout(server):
+    server.delay = 0.3
+
+    _error(lambda: _client(max_retries=1).post(server.url, json={}, idempotent=True, timeout=0.1))
+
+    assert server.requests == 2
+
+
+def test_non_idempotent_request_retries_refused_connection(closed_port_url, monkeypatch):
+    client = _client(max_retries=2)
+    sleeps = []
+    monkeypatch.setattr(client, "_sleep", lambda attempt, retry_after: sleeps.append(attempt))
+
+    _error(lambda: client.post(closed_port_url, json={}))
+
+    # Запрос не ушёл на сервер: повтор безопасен и для ордера
+    assert sleeps == [0, 1]
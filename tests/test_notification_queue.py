@@ -0,0 +1,73 @@
+"""
+Тесты очереди уведомлений при разомкнутом автомате Telegram.
+"""
+
+import time
+from collections import Counter
+
+import pytest
+
+from trade_executor.telegram import notification_queue
+from trade_executor.telegram.notification_queue import NotificationQueue
+from trade_executor.utils.circuit_breaker import CircuitOpenError
+
+
+class CountingMetrics:
+    """Метрики с одним счётчиком telegram{result}."""
+
+    def __init__(self):
+        self.results = Counter()
+        self.telegram = self
+
+    def inc(self, amount: float = 1, result: str = "") -> None:
+        self.results[result] += amount
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        pass
+
+
+@pytest.fixture
+def circuit_open(monkeypatch):
+    """send_telegram_message всегда упирается в разомкнутый автомат."""
+    calls = []
+
+    def _send(**kwargs):
+        calls.append(kwargs["message"])
+        raise CircuitOpenError("telegram")
+
+    monkeypatch.setattr(notification_queue, "send_telegram_message", _send)
+    return calls
+
+
+def _queue(metrics: CountingMetrics, **params) -> NotificationQueue:
+    return NotificationQueue("token", "chat", min_interval_seconds=0.01, coalesce_seconds=0, metrics=metrics, **params)
+
+
+def test_message_fails_after_circuit_wait_deadline(circuit_open):
+    metrics = CountingMetrics()
+    notifier = _queue(metrics, circuit_max_wait_seconds=0.1)
+    notifier.start()
+    try:
+        notifier.put("BTC LONG")
+        deadline = time.monotonic() + 5
+        while metrics.results["failed"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert metrics.results["failed"] == 1
+        assert metrics.results["retry"] == 0
+    finally:
+        notifier.close(timeout=5)
+
+
+def test_close_interrupts_circuit_wait(circuit_open):
+    metrics = CountingMetrics()
+    notifier = _queue(metrics, circuit_max_wait_seconds=3600)
+    notifier.start()
+    notifier.put("BTC LONG")
+    while not circuit_open:
+        time.sleep(0.01)
+
+    started = time.monotonic()
+    notifier.close(timeout=30)
+
+    assert time.monotonic() - started < 2
+    assert metrics.results["failed"] == 1
@@ -0,0 +1,102 @@
+"""
+Тесты реестра позиций: сверка со снимком clearinghouseState.
+"""
+
+import time
+
+from trade_executor.hyperliquid.order_fill import FILL_FILLED, OrderFill
+from trade_executor.positions.position_ledger import PositionLedger
+
+
+def _account_state(**szi: float) -> dict:
+    return {
+        "marginSummary": {"accountValue": "1000"},
+        "withdrawable": "1000",
+        "assetPositions": [{"position": {"coin": coin, "szi": str(size)}} for coin, size in szi.items()],
+    }
+
+
+def _fill(coin: str, is_buy: bool, size: float, oid: int) -> OrderFill:
+    return OrderFill(coin=coin, is_buy=is_buy, requested_sz=size, state=FILL_FILLED, oid=oid, filled_sz=size, avg_px=1.0)
+
+
+def _positions(ledger: PositionLedger) -> dict:
+    return {(pos["coin"], pos["side"]): pos["size"] for pos in ledger.open_positions()}
+
+
+def test_reconcile_replaces_positions_with_snapshot():
+    ledger = PositionLedger()
+    ledger.reconcile(_account_state(BTC=0.5, ETH=-2))
+
+    drift = ledger.reconcile(_account_state(BTC=0.5, SOL=10))
+
+    assert _positions(ledger) == {("BTC", "LONG"): 0.5, ("SOL", "LONG"): 10.0}
+    assert sorted(drift) == [("ETH", "SHORT"), ("SOL", "LONG")]
+
+
+def test_reconcile_keeps_fills_newer_than_snapshot():
+    ledger = PositionLedger()
+    ledger.reconcile(_account_state(BTC=0.5))
+
+    # Снимок запрошен до сделки и о ней не знает
+    requested_at = time.monotonic()
+    ledger.apply_fill(_fill("ETH", is_buy=False, size=2, oid=1))
+    ledger.apply_fill(_fill("BTC", is_buy=True, size=0.25, oid=2))
+
+    drift = ledger.reconcile(_account_state(BTC=0.5), requested_at=requested_at)
+
+    assert _positions(ledger) == {("BTC", "LONG"): 0.75, ("ETH", "SHORT"): 2.0}
+    assert drift == []
+
+
+def test_reconcile_overwrites_fills_older_than_snapshot():
+    ledger = PositionLedger()
+    ledger.apply_fill(_fill("ETH", is_buy=True, size=2, oid=1))
+
+    # Снимок запрошен после сделки: его значение точнее локального
+    requested_at = time.monotonic()
+    ledger.reconcile(_account_state(ETH=1.5), requested_at=requested_at)
+
+    assert _positions(ledger) == {("ETH", "LONG"): 1.5}
+
+    # Следующая сверка уже не держит монету как изменённую
+    ledger.reconcile(_account_state(), requested_at=time.monotonic())
+    assert _positions(ledger) == {}
+
+
+def _margin(ledger: PositionLedger) -> tuple:
+    state = ledger.account_state()
+    return float(state["marginSummary"]["accountValue"]), float(state["withdrawable"])
+
+
+def test_fill_moves_margin_by_notional_over_leverage():
+    ledger = PositionLedger()
+    ledger.reconcile(_account_state())
+
+    ledger.apply_fill(OrderFill(
+        coin="BTC", is_buy=True, requested_sz=0.01, state=FILL_FILLED, oid=1, filled_sz=0.01, avg_px=50000.0,
+    ), leverage=5)
+
+    # Нотионал $500 при плече 5x занимает $100 маржи; accountValue не меняется
+    assert _margin(ledger) == (1000.0, 900.0)
+    assert ledger.age_seconds < 60
+
+
+def test_user_fill_fee_and_unknown_leverage():
+    ledger = PositionLedger()
+    ledger.reconcile(_account_state())
+    ledger.apply_fill(_fill("ETH", is_buy=True, size=2, oid=1), leverage=2)
+
+    # Сделка по ордеру, уже учтённому из ответа: только комиссия
+    ledger._on_user_fills({"data": {"fills": [
+        {"tid": 10, "oid": 1, "coin": "ETH", "side": "B", "sz": "2", "px": "1.0", "fee": "0.5", "closedPnl": "0"},
+    ]}})
+    assert _positions(ledger) == {("ETH", "LONG"): 2.0}
+    assert _margin(ledger) == (999.5, 998.5)
+
+    # Плечо новой монеты неизвестно: реестр ждёт сверки
+    ledger._on_user_fills({"data": {"fills": [
+        {"tid": 11, "oid": 2, "coin": "SOL", "side": "A", "sz": "3", "px": "100", "fee": "0", "closedPnl": "0"},
+    ]}})
+    assert _positions(ledger)[("SOL", "SHORT")] == 3.0
+    assert ledger.age_seconds > 60
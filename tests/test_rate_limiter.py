@@ -0,0 +1,83 @@
+"""
+Тесты бюджета веса запросов: пополнение и приоритет ордеров.
+"""
+
+import threading
+import time
+
+import pytest
+
+from trade_executor.hyperliquid import rate_limiter
+from trade_executor.hyperliquid.rate_limiter import (
+    PRIORITY_ORDER,
+    RateLimiter,
+    RateLimitExceeded,
+    exchange_weight,
+)
+
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(rate_limiter)
+
+
+def test_bucket_refills_at_weight_per_second(clock):
+    limiter = RateLimiter(weight_per_minute=600, order_reserve=0.0)
+    limiter.acquire(600, PRIORITY_ORDER)
+    assert limiter.available == pytest.approx(0.0)
+
+    clock.advance(3)
+    # 600 в минуту — 10 в секунду
+    assert limiter.available == pytest.approx(30.0)
+
+
+def test_bucket_refill_is_capped_at_capacity(clock):
+    limiter = RateLimiter(weight_per_minute=600, order_reserve=0.0)
+    limiter.acquire(100, PRIORITY_ORDER)
+
+    clock.advance(3600)
+    assert limiter.available == pytest.approx(600.0)
+
+
+def test_info_request_keeps_order_reserve(clock):
+    limiter = RateLimiter(weight_per_minute=1200, order_reserve=0.25, info_max_wait_seconds=0)
+    limiter.acquire(850, PRIORITY_ORDER)  # Остаток 350, резерв ордеров 300
+
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire(100)
+    assert limiter.available == pytest.approx(350.0)
+
+    # Ордер резерв не ограничивает
+    limiter.acquire(100, PRIORITY_ORDER)
+    assert limiter.available == pytest.approx(250.0)
+
+
+def test_info_request_does_not_overtake_waiting_order():
+    # Реальное время: ордер ждёт в Condition.wait, пока бюджет пополняется
+    limiter = RateLimiter(weight_per_minute=600, order_reserve=0.0, info_max_wait_seconds=0.2)
+    limiter.acquire(600, PRIORITY_ORDER)
+
+    order_done = threading.Event()
+
+    def _order():
+        # 5 веса при 10 в секунду — около 0.5 сек ожидания
+        limiter.acquire(5, PRIORITY_ORDER)
+        order_done.set()
+
+    thread = threading.Thread(target=_order)
+    thread.start()
+    time.sleep(0.05)
+
+    # Через 0.1 сек веса для справочного запроса хватило бы, но его ждёт ордер
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire(1)
+    assert not order_done.is_set()
+
+    thread.join(timeout=5)
+    assert order_done.is_set()
+
+
+def test_exchange_weight_grows_per_40_orders():
+    assert exchange_weight({"type": "updateLeverage"}) == 1
+    assert exchange_weight({"type": "order", "orders": [{}] * 39}) == 1
+    assert exchange_weight({"type": "order", "orders": [{}] * 80}) == 3
@@ -0,0 +1,89 @@
+"""
+Тесты планировщика сигналов: возраст, уход цены и уменьшение размера.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from trade_executor.positions.signal_scheduler import SignalScheduler
+
+
+class StaticMids:
+    """Кэш mid-цен с заданными ценами."""
+
+    def __init__(self, **mids: float):
+        self.mids = mids
+
+    def get_mid(self, coin: str) -> float:
+        return self.mids[coin]
+
+
+def _signal(age_seconds: float = 0.0, side: str = "LONG", entry_price: float = 100.0, coin: str = "BTC") -> dict:
+    return {
+        "coin": coin,
+        "side": side,
+        "entry_price": entry_price,
+        "detected_at": datetime.now(timezone.utc) - timedelta(seconds=age_seconds),
+    }
+
+
+def test_defaults_never_expire():
+    scheduler = SignalScheduler(StaticMids(BTC=150.0))
+
+    plan = scheduler.plan(_signal(age_seconds=3600))
+
+    assert not plan.expired
+    assert plan.remaining == 1.0
+    assert plan.size_factor == 1.0
+
+
+def test_age_expires_signal():
+    scheduler = SignalScheduler(StaticMids(BTC=100.0), max_age_seconds=120, downsize_from=0)
+
+    assert scheduler.plan(_signal(age_seconds=30)).remaining == pytest.approx(0.75, abs=0.01)
+    assert scheduler.plan(_signal(age_seconds=121)).expired
+
+
+@pytest.mark.parametrize(
+    "side, mid, expired",
+    [
+        ("LONG", 103.0, True),  # Цена ушла вверх против покупки
+        ("LONG", 97.0, False),  # Вниз — покупка только выгоднее
+        ("SHORT", 97.0, True),
+        ("SHORT", 103.0, False),
+    ],
+)
+def test_drift_counts_only_against_side(side, mid, expired):
+    scheduler = SignalScheduler(StaticMids(BTC=mid), max_drift_percent=2.0, downsize_from=0)
+
+    plan = scheduler.plan(_signal(side=side))
+
+    assert plan.expired == expired
+    assert abs(plan.drift_percent) == pytest.approx(3.0)
+
+
+def test_remaining_is_smaller_of_age_and_drift():
+    scheduler = SignalScheduler(StaticMids(BTC=101.5), max_age_seconds=100, max_drift_percent=2.0, downsize_from=0)
+
+    # Возраст оставляет 0.9, уход цены на 1.5% — 0.25
+    plan = scheduler.plan(_signal(age_seconds=10))
+
+    assert plan.remaining == pytest.approx(0.25, abs=0.01)
+
+
+def test_downsize_below_threshold():
+    scheduler = SignalScheduler(StaticMids(BTC=100.0), max_age_seconds=100, downsize_from=0.5)
+
+    assert scheduler.plan(_signal(age_seconds=20)).size_factor == 1.0
+    # Остаток 0.25 при пороге 0.5 — половина размера
+    assert scheduler.plan(_signal(age_seconds=75)).size_factor == pytest.approx(0.5, abs=0.01)
+
+
+def test_schedule_orders_freshest_first():
+    scheduler = SignalScheduler(StaticMids(BTC=100.0), max_age_seconds=100)
+    positions = [_signal(age_seconds=50), _signal(age_seconds=150), _signal(age_seconds=5)]
+
+    order = [index for index, _ in scheduler.schedule(positions)]
+
+    assert order == [2, 0, 1]
@@ -0,0 +1,103 @@
+"""
+Тесты уточнения исхода ордеров без ответа биржи по orderStatus.
+"""
+
+import pytest
+
+from trade_executor.hyperliquid import unknown_order_tracker
+from trade_executor.hyperliquid.order_fill import (
+    FILL_FILLED,
+    FILL_PARTIAL,
+    FILL_REJECTED,
+    FILL_UNKNOWN,
+    OrderFill,
+)
+from trade_executor.hyperliquid.unknown_order_tracker import UnknownOrderTracker
+
+CLOID = "0x" + "ab" * 16
+
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(unknown_order_tracker)
+
+
+def _unknown_fill(size: float = 0.5) -> OrderFill:
+    return OrderFill(coin="BTC", is_buy=True, requested_sz=size, state=FILL_UNKNOWN, error="таймаут", cloid=CLOID)
+
+
+def _order_status(status: str, orig_sz: str, sz: str) -> dict:
+    return {"status": "order", "order": {"order": {"coin": "BTC", "oid": 7, "origSz": orig_sz, "sz": sz}, "status": status}}
+
+
+def _tracker(responses: list, resolved: list, max_attempts: int = 3) -> UnknownOrderTracker:
+    def _status(cloid):
+        assert cloid == CLOID
+        return responses.pop(0)
+
+    return UnknownOrderTracker(
+        order_status=_status,
+        on_resolved=lambda fill, details: resolved.append((fill, details)),
+        interval_seconds=2,
+        max_attempts=max_attempts,
+    )
+
+
+@pytest.mark.parametrize(
+    "status, orig_sz, sz, state, filled_sz",
+    [
+        ("filled", "0.5", "0.0", FILL_FILLED, 0.5),
+        ("canceled", "0.5", "0.2", FILL_PARTIAL, 0.3),
+        ("canceled", "0.5", "0.5", FILL_REJECTED, 0.0),
+    ],
+)
+def test_resolves_fill_from_order_status(clock, status, orig_sz, sz, state, filled_sz):
+    resolved = []
+    tracker = _tracker([_order_status(status, orig_sz, sz)], resolved)
+    tracker.track(_unknown_fill(), size_usd=100.0, leverage=5)
+
+    # Статус запрашивается не раньше интервала после отправки
+    tracker.poll()
+    assert resolved == []
+
+    clock.advance(2)
+    tracker.poll()
+
+    (fill, details), = resolved
+    assert fill.state == state
+    assert fill.filled_sz == pytest.approx(filled_sz)
+    assert details == {"size_usd": 100.0, "leverage": 5}
+    assert tracker.pending == 0
+
+
+def test_unknown_oid_is_rejected_only_on_last_attempt(clock):
+    resolved = []
+    tracker = _tracker([{"status": "unknownOid"}] * 3, resolved, max_attempts=3)
+    tracker.track(_unknown_fill())
+
+    for _ in range(2):
+        clock.advance(2)
+        tracker.poll()
+        assert resolved == []
+        assert tracker.pending == 1
+
+    clock.advance(2)
+    tracker.poll()
+    (fill, _), = resolved
+    assert fill.state == FILL_REJECTED
+    assert tracker.pending == 0
+
+
+def test_order_found_after_unknown_oid(clock):
+    resolved = []
+    tracker = _tracker([{"status": "unknownOid"}, _order_status("filled", "0.5", "0")], resolved)
+    tracker.track(_unknown_fill())
+
+    clock.advance(2)
+    tracker.poll()
+    clock.advance(2)
+    tracker.poll()
+
+    (fill, _), = resolved
+    assert fill.state == FILL_FILLED
+    assert fill.oid == 7
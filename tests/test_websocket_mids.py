@@ -0,0 +1,153 @@
+"""
+Тесты кэша mid-цен на локальной заглушке WebSocket Hyperliquid.
+"""
+
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+ws_server = pytest.importorskip("websockets.sync.server")
+pytest.importorskip("hyperliquid.websocket_manager")
+
+from trade_executor.hyperliquid import mid_price_cache  # noqa: E402
+from trade_executor.hyperliquid.mid_price_cache import MidPriceCache  # noqa: E402
+from trade_executor.hyperliquid.websocket_stream import WebsocketStream  # noqa: E402
+
+
+class LocalWebsocket:
+    """WebSocket-сервер на свободном порту: принимает подписки и рассылает allMids."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections = []
+        self.subscriptions = []
+        self.connected_total = 0
+        self._server = ws_server.serve(self._handle, "127.0.0.1", 0)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def api_url(self) -> str:
+        # WebsocketStream выводит ws://host:port/ws из http-адреса API
+        host, port = self._server.socket.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def push_mids(self, mids: dict) -> None:
+        message = json.dumps({"channel": "allMids", "data": {"mids": mids}})
+        with self._lock:
+            connections = list(self.connections)
+        for connection in connections:
+            connection.send(message)
+
+    def drop_connections(self) -> None:
+        """Обрывает соединения без закрывающего рукопожатия, как при сбое сети."""
+        with self._lock:
+            connections, self.connections = self.connections, []
+        for connection in connections:
+            try:
+                connection.socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                # Клиент уже закрыл соединение
+                pass
+
+    def close(self) -> None:
+        self.drop_connections()
+        self._server.shutdown()
+        self._thread.join(timeout=5)
+
+    def _handle(self, connection) -> None:
+        with self._lock:
+            self.connections.append(connection)
+            self.connected_total += 1
+        for raw in connection:
+            message = json.loads(raw)
+            if message.get("method") == "subscribe":
+                with self._lock:
+                    self.subscriptions.append(message["subscription"])
+
+
+def _wait_until(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+@pytest.fixture
+def server():
+    local = LocalWebsocket()
+    yield local
+    local.close()
+
+
+@pytest.fixture
+def rest_mids():
+    """REST-запасной путь: считает вызовы и отдаёт заданные цены."""
+    calls = []
+
+    def _fetch():
+        calls.append(time.monotonic())
+        return {"BTC": "50000.0"}
+
+    _fetch.calls = calls
+    return _fetch
+
+
+def _start_stream(server: LocalWebsocket, mids: MidPriceCache) -> WebsocketStream:
+    stream = WebsocketStream(server.api_url, reconnect_delay=0.1)
+    mids.attach(stream)
+    stream.start()
+    assert _wait_until(lambda: {"type": "allMids"} in server.subscriptions), "подписка allMids не дошла до сервера"
+    return stream
+
+
+def test_get_mid_returns_pushed_mids(server, rest_mids):
+    mids = MidPriceCache(fetch_all_mids=rest_mids, max_age_seconds=60)
+    stream = _start_stream(server, mids)
+    try:
+        server.push_mids({"BTC": "65000.5", "ETH": "3100"})
+        assert _wait_until(lambda: mids.age_seconds("ETH") < 60)
+
+        assert mids.get_mid("BTC") == 65000.5
+        assert mids.get_mid("ETH") == 3100.0
+        assert rest_mids.calls == []
+    finally:
+        stream.stop()
+
+
+def test_stale_mid_falls_back_to_rest(server, rest_mids, fake_clock):
+    clock = fake_clock(mid_price_cache)
+    mids = MidPriceCache(fetch_all_mids=rest_mids, max_age_seconds=3)
+    stream = _start_stream(server, mids)
+    try:
+        server.push_mids({"BTC": "65000"})
+        assert _wait_until(lambda: mids.age_seconds("BTC") == 0)
+        assert mids.get_mid("BTC") == 65000.0
+
+        # Сокет молчит дольше max_age_seconds — цена берётся из REST
+        clock.advance(5)
+        assert mids.get_mid("BTC") == 50000.0
+        assert len(rest_mids.calls) == 1
+    finally:
+        stream.stop()
+
+
+def test_watchdog_reconnects_after_server_drop(server, rest_mids):
+    mids = MidPriceCache(fetch_all_mids=rest_mids, max_age_seconds=60)
+    stream = _start_stream(server, mids)
+    try:
+        server.drop_connections()
+
+        # Сторожевой поток переподключается и повторяет подписку
+        assert _wait_until(lambda: server.connected_total >= 2 and server.subscriptions.count({"type": "allMids"}) >= 2)
+        server.push_mids({"BTC": "70000"})
+        assert _wait_until(lambda: mids.age_seconds("BTC") < 60)
+        assert mids.get_mid("BTC") == 70000.0
+        assert rest_mids.calls == []
+    finally:
+        stream.stop()
@@ -3,6 +3,7 @@
 """
 
 from dataclasses import dataclass
+from pathlib import Path
 from .get_env_var import get_env_var
 
 
@@ -12,12 +13,22 @@ class Settings:
 
     # База данных
     database_url: str
+    db_pool_min_size: int
+    db_pool_max_size: int
 
     # Hyperliquid
     hyperliquid_api_url: str
     hyperliquid_private_key: str  # Хранится ТОЛЬКО в Railway Variables
     wallet_address: str
     position_size_percent: float  # % от общего баланса для каждой сделки
+    margin_mode: str  # "cross" или "isolated"
+    meta_ttl_seconds: int  # Интервал фонового обновления метаданных активов
+    meta_snapshot_path: str  # Снимок meta на диске для старта без сети ("" — выключен)
+    websocket_enabled: bool  # Подписка allMids по WebSocket
+    mids_max_age_seconds: float  # Возраст цены, после которого идём в REST
+    signing_workers: int  # Процессов подписи (0 — подпись в потоке сигнала)
+    hyperliquid_weight_per_minute: int  # Бюджет веса запросов к API на реплику
+    rate_limit_order_reserve: float  # Доля бюджета, недоступная справочным запросам
 
     # Telegram
     telegram_bot_token: str
@@ -25,7 +36,32 @@ class Settings:
 
     # Мониторинг
     poll_interval_seconds: int
-    http_timeout_seconds: int
+    http_timeout_seconds: int  # Таймаут ответа HTTP
+    http_connect_timeout_seconds: float  # Таймаут подключения HTTP
+    http_max_retries: int  # Повторы HTTP запроса после первой попытки
+    claim_batch_size: int  # Сколько записей new_positions захватывать за цикл
+    claim_lease_seconds: int  # Через сколько секунд брошенный захват снова доступен
+    max_concurrent_signals: int  # Сколько сигналов обрабатывать одновременно
+    bulk_orders_enabled: bool  # Отправлять пачку сигналов одним действием order
+    intake_mode: str  # "notify" (LISTEN/NOTIFY) или "poll"
+    fallback_poll_seconds: int  # Страховочный опрос в режиме notify
+    circuit_failure_rate: float  # Доля ошибок, при которой автомат эндпоинта размыкается
+    circuit_slow_call_seconds: float  # Ответ дольше этого считается ошибкой (0 — не учитывать)
+    circuit_open_seconds: float  # Сколько автомат разомкнут до пробного запроса
+    ledger_reconcile_seconds: int  # Как часто сверять реестр позиций с REST (в фоне)
+    ledger_max_age_seconds: int  # Возраст сверки, после которого цикл ждёт REST сам
+    intake_backlog_seconds: float  # Как часто считать очередь new_positions для метрик (в фоне)
+    signal_max_age_seconds: float  # Возраст сигнала, после которого он просрочен (0 — не ограничен)
+    signal_max_drift_percent: float  # Уход цены от entry_price, после которого сигнал просрочен (0 — не ограничен)
+    signal_downsize_from: float  # Остаток срока сигнала, ниже которого размер уменьшается (0 — не уменьшать)
+    signature_cache_size: int  # Сколько обработанных position_signature держать в памяти
+    signature_retention_days: int  # Сколько дней хранить processed_signatures (0 — всегда)
+    metrics_host: str  # Адрес эндпоинта /metrics
+    metrics_port: int  # Порт эндпоинта /metrics (0 — выключен)
+    log_level: str  # Уровень логирования (DEBUG, INFO, WARNING, ...)
+    log_format: str  # "text" или "json"
+    log_queue_enabled: bool  # Писать лог из фонового потока
+    log_debug_sample_rate: float  # Доля записей DEBUG, попадающих в лог
 
 
 def build_settings() -> Settings:
@@ -37,6 +73,8 @@ def build_settings() -> Settings:
     """
     # База данных (Railway автоматически прокидывает DATABASE_URL)
     database_url = get_env_var("DATABASE_URL", required=True)
+    db_pool_min_size = int(get_env_var("DB_POOL_MIN_SIZE", default="1"))
+    db_pool_max_size = int(get_env_var("DB_POOL_MAX_SIZE", default="4"))
 
     # Hyperliquid настройки
     api_url = get_env_var(
@@ -49,6 +87,35 @@ def build_settings() -> Settings:
     position_size_str = get_env_var("POSITION_SIZE_PERCENT", default="5.0")
     position_size_percent = float(position_size_str)
 
+    margin_mode = get_env_var("MARGIN_MODE", default="cross").lower()
+    if margin_mode not in ("cross", "isolated"):
+        raise ValueError(f"MARGIN_MODE должен быть cross или isolated, получено: {margin_mode}")
+
+    meta_ttl_str = get_env_var("META_TTL_SECONDS", default="300")
+    meta_ttl_seconds = int(meta_ttl_str)
+
+    # Снимок по умолчанию лежит в корне проекта, как и .env
+    project_root = Path(__file__).parent.parent.parent
+    meta_snapshot_path = get_env_var(
+        "META_SNAPSHOT_PATH",
+        default=str(project_root / ".cache" / "meta_snapshot.json")
+    )
+
+    websocket_str = get_env_var("WEBSOCKET_ENABLED", default="true")
+    websocket_enabled = websocket_str.lower() in ("1", "true", "yes")
+
+    mids_max_age_str = get_env_var("MIDS_MAX_AGE_SECONDS", default="3")
+    mids_max_age_seconds = float(mids_max_age_str)
+
+    signing_workers_str = get_env_var("SIGNING_WORKERS", default="2")
+    signing_workers = int(signing_workers_str)
+
+    weight_per_minute_str = get_env_var("HYPERLIQUID_WEIGHT_PER_MINUTE", default="1200")
+    hyperliquid_weight_per_minute = max(1, int(weight_per_minute_str))
+
+    order_reserve_str = get_env_var("RATE_LIMIT_ORDER_RESERVE", default="0.25")
+    rate_limit_order_reserve = min(0.9, max(0.0, float(order_reserve_str)))
+
     # Telegram
     telegram_bot_token = get_env_var("TELEGRAM_BOT_TOKEN", required=True)
     telegram_chat_id = get_env_var("TELEGRAM_CHAT_ID", required=True)
@@ -60,15 +127,126 @@ def build_settings() -> Settings:
     http_timeout_str = get_env_var("HTTP_TIMEOUT_SECONDS", default="10")
     http_timeout_seconds = int(http_timeout_str)
 
+    http_connect_timeout_str = get_env_var("HTTP_CONNECT_TIMEOUT_SECONDS", default="3")
+    http_connect_timeout_seconds = float(http_connect_timeout_str)
+
+    http_max_retries_str = get_env_var("HTTP_MAX_RETRIES", default="2")
+    http_max_retries = max(0, int(http_max_retries_str))
+
+    claim_batch_str = get_env_var("CLAIM_BATCH_SIZE", default="50")
+    claim_batch_size = max(1, int(claim_batch_str))
+
+    claim_lease_str = get_env_var("CLAIM_LEASE_SECONDS", default="300")
+    claim_lease_seconds = int(claim_lease_str)
+
+    max_concurrent_str = get_env_var("MAX_CONCURRENT_SIGNALS", default="4")
+    max_concurrent_signals = max(1, int(max_concurrent_str))
+
+    bulk_orders_str = get_env_var("BULK_ORDERS_ENABLED", default="true")
+    bulk_orders_enabled = bulk_orders_str.lower() in ("1", "true", "yes")
+
+    intake_mode = get_env_var("INTAKE_MODE", default="notify").lower()
+    if intake_mode not in ("notify", "poll"):
+        raise ValueError(f"INTAKE_MODE должен быть notify или poll, получено: {intake_mode}")
+
+    fallback_poll_str = get_env_var("FALLBACK_POLL_SECONDS", default="30")
+    fallback_poll_seconds = int(fallback_poll_str)
+
+    circuit_failure_rate_str = get_env_var("CIRCUIT_FAILURE_RATE", default="0.5")
+    circuit_failure_rate = float(circuit_failure_rate_str)
+
+    circuit_slow_call_str = get_env_var("CIRCUIT_SLOW_CALL_SECONDS", default="5")
+    circuit_slow_call_seconds = float(circuit_slow_call_str)
+
+    circuit_open_str = get_env_var("CIRCUIT_OPEN_SECONDS", default="5")
+    circuit_open_seconds = float(circuit_open_str)
+
+    ledger_reconcile_str = get_env_var("LEDGER_RECONCILE_SECONDS", default="30")
+    ledger_reconcile_seconds = int(ledger_reconcile_str)
+
+    ledger_max_age_str = get_env_var("LEDGER_MAX_AGE_SECONDS", default="120")
+    ledger_max_age_seconds = int(ledger_max_age_str)
+
+    intake_backlog_str = get_env_var("INTAKE_BACKLOG_SECONDS", default="15")
+    intake_backlog_seconds = float(intake_backlog_str)
+
+    signal_max_age_str = get_env_var("SIGNAL_MAX_AGE_SECONDS", default="0")
+    signal_max_age_seconds = float(signal_max_age_str)
+
+    signal_max_drift_str = get_env_var("SIGNAL_MAX_DRIFT_PERCENT", default="0")
+    signal_max_drift_percent = float(signal_max_drift_str)
+
+    signal_downsize_str = get_env_var("SIGNAL_DOWNSIZE_FROM", default="0.5")
+    signal_downsize_from = min(1.0, max(0.0, float(signal_downsize_str)))
+
+    signature_cache_str = get_env_var("SIGNATURE_CACHE_SIZE", default="100000")
+    signature_cache_size = max(1, int(signature_cache_str))
+
+    signature_retention_str = get_env_var("SIGNATURE_RETENTION_DAYS", default="30")
+    signature_retention_days = int(signature_retention_str)
+
+    metrics_host = get_env_var("METRICS_HOST", default="127.0.0.1")
+    metrics_port_str = get_env_var("METRICS_PORT", default="9100")
+    metrics_port = int(metrics_port_str)
+
+    log_level = get_env_var("LOG_LEVEL", default="INFO").upper()
+    if log_level not in ("DEBUG", "INFO", "WARNING", "ERROR"):
+        raise ValueError(f"LOG_LEVEL должен быть DEBUG, INFO, WARNING или ERROR, получено: {log_level}")
+
+    log_format = get_env_var("LOG_FORMAT", default="text").lower()
+    if log_format not in ("text", "json"):
+        raise ValueError(f"LOG_FORMAT должен быть text или json, получено: {log_format}")
+
+    log_queue_str = get_env_var("LOG_QUEUE_ENABLED", default="true")
+    log_queue_enabled = log_queue_str.lower() in ("1", "true", "yes")
+
+    log_debug_sample_str = get_env_var("LOG_DEBUG_SAMPLE_RATE", default="0.1")
+    log_debug_sample_rate = float(log_debug_sample_str)
+
     return Settings(
         database_url=database_url,
+        db_pool_min_size=db_pool_min_size,
+        db_pool_max_size=db_pool_max_size,
         hyperliquid_api_url=api_url,
         hyperliquid_private_key=private_key,
         wallet_address=wallet_address,
         position_size_percent=position_size_percent,
+        margin_mode=margin_mode,
+        meta_ttl_seconds=meta_ttl_seconds,
+        meta_snapshot_path=meta_snapshot_path,
+        websocket_enabled=websocket_enabled,
+        mids_max_age_seconds=mids_max_age_seconds,
+        signing_workers=signing_workers,
+        hyperliquid_weight_per_minute=hyperliquid_weight_per_minute,
+        rate_limit_order_reserve=rate_limit_order_reserve,
         telegram_bot_token=telegram_bot_token,
         telegram_chat_id=telegram_chat_id,
         poll_interval_seconds=poll_interval_seconds,
         http_timeout_seconds=http_timeout_seconds,
+        http_connect_timeout_seconds=http_connect_timeout_seconds,
+        http_max_retries=http_max_retries,
+        claim_batch_size=claim_batch_size,
+        claim_lease_seconds=claim_lease_seconds,
+        max_concurrent_signals=max_concurrent_signals,
+        bulk_orders_enabled=bulk_orders_enabled,
+        intake_mode=intake_mode,
+        fallback_poll_seconds=fallback_poll_seconds,
+        circuit_failure_rate=circuit_failure_rate,
+        circuit_slow_call_seconds=circuit_slow_call_seconds,
+        circuit_open_seconds=circuit_open_seconds,
+        ledger_reconcile_seconds=ledger_reconcile_seconds,
+        ledger_max_age_seconds=ledger_max_age_seconds,
+        intake_backlog_seconds=intake_backlog_seconds,
+        signal_max_age_seconds=signal_max_age_seconds,
+        signal_max_drift_percent=signal_max_drift_percent,
+        signal_downsize_from=signal_downsize_from,
+        signature_cache_size=signature_cache_size,
+        signature_retention_days=signature_retention_days,
+        metrics_host=metrics_host,
+        metrics_port=metrics_port,
+        log_level=log_level,
+        log_format=log_format,
+        log_queue_enabled=log_queue_enabled,
+        log_debug_sample_rate=log_debug_sample_rate,
     )
 
@@ -0,0 +1,47 @@
+"""
+Модуль контекста executor: долгоживущие компоненты, создаваемые при старте.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .config.get_settings import Settings
+from .database.claim_prefetcher import ClaimPrefetcher
+from .database.intake_backlog_sampler import IntakeBacklogSampler
+from .hyperliquid.asset_metadata import AssetMetadataCache
+from .hyperliquid.client import HyperliquidClient
+from .hyperliquid.leverage_manager import LeverageManager
+from .hyperliquid.mid_price_cache import MidPriceCache
+from .hyperliquid.unknown_order_tracker import UnknownOrderTracker
+from .hyperliquid.websocket_stream import WebsocketStream
+from .metrics.executor_metrics import ExecutorMetrics
+from .positions.ledger_refresher import LedgerRefresher
+from .positions.position_ledger import PositionLedger
+from .positions.signal_scheduler import SignalScheduler
+from .positions.signature_index import SignatureIndex
+from .telegram.notification_queue import NotificationQueue
+
+
+@dataclass
+class ExecutorContext:
+    """Компоненты, которые переиспользуются всеми циклами и сигналами."""
+
+    settings: Settings
+    client: HyperliquidClient
+    assets: AssetMetadataCache
+    mids: MidPriceCache
+    leverages: LeverageManager
+    ledger: PositionLedger  # Открытые позиции и маржа аккаунта
+    signatures: SignatureIndex  # Уже обработанные position_signature
+    scheduler: SignalScheduler  # Срок годности и порядок сигналов
+    metrics: ExecutorMetrics
+    stream: WebsocketStream | None
+    worker_id: str  # Идентификатор реплики в claim-протоколе
+    claims: ClaimPrefetcher  # Захват пачек new_positions (следующая — впрок)
+    notifier: NotificationQueue
+    workers: ThreadPoolExecutor  # Ограниченный пул обработки сигналов
+    logger: logging.Logger
+    refresher: LedgerRefresher | None = None  # Фоновая сверка реестра с REST
+    backlog: IntakeBacklogSampler | None = None  # Фоновый замер очереди new_positions
+    unknown_orders: UnknownOrderTracker | None = None  # Уточнение ордеров без ответа биржи
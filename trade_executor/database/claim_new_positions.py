@@ -0,0 +1,101 @@
+"""
+Модуль захвата записей new_positions для обработки (claim-протокол).
+
+Запись проходит состояния: свободна (claimed_at IS NULL) -> в обработке
+(claimed_by/claimed_at заполнены) -> выполнена (удалена). Захват идёт через
+SELECT ... FOR UPDATE SKIP LOCKED, поэтому несколько реплик executor
+разбирают очередь параллельно и не получают одну запись дважды. Если
+реплика упала посреди обработки, её записи снова становятся доступны
+после истечения аренды (lease_seconds).
+"""
+
+import os
+import socket
+from typing import List, Dict, Any
+
+import psycopg
+
+_MIGRATION_QUERIES = (
+    "ALTER TABLE new_positions ADD COLUMN IF NOT EXISTS claimed_by TEXT;",
+    "ALTER TABLE new_positions ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMPTZ;",
+    "CREATE INDEX IF NOT EXISTS new_positions_claimed_at_idx ON new_positions (claimed_at);",
+)
+
+# Возвращаются только колонки, которые читает executor: пачка в памяти компактна
+_CLAIM_QUERY = """
+    UPDATE new_positions AS np
+    SET claimed_by = %(worker_id)s, claimed_at = now()
+    FROM (
+        SELECT id
+        FROM new_positions
+        WHERE claimed_at IS NULL
+           OR claimed_at < now() - make_interval(secs => %(lease_seconds)s)
+        ORDER BY detected_at DESC
+        LIMIT %(limit)s
+        FOR UPDATE SKIP LOCKED
+    ) AS picked
+    WHERE np.id = picked.id
+    RETURNING
+        np.id,
+        np.position_signature,
+        np.coin,
+        np.side,
+        np.entry_price,
+        np.leverage,
+        np.detected_at;
+"""
+
+
+def get_worker_id() -> str:
+    """
+    Возвращает идентификатор этой реплики executor.
+
+    Returns:
+        Строка вида hostname:pid.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def ensure_claim_columns(connection: psycopg.Connection) -> None:
+    """
+    Добавляет в new_positions колонки claim-протокола, если их ещё нет.
+
+    Args:
+        connection: Подключение к базе данных.
+    """
+    with connection.cursor() as cursor:
+        for query in _MIGRATION_QUERIES:
+            cursor.execute(query)
+    connection.commit()
+
+
+def claim_new_positions(
+    connection: psycopg.Connection,
+    worker_id: str,
+    limit: int = 50,
+    lease_seconds: int = 300
+) -> List[Dict[str, Any]]:
+    """
+    Захватывает до limit свободных записей одной транзакцией.
+
+    Args:
+        connection: Подключение к базе данных.
+        worker_id: Идентификатор реплики.
+        limit: Максимум записей за раз.
+        lease_seconds: Через сколько секунд захват считается брошенным.
+
+    Returns:
+        Список словарей с данными позиций, от новых к старым.
+    """
+    params = {"worker_id": worker_id, "lease_seconds": lease_seconds, "limit": limit}
+
+    with connection.cursor() as cursor:
+        cursor.execute(_CLAIM_QUERY, params)
+        columns = [desc[0] for desc in cursor.description]
+        rows = cursor.fetchall()
+    connection.commit()
+
+    positions = [dict(zip(columns, row)) for row in rows]
+    # RETURNING не сохраняет порядок подзапроса
+    positions.sort(key=lambda position: position["detected_at"], reverse=True)
+    return positions
@@ -0,0 +1,138 @@
+"""
+Модуль захвата следующей пачки new_positions впрок, пока обрабатывается текущая.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Set
+
+from .claim_new_positions import claim_new_positions
+from .complete_positions import complete_positions
+from .get_connection import get_connection
+from .record_processed_signatures import find_processed_signatures, record_processed_signatures
+
+
+class ClaimPrefetcher:
+    """
+    Захватывает следующую пачку в фоновом потоке.
+
+    При большой очереди (после простоя или наплыва сигналов) цикл,
+    захвативший полную пачку, сразу запрашивает следующую: запрос к БД
+    идёт параллельно с ордерами текущей пачки, и следующий цикл начинает
+    обработку без ожидания. Очередь разбирается пачками ограниченного
+    размера — в памяти не больше двух пачек.
+
+    Захваченное впрок, но не обработанное (остановка, недоступная биржа)
+    возвращается в очередь через release, а не ждёт истечения аренды.
+
+    Через этот же объект цикл проверяет подписи и завершает записи, так
+    что весь обмен цикла с очередью идёт через ctx.claims.
+    """
+
+    def __init__(self, database_url: str, worker_id: str, limit: int = 50, lease_seconds: int = 300):
+        """
+        Args:
+            database_url: URL подключения к PostgreSQL.
+            worker_id: Идентификатор реплики.
+            limit: Размер пачки.
+            lease_seconds: Через сколько секунд захват считается брошенным.
+        """
+        self.database_url = database_url
+        self.worker_id = worker_id
+        self.limit = limit
+        self.lease_seconds = lease_seconds
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="claim-prefetch")
+        self._future: "Future[List[Dict[str, Any]]] | None" = None
+
+    def claim(self) -> List[Dict[str, Any]]:
+        """
+        Захватывает пачку сейчас (подключение сразу возвращается в пул).
+
+        Returns:
+            Позиции от новых к старым.
+        """
+        with get_connection(self.database_url) as conn:
+            return claim_new_positions(
+                conn,
+                worker_id=self.worker_id,
+                limit=self.limit,
+                lease_seconds=self.lease_seconds
+            )
+
+    def prefetch(self) -> None:
+        """Начинает захват следующей пачки в фоне (если ещё не начат)."""
+        if self._future is None:
+            self._future = self._executor.submit(self.claim)
+
+    def take(self) -> List[Dict[str, Any]]:
+        """
+        Пачка, захваченная впрок, или новая, если впрок ничего не захватывалось.
+
+        Returns:
+            Позиции от новых к старым.
+        """
+        future, self._future = self._future, None
+        if future is None:
+            return self.claim()
+        return future.result()
+
+    def release(self, notify: bool = True) -> None:
+        """
+        Возвращает в очередь пачку, захваченную впрок.
+
+        Args:
+            notify: Уведомить слушателей о возвращённых записях (см. complete_positions).
+        """
+        future, self._future = self._future, None
+        if future is None:
+            return
+        try:
+            positions = future.result()
+        except Exception:
+            # Захват не удался — возвращать нечего
+            return
+        if positions:
+            with get_connection(self.database_url) as conn:
+                complete_positions(
+                    conn, self.worker_id, [], [position["id"] for position in positions], notify=notify
+                )
+
+    def find_processed(self, signatures: List[str]) -> Set[str]:
+        """
+        Находит среди подписей уже обработанные (в том числе другими репликами).
+
+        Args:
+            signatures: Подписи для проверки.
+
+        Returns:
+            Множество уже обработанных подписей.
+        """
+        with get_connection(self.database_url) as conn:
+            return find_processed_signatures(conn, signatures)
+
+    def complete(
+        self,
+        done_ids: List[int],
+        released_ids: List[int],
+        processed: List[str],
+        notify: bool = True
+    ) -> None:
+        """
+        Запоминает подписи обработанных сигналов и завершает захваченные записи.
+
+        Args:
+            done_ids: ID обработанных записей (удаляются).
+            released_ids: ID записей, которые нужно вернуть в очередь.
+            processed: Подписи обработанных сигналов.
+            notify: Уведомить слушателей о возвращённых записях (см. complete_positions).
+        """
+        with get_connection(self.database_url) as conn:
+            record_processed_signatures(conn, processed)
+            complete_positions(conn, self.worker_id, done_ids, released_ids, notify=notify)
+
+    def close(self) -> None:
+        """Возвращает захваченное впрок и останавливает фоновый поток."""
+        try:
+            self.release()
+        finally:
+            self._executor.shutdown(wait=True)
@@ -0,0 +1,53 @@
+"""
+Модуль завершения обработки захваченных записей new_positions.
+"""
+
+from typing import List
+
+import psycopg
+
+from .listen_new_positions import CHANNEL
+
+
+def complete_positions(
+    connection: psycopg.Connection,
+    worker_id: str,
+    done_ids: List[int],
+    released_ids: List[int],
+    notify: bool = True
+) -> None:
+    """
+    Одной транзакцией удаляет обработанные записи и освобождает остальные.
+
+    Удаляются и освобождаются только записи, захваченные этой репликой:
+    если аренда истекла и запись забрала другая реплика, она её и завершит.
+    Триггер NOTIFY срабатывает только на INSERT, поэтому о возвращённых
+    записях уведомление шлётся здесь, той же транзакцией: слушатели
+    забирают их сразу, а не на страховочном опросе.
+
+    Args:
+        connection: Подключение к базе данных.
+        worker_id: Идентификатор реплики.
+        done_ids: ID обработанных записей (удаляются).
+        released_ids: ID записей, которые нужно вернуть в очередь.
+        notify: Уведомить слушателей о возвращённых записях. False — записи
+            подождут страховочного опроса (повтор после ошибки не крутится вхолостую).
+    """
+    with connection.cursor() as cursor:
+        if done_ids:
+            cursor.execute(
+                "DELETE FROM new_positions WHERE id = ANY(%s) AND claimed_by = %s;",
+                (done_ids, worker_id)
+            )
+        if released_ids:
+            cursor.execute(
+                """
+                UPDATE new_positions
+                SET claimed_by = NULL, claimed_at = NULL
+                WHERE id = ANY(%s) AND claimed_by = %s;
+                """,
+                (released_ids, worker_id)
+            )
+            if notify and cursor.rowcount > 0:
+                cursor.execute("SELECT pg_notify(%s, '');", (CHANNEL,))
+    connection.commit()
@@ -0,0 +1,48 @@
+"""
+Модуль подсчёта очереди new_positions для метрик.
+"""
+
+from typing import Tuple
+
+import psycopg
+
+# Частичных индексов под эти условия нет: запрос идёт из фонового потока
+# раз в интервал, а не на каждый опрос /metrics
+_BACKLOG_QUERY = """
+    SELECT
+        count(*) FILTER (
+            WHERE claimed_at IS NULL
+               OR claimed_at < now() - make_interval(secs => %(lease_seconds)s)
+        ),
+        count(*) FILTER (
+            WHERE claimed_by = %(worker_id)s
+              AND claimed_at >= now() - make_interval(secs => %(lease_seconds)s)
+        )
+    FROM new_positions;
+"""
+
+
+def count_intake_backlog(
+    connection: psycopg.Connection,
+    worker_id: str,
+    lease_seconds: int = 300
+) -> Tuple[int, int]:
+    """
+    Считает свободные записи и записи, захваченные этой репликой.
+
+    Запись с истёкшей арендой считается свободной: её может забрать
+    любая реплика. В захваченные входит и пачка, захваченная впрок.
+
+    Args:
+        connection: Подключение к базе данных.
+        worker_id: Идентификатор реплики.
+        lease_seconds: Через сколько секунд захват считается брошенным.
+
+    Returns:
+        (свободные записи, записи в обработке у этой реплики).
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(_BACKLOG_QUERY, {"worker_id": worker_id, "lease_seconds": lease_seconds})
+        unclaimed, claimed = cursor.fetchone()
+    connection.commit()
+    return int(unclaimed), int(claimed)
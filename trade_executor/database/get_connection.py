@@ -1,11 +1,63 @@
 """
-Модуль получения подключения к PostgreSQL.
+Модуль получения подключения к PostgreSQL из долгоживущего пула.
 """
 
+import threading
 from contextlib import contextmanager
 from typing import Generator
 
 import psycopg
+from psycopg_pool import ConnectionPool
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def init_connection_pool(
+    dsn: str,
+    min_size: int = 1,
+    max_size: int = 4,
+    timeout: float = 10.0
+) -> ConnectionPool:
+    """
+    Открывает пул подключений к PostgreSQL (если ещё не открыт).
+
+    Пул проверяет подключение перед выдачей (check_connection), выбрасывает
+    сломанные соединения и переподключается в фоне.
+
+    Args:
+        dsn: Строка подключения.
+        min_size: Минимальное число постоянно открытых подключений.
+        max_size: Максимальное число подключений.
+        timeout: Сколько секунд ждать свободное подключение.
+
+    Returns:
+        Открытый пул подключений.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                conninfo=dsn,
+                min_size=min_size,
+                max_size=max_size,
+                timeout=timeout,
+                check=ConnectionPool.check_connection,
+                name="trade_executor",
+                open=True,
+            )
+        return _pool
+
+
+def close_connection_pool() -> None:
+    """Закрывает пул подключений."""
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
 
 
 @contextmanager
@@ -13,12 +65,12 @@ def get_connection(dsn: str) -> Generator[psycopg.Connection, None, None]:
     """
     Контекстный менеджер подключения к PostgreSQL.
 
+    Берёт подключение из пула и возвращает его обратно при выходе.
+    При выходе без исключения транзакция фиксируется, иначе откатывается.
+
     Args:
-        dsn: Строка подключения.
+        dsn: Строка подключения (используется, если пул ещё не открыт).
     """
-    connection = psycopg.connect(dsn)
-    try:
+    pool = _pool if _pool is not None else init_connection_pool(dsn)
+    with pool.connection() as connection:
         yield connection
-    finally:
-        connection.close()
-
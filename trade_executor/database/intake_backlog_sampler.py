@@ -0,0 +1,72 @@
+"""
+Модуль фонового замера очереди new_positions.
+"""
+
+import threading
+
+from .count_intake_backlog import count_intake_backlog
+from .get_connection import get_connection
+
+
+class IntakeBacklogSampler:
+    """
+    Раз в interval_seconds считает очередь new_positions в своём потоке.
+
+    Gauge читают последний замер: опрос /metrics не ходит в базу, и
+    частый scrape не нагружает её count(*) по всей таблице. Пока
+    замера нет или база недоступна, отдаётся последнее известное значение.
+    """
+
+    def __init__(self, database_url: str, worker_id: str, lease_seconds: int = 300, interval_seconds: float = 15.0):
+        """
+        Args:
+            database_url: URL подключения к PostgreSQL.
+            worker_id: Идентификатор реплики.
+            lease_seconds: Через сколько секунд захват считается брошенным.
+            interval_seconds: Интервал замера в секундах.
+        """
+        self.database_url = database_url
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.interval_seconds = interval_seconds
+
+        self.unclaimed = 0  # Свободные записи (включая брошенные с истёкшей арендой)
+        self.claimed = 0  # Записи в обработке у этой реплики (с пачкой, захваченной впрок)
+
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def sample(self) -> None:
+        """Считает очередь сейчас и обновляет значения для gauge."""
+        with get_connection(self.database_url) as conn:
+            self.unclaimed, self.claimed = count_intake_backlog(conn, self.worker_id, self.lease_seconds)
+
+    def start(self, logger=None) -> None:
+        """
+        Запускает фоновый замер.
+
+        Args:
+            logger: Logger для ошибок замера (опционально).
+        """
+        if self._thread is not None:
+            return
+
+        def _run() -> None:
+            while True:
+                try:
+                    self.sample()
+                except Exception as e:
+                    if logger is not None:
+                        logger.warning(f"Ошибка замера очереди new_positions: {e}")
+                if self._stop_event.wait(self.interval_seconds):
+                    return
+
+        self._thread = threading.Thread(target=_run, name="intake-backlog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Останавливает фоновый замер."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,115 @@
+"""
+Модуль push-уведомлений о новых записях в new_positions через LISTEN/NOTIFY.
+"""
+
+import psycopg
+
+CHANNEL = "new_positions"
+
+_CREATE_FUNCTION_QUERY = f"""
+    CREATE OR REPLACE FUNCTION notify_new_positions() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('{CHANNEL}', '');
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+_TRIGGER_EXISTS_QUERY = """
+    SELECT 1
+    FROM pg_trigger
+    WHERE tgname = 'new_positions_notify'
+      AND tgrelid = 'new_positions'::regclass;
+"""
+
+# Триггер уровня statement: одинаковые уведомления внутри одной транзакции
+# PostgreSQL схлопывает, поэтому пачка INSERT будит executor один раз.
+_CREATE_TRIGGER_QUERY = """
+    CREATE TRIGGER new_positions_notify
+    AFTER INSERT ON new_positions
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_new_positions();
+"""
+
+
+def ensure_notify_trigger(connection: psycopg.Connection) -> None:
+    """
+    Создаёт функцию и триггер NOTIFY на таблице new_positions, если их ещё нет.
+
+    Args:
+        connection: Подключение к базе данных.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(_CREATE_FUNCTION_QUERY)
+        cursor.execute(_TRIGGER_EXISTS_QUERY)
+        if cursor.fetchone() is None:
+            try:
+                cursor.execute(_CREATE_TRIGGER_QUERY)
+            except psycopg.errors.DuplicateObject:
+                # Триггер успела создать другая реплика
+                connection.rollback()
+    connection.commit()
+
+
+class NewPositionsListener:
+    """
+    Выделенное подключение, подписанное на канал new_positions.
+
+    Держит отдельный autocommit-коннект, так как LISTEN работает только
+    вне незавершённых транзакций.
+    """
+
+    def __init__(self, dsn: str):
+        """
+        Args:
+            dsn: Строка подключения.
+        """
+        self._dsn = dsn
+        self._connection: psycopg.Connection | None = None
+
+    @property
+    def connected(self) -> bool:
+        """True, если подписка активна."""
+        return self._connection is not None and not self._connection.closed
+
+    def connect(self) -> None:
+        """Открывает подключение, создаёт триггер и выполняет LISTEN."""
+        self.close()
+        connection = psycopg.connect(self._dsn, autocommit=True)
+        try:
+            ensure_notify_trigger(connection)
+            connection.execute(f"LISTEN {CHANNEL};")
+        except Exception:
+            connection.close()
+            raise
+        self._connection = connection
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Ждёт уведомление не дольше timeout секунд.
+
+        Args:
+            timeout: Максимальное время ожидания в секундах.
+
+        Returns:
+            True если пришло уведомление, False если истёк таймаут.
+        """
+        if not self.connected:
+            raise RuntimeError("Слушатель new_positions не подключён.")
+
+        received = False
+        for _ in self._connection.notifies(timeout=timeout, stop_after=1):
+            received = True
+
+        # Вычитываем накопившиеся уведомления, чтобы не будить цикл повторно
+        if received:
+            for _ in self._connection.notifies(timeout=0):
+                pass
+        return received
+
+    def close(self) -> None:
+        """Закрывает подключение слушателя."""
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            finally:
+                self._connection = None
@@ -0,0 +1,113 @@
+"""
+Модуль учёта обработанных сигналов в таблице processed_signatures.
+"""
+
+from typing import Iterable, List, Set
+
+import psycopg
+
+_MIGRATION_QUERIES = (
+    """
+    CREATE TABLE IF NOT EXISTS processed_signatures (
+        position_signature TEXT PRIMARY KEY,
+        processed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS processed_signatures_processed_at_idx ON processed_signatures (processed_at);",
+)
+
+
+def ensure_processed_signatures_table(connection: psycopg.Connection, retention_days: int = 30) -> None:
+    """
+    Создаёт таблицу processed_signatures, если её ещё нет, и удаляет старые записи.
+
+    Args:
+        connection: Подключение к базе данных.
+        retention_days: Сколько дней хранить подписи (0 — хранить всегда).
+    """
+    with connection.cursor() as cursor:
+        for query in _MIGRATION_QUERIES:
+            cursor.execute(query)
+        if retention_days > 0:
+            cursor.execute(
+                "DELETE FROM processed_signatures WHERE processed_at < now() - make_interval(days => %s);",
+                (retention_days,)
+            )
+    connection.commit()
+
+
+def load_recent_signatures(connection: psycopg.Connection, limit: int) -> List[str]:
+    """
+    Загружает подписи последних обработанных сигналов.
+
+    Args:
+        connection: Подключение к базе данных.
+        limit: Максимум подписей.
+
+    Returns:
+        Подписи от старых к новым.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT position_signature FROM (
+                SELECT position_signature, processed_at
+                FROM processed_signatures
+                ORDER BY processed_at DESC
+                LIMIT %s
+            ) AS recent
+            ORDER BY processed_at;
+            """,
+            (limit,)
+        )
+        rows = cursor.fetchall()
+    connection.commit()
+    return [row[0] for row in rows]
+
+
+def find_processed_signatures(connection: psycopg.Connection, signatures: List[str]) -> Set[str]:
+    """
+    Находит среди подписей уже обработанные (по первичному ключу).
+
+    Args:
+        connection: Подключение к базе данных.
+        signatures: Подписи для проверки.
+
+    Returns:
+        Множество уже обработанных подписей.
+    """
+    if not signatures:
+        return set()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT position_signature FROM processed_signatures WHERE position_signature = ANY(%s);",
+            (signatures,)
+        )
+        rows = cursor.fetchall()
+    connection.commit()
+    return {row[0] for row in rows}
+
+
+def record_processed_signatures(connection: psycopg.Connection, signatures: Iterable[str]) -> None:
+    """
+    Записывает подписи обработанных сигналов.
+
+    Не фиксирует транзакцию: вызывается перед complete_positions, чтобы
+    удаление записей new_positions и учёт их подписей прошли вместе.
+
+    Args:
+        connection: Подключение к базе данных.
+        signatures: Подписи обработанных сигналов.
+    """
+    signatures = list(signatures)
+    if not signatures:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO processed_signatures (position_signature)
+            SELECT unnest(%s::text[])
+            ON CONFLICT (position_signature) DO NOTHING;
+            """,
+            (signatures,)
+        )
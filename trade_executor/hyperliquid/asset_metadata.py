@@ -0,0 +1,151 @@
+"""
+Модуль кэша метаданных активов Hyperliquid (asset index, szDecimals, maxLeverage).
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+
+@dataclass(frozen=True)
+class AssetMeta:
+    """Метаданные одного перпетуального актива."""
+
+    name: str
+    asset_index: int
+    sz_decimals: int
+    max_leverage: int
+    only_isolated: bool
+
+
+def build_asset_index(meta: Dict[str, Any]) -> Dict[str, AssetMeta]:
+    """
+    Строит словарь coin -> AssetMeta из ответа info.meta().
+
+    Args:
+        meta: Ответ meta с полем universe.
+
+    Returns:
+        Словарь метаданных по символу монеты.
+    """
+    index = {}
+    for asset_index, asset in enumerate(meta.get("universe", [])):
+        name = asset["name"]
+        index[name] = AssetMeta(
+            name=name,
+            asset_index=asset_index,
+            sz_decimals=int(asset.get("szDecimals", 8)),
+            max_leverage=int(asset.get("maxLeverage", 1)),
+            only_isolated=bool(asset.get("onlyIsolated", False)),
+        )
+    return index
+
+
+class AssetMetadataCache:
+    """
+    O(1) индекс метаданных по монете с обновлением по TTL.
+
+    Единственный источник метаданных executor: из него берутся индекс
+    актива для ордеров и смены плеча, szDecimals и maxLeverage.
+    Загружается при старте, обновляется фоновым потоком раз в ttl_seconds и
+    принудительно перезагружается, когда запрошена неизвестная монета.
+    Монета, которой нет и после перезагрузки, запоминается на
+    unknown_ttl_seconds: повторные сигналы по ней не тратят вес запросов.
+    """
+
+    def __init__(
+        self,
+        fetch_meta: Callable[[], Dict[str, Any]],
+        ttl_seconds: int = 300,
+        unknown_ttl_seconds: float = 60.0
+    ):
+        """
+        Args:
+            fetch_meta: Функция загрузки meta (обычно client.meta).
+            ttl_seconds: Интервал фонового обновления в секундах.
+            unknown_ttl_seconds: Сколько секунд не перезагружать meta ради неизвестной монеты.
+        """
+        self._fetch_meta = fetch_meta
+        self.ttl_seconds = ttl_seconds
+        self.unknown_ttl_seconds = unknown_ttl_seconds
+
+        self._lock = threading.Lock()
+        self._assets: Dict[str, AssetMeta] = {}
+        # coin -> когда монета последний раз не нашлась после перезагрузки (monotonic)
+        self._unknown: Dict[str, float] = {}
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def refresh(self) -> None:
+        """Перезагружает метаданные с биржи."""
+        self.load(self._fetch_meta())
+
+    def load(self, meta: Dict[str, Any]) -> None:
+        """
+        Загружает уже полученный meta (при прогреве или из снимка на диске).
+
+        Args:
+            meta: Ответ meta с полем universe.
+        """
+        assets = build_asset_index(meta)
+        with self._lock:
+            self._assets = assets
+            # Новые листинги больше не считаются неизвестными
+            self._unknown = {coin: at for coin, at in self._unknown.items() if coin not in assets}
+
+    def get(self, coin: str) -> AssetMeta:
+        """
+        Возвращает метаданные монеты.
+
+        Args:
+            coin: Символ монеты.
+
+        Returns:
+            Метаданные актива.
+
+        Raises:
+            KeyError: Если монеты нет и после принудительного обновления.
+        """
+        asset = self._assets.get(coin)
+        if asset is not None:
+            return asset
+
+        missing_at = self._unknown.get(coin)
+        if missing_at is None or time.monotonic() - missing_at >= self.unknown_ttl_seconds:
+            # Неизвестная монета — возможно, новый листинг
+            self.refresh()
+            asset = self._assets.get(coin)
+            if asset is not None:
+                return asset
+            with self._lock:
+                self._unknown[coin] = time.monotonic()
+        raise KeyError(f"Монета {coin} не найдена в метаданных Hyperliquid.")
+
+    def start(self, logger=None) -> None:
+        """
+        Запускает фоновое обновление по TTL.
+
+        Args:
+            logger: Logger для ошибок обновления (опционально).
+        """
+        if self._thread is not None:
+            return
+
+        def _run() -> None:
+            while not self._stop_event.wait(self.ttl_seconds):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    if logger is not None:
+                        logger.error(f"Ошибка обновления метаданных Hyperliquid: {e}")
+
+        self._thread = threading.Thread(target=_run, name="asset-metadata-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Останавливает фоновое обновление."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,321 @@
+"""
+Модуль долгоживущего клиента Hyperliquid (wallet, подпись и отправка действий).
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List
+
+import requests
+
+from ..metrics.executor_metrics import ExecutorMetrics, STAGE_EXCHANGE_ACK, STAGE_LEVERAGE, STAGE_SIGN
+from ..utils.http_client import get_http_client, was_not_sent
+from .endpoint_breakers import exchange_breaker, info_breaker
+from .rate_limiter import PRIORITY_ORDER, exchange_weight, get_rate_limiter, info_weight
+from .signing_pool import SigningPool
+
+# SDK и eth_account импортируются при первом использовании: вместе это
+# около секунды на холодном контейнере, которую не нужно платить до прогрева
+if TYPE_CHECKING:
+    from eth_account.signers.local import LocalAccount
+
+# Адрес mainnet (hyperliquid.utils.constants.MAINNET_API_URL)
+_MAINNET_API_URL = "https://api.hyperliquid.xyz"
+
+
+class ActionOutcomeUnknown(Exception):
+    """
+    Действие ушло на биржу, но ответ не получен (таймаут, обрыв, 5xx).
+
+    Биржа могла его исполнить, поэтому повторять действие нельзя:
+    исход берётся из сделок или сверки с clearinghouseState.
+    """
+
+
+@dataclass
+class SignedAction:
+    """Действие с nonce и подписью (или Future подписи из пула)."""
+
+    action: Dict[str, Any]
+    nonce: int
+    signature: Any  # dict {"r", "s", "v"} или Future с ним
+    sign_seconds: float = 0.0  # Сколько подпись заняла в текущем потоке
+
+    def get_signature(self) -> Dict[str, Any]:
+        """Подпись (ждёт пул, если подпись ещё считается)."""
+        if isinstance(self.signature, Future):
+            return self.signature.result()
+        return self.signature
+
+
+class HyperliquidClient:
+    """
+    Создаётся и прогревается один раз при старте, переиспользуется всеми ордерами.
+
+    Wallet строится из ключа один раз. Своих метаданных у клиента нет:
+    индексы активов приходят в ордерах из AssetMetadataCache, поэтому
+    Exchange SDK не создаётся и пересоздавать на пути ордера нечего.
+
+    Ордера и смена плеча подписываются здесь, а не в методах Exchange:
+    SDK берёт nonce из текущего времени в мс, и параллельные действия
+    в одну миллисекунду отклоняются биржей как повторный nonce. Если задан
+    SigningPool, подпись считается в его процессах.
+
+    Запросы к /info и отправка действий идут через общий HTTP клиент
+    процесса, с его повторами и backoff: соединение с API открывается
+    один раз на процесс.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        private_key: str,
+        timeout: int = 10,
+        metrics: ExecutorMetrics | None = None,
+        signer: SigningPool | None = None
+    ):
+        """
+        Args:
+            api_url: URL API Hyperliquid.
+            private_key: Приватный ключ (hex строка без 0x или с ним).
+            timeout: Таймаут HTTP запросов.
+            metrics: Метрики executor (опционально).
+            signer: Пул процессов подписи (по умолчанию подпись в текущем потоке).
+        """
+        from eth_account import Account
+
+        # Нормализуем приватный ключ
+        if not private_key.startswith("0x"):
+            private_key = "0x" + private_key
+
+        self.api_url = api_url
+        self.timeout = timeout
+        # Действия подписываются от своего имени (без vault) и без срока действия
+        self.is_mainnet = api_url == _MAINNET_API_URL
+        self.metrics = metrics
+        self.signer = signer
+        self.wallet: "LocalAccount" = Account.from_key(private_key)
+
+        self._nonce_lock = threading.Lock()
+        self._last_nonce = 0
+
+    def all_mids(self) -> Dict[str, str]:
+        """
+        Mid-цены всех монет (справочный запрос в пределах бюджета веса).
+
+        Raises:
+            RateLimitExceeded: Если бюджет запросов исчерпан.
+            CircuitOpenError: Если /info отключён автоматом.
+        """
+        return self._post_info({"type": "allMids"})
+
+    def meta(self) -> Dict[str, Any]:
+        """
+        Метаданные перпетуальных активов (справочный запрос в пределах бюджета веса).
+
+        Raises:
+            RateLimitExceeded: Если бюджет запросов исчерпан.
+            CircuitOpenError: Если /info отключён автоматом.
+        """
+        return self._post_info({"type": "meta"})
+
+    def order_status(self, user: str, cloid: str) -> Dict[str, Any]:
+        """
+        Статус ордера по клиентскому id (справочный запрос в пределах бюджета веса).
+
+        Args:
+            user: Адрес аккаунта, от имени которого отправлен ордер.
+            cloid: Клиентский id ордера (0x и 32 hex-символа).
+
+        Returns:
+            Ответ orderStatus: {"status": "order", "order": {...}} или {"status": "unknownOid"}.
+
+        Raises:
+            RateLimitExceeded: Если бюджет запросов исчерпан.
+            CircuitOpenError: Если /info отключён автоматом.
+        """
+        return self._post_info({"type": "orderStatus", "user": user, "oid": cloid})
+
+    def _post_info(self, payload: Dict[str, Any]) -> Any:
+        """
+        Справочный запрос к /info через общий HTTP клиент.
+
+        Запрос идемпотентен, поэтому HTTP клиент повторяет его с backoff
+        при обрыве, таймауте и 5xx — в отличие от Info SDK, который
+        отправляет запрос один раз.
+
+        Args:
+            payload: Тело запроса (поле type определяет вес).
+
+        Returns:
+            Ответ API.
+        """
+        get_rate_limiter().acquire(info_weight(payload["type"]))
+        with info_breaker().guard():
+            response = get_http_client().post(
+                f"{self.api_url}/info", json=payload, idempotent=True, timeout=self.timeout
+            )
+            response.raise_for_status()
+        return response.json()
+
+    def next_nonce(self) -> int:
+        """
+        Возвращает уникальный возрастающий nonce (время в мс, не меньше предыдущего + 1).
+
+        Returns:
+            Nonce для подписи действия.
+        """
+        with self._nonce_lock:
+            nonce = max(int(time.time() * 1000), self._last_nonce + 1)
+            self._last_nonce = nonce
+            return nonce
+
+    def bulk_orders(self, order_requests: List[Dict[str, Any]]) -> Any:
+        """
+        Подписывает и отправляет ордера одним действием order.
+
+        Args:
+            order_requests: Ордера из build_market_order_request (с индексом актива в "asset").
+
+        Returns:
+            Ответ от exchange API.
+        """
+        from hyperliquid.utils.signing import order_request_to_order_wire, order_wires_to_order_action
+
+        order_wires = [
+            order_request_to_order_wire(order, order["asset"])
+            for order in order_requests
+        ]
+        return self.post_signed(self.sign_action(order_wires_to_order_action(order_wires)))
+
+    def update_leverage(self, leverage: int, asset: int, is_cross: bool = True) -> Any:
+        """
+        Подписывает и отправляет смену плеча для актива.
+
+        Args:
+            leverage: Плечо.
+            asset: Индекс актива (AssetMeta.asset_index).
+            is_cross: Кросс-маржа (True) или изолированная (False).
+
+        Returns:
+            Ответ от exchange API.
+        """
+        return self.post_signed(self.presign_leverage(leverage, asset, is_cross))
+
+    def presign_leverage(self, leverage: int, asset: int, is_cross: bool = True) -> SignedAction:
+        """
+        Подписывает смену плеча заранее, не отправляя её.
+
+        Args:
+            leverage: Плечо.
+            asset: Индекс актива (AssetMeta.asset_index).
+            is_cross: Кросс-маржа (True) или изолированная (False).
+
+        Returns:
+            Подписанное действие для post_signed.
+        """
+        action = {
+            "type": "updateLeverage",
+            "asset": asset,
+            "isCross": is_cross,
+            "leverage": leverage,
+        }
+        return self.sign_action(action)
+
+    def sign_action(self, action: Dict[str, Any]) -> SignedAction:
+        """
+        Назначает действию nonce и ставит его на подпись.
+
+        Args:
+            action: Действие.
+
+        Returns:
+            Подписанное действие (с пулом подпись может ещё считаться).
+        """
+        started = time.perf_counter()
+        nonce = self.next_nonce()
+        args = (action, None, nonce, None, self.is_mainnet)
+        if self.signer is not None:
+            signature = self.signer.sign(*args)
+        else:
+            from hyperliquid.utils.signing import sign_l1_action
+
+            signature = sign_l1_action(self.wallet, *args)
+        return SignedAction(
+            action=action,
+            nonce=nonce,
+            signature=signature,
+            sign_seconds=time.perf_counter() - started,
+        )
+
+    def post_signed(self, signed_action: SignedAction) -> Any:
+        """
+        Отправляет подписанное действие.
+
+        Args:
+            signed_action: Результат sign_action или presign_leverage.
+
+        Returns:
+            Ответ от exchange API.
+
+        Raises:
+            ActionOutcomeUnknown: Если действие могло дойти до биржи, но ответа нет.
+        """
+        started = time.perf_counter()
+        signature = signed_action.get_signature()
+        signed = time.perf_counter()
+        # Подпись на горячем пути: в текущем потоке плюс ожидание пула
+        sign_seconds = signed_action.sign_seconds + (signed - started)
+
+        action = signed_action.action
+        # Тело запроса как в Exchange._post_action без vault и срока действия
+        payload = {
+            "action": action,
+            "nonce": signed_action.nonce,
+            "signature": signature,
+            "vaultAddress": None,
+            "expiresAfter": None,
+        }
+        get_rate_limiter().acquire(exchange_weight(action), PRIORITY_ORDER)
+        try:
+            # Действие не повторяется после отправки: ответ мог потеряться уже после исполнения
+            with exchange_breaker().guard():
+                http_response = get_http_client().post(
+                    f"{self.api_url}/exchange",
+                    json=payload,
+                    idempotent=False,
+                    timeout=self.timeout,
+                )
+                http_response.raise_for_status()
+            response = http_response.json()
+        except Exception as e:
+            self._record_action(action, sign_seconds, signed, ok=False)
+            if _may_have_executed(e):
+                raise ActionOutcomeUnknown(str(e)) from e
+            raise
+        self._record_action(action, sign_seconds, signed, ok=isinstance(response, dict) and response.get("status") == "ok")
+        return response
+
+    def _record_action(self, action: Dict[str, Any], sign_seconds: float, signed: float, ok: bool) -> None:
+        if self.metrics is None:
+            return
+        finished = time.perf_counter()
+        if action.get("type") == "updateLeverage":
+            self.metrics.observe_stage(STAGE_LEVERAGE, sign_seconds + (finished - signed))
+            self.metrics.leverage_updates.inc(result="ok" if ok else "error")
+        else:
+            self.metrics.observe_stage(STAGE_SIGN, sign_seconds)
+            self.metrics.observe_stage(STAGE_EXCHANGE_ACK, finished - signed)
+
+
+def _may_have_executed(error: Exception) -> bool:
+    """Ошибка получена после того, как действие могло дойти до биржи."""
+    if isinstance(error, requests.HTTPError):
+        # 4xx — запрос отклонён целиком, 5xx — мог быть обработан
+        return error.response is None or error.response.status_code >= 500
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return not was_not_sent(error)
+    # Ответ 200 с нечитаемым телом
+    return isinstance(error, ValueError)
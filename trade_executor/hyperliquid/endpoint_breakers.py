@@ -0,0 +1,29 @@
+"""
+Модуль автоматов отключения эндпоинтов Hyperliquid (/info и /exchange).
+"""
+
+from ..utils.circuit_breaker import CircuitBreaker, get_circuit_breaker
+
+INFO_ENDPOINT = "hyperliquid_info"
+EXCHANGE_ENDPOINT = "hyperliquid_exchange"
+
+
+def info_breaker() -> CircuitBreaker:
+    """Автомат справочных запросов /info."""
+    return get_circuit_breaker(INFO_ENDPOINT)
+
+
+def exchange_breaker() -> CircuitBreaker:
+    """Автомат действий /exchange (ордера, плечо)."""
+    return get_circuit_breaker(EXCHANGE_ENDPOINT)
+
+
+def unavailable_for_seconds() -> float:
+    """
+    Сколько ещё Hyperliquid считается недоступным.
+
+    Returns:
+        Секунды до пробного запроса самого долго разомкнутого автомата
+        или 0, если торговать можно.
+    """
+    return max(info_breaker().retry_in, exchange_breaker().retry_in)
@@ -2,9 +2,12 @@
 Модуль получения состояния аккаунта Hyperliquid.
 """
 
-import requests
 from typing import Dict, Any
 
+from ..utils.http_client import get_http_client
+from .endpoint_breakers import info_breaker
+from .rate_limiter import get_rate_limiter, info_weight
+
 
 def get_account_state(api_url: str, wallet_address: str, timeout: int = 10) -> Dict[str, Any]:
     """
@@ -13,10 +16,14 @@ def get_account_state(api_url: str, wallet_address: str, timeout: int = 10) -> D
     Args:
         api_url: URL API Hyperliquid.
         wallet_address: Адрес кошелька пользователя.
-        timeout: Таймаут запроса в секундах.
+        timeout: Таймаут ответа в секундах.
 
     Returns:
         Словарь с данными состояния аккаунта.
+
+    Raises:
+        RateLimitExceeded: Если бюджет запросов исчерпан.
+        CircuitOpenError: Если /info отключён автоматом.
     """
     endpoint = f"{api_url}/info"
     payload = {
@@ -24,7 +31,9 @@ def get_account_state(api_url: str, wallet_address: str, timeout: int = 10) -> D
         "user": wallet_address
     }
 
-    response = requests.post(endpoint, json=payload, timeout=timeout)
-    response.raise_for_status()
+    get_rate_limiter().acquire(info_weight("clearinghouseState"))
+    with info_breaker().guard():
+        response = get_http_client().post(endpoint, json=payload, idempotent=True, timeout=timeout)
+        response.raise_for_status()
     return response.json()
 
@@ -0,0 +1,37 @@
+"""
+Модуль получения метаданных биржи Hyperliquid (meta и spotMeta).
+"""
+
+from typing import Dict, Any, Tuple
+
+from ..utils.http_client import get_http_client
+from .endpoint_breakers import info_breaker
+from .rate_limiter import get_rate_limiter, info_weight
+
+
+def get_exchange_metadata(api_url: str, timeout: int = 10) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Загружает метаданные перпетуальных и спотовых активов через Hyperliquid API.
+
+    Запросы идут напрямую, без SDK: метаданные нужны на прогреве раньше,
+    чем импортирован SDK, и ими же затем заполняется кэш активов.
+
+    Args:
+        api_url: URL API Hyperliquid.
+        timeout: Таймаут ответа в секундах.
+
+    Returns:
+        (meta, spot_meta) в формате ответов info.meta() и info.spot_meta().
+    """
+    endpoint = f"{api_url}/info"
+    http = get_http_client()
+    get_rate_limiter().acquire(info_weight("meta") + info_weight("spotMeta"))
+
+    with info_breaker().guard():
+        meta_response = http.post(endpoint, json={"type": "meta"}, idempotent=True, timeout=timeout)
+        meta_response.raise_for_status()
+    with info_breaker().guard():
+        spot_response = http.post(endpoint, json={"type": "spotMeta"}, idempotent=True, timeout=timeout)
+        spot_response.raise_for_status()
+
+    return meta_response.json(), spot_response.json()
@@ -0,0 +1,143 @@
+"""
+Модуль выбора и установки плеча по лимитам актива.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+from .asset_metadata import AssetMetadataCache
+from .client import HyperliquidClient, SignedAction
+
+# Сколько заранее подписанная смена плеча остаётся пригодной (мс):
+# биржа принимает nonce только в окне вокруг текущего времени
+_PRESIGNED_MAX_AGE_MS = 60_000
+
+
+class LeverageManager:
+    """
+    Подбирает плечо до отправки ордера и помнит, какое плечо уже выставлено.
+
+    Запрошенное плечо ограничивается maxLeverage актива, режим маржи берётся
+    из настроек (для onlyIsolated-активов — всегда изолированная).
+    update_leverage вызывается, только если плечо или режим монеты меняются.
+
+    prepare() подписывает смену плеча, как только сигнал захвачен, чтобы
+    ensure() оставалось только отправить готовое действие.
+    """
+
+    def __init__(self, client: HyperliquidClient, assets: AssetMetadataCache, margin_mode: str = "cross"):
+        """
+        Args:
+            client: Прогретый клиент Hyperliquid.
+            assets: Кэш метаданных активов.
+            margin_mode: Режим маржи аккаунта: "cross" или "isolated".
+        """
+        self._client = client
+        self._assets = assets
+        self.margin_mode = margin_mode
+
+        self._lock = threading.Lock()
+        # coin -> (плечо, is_cross), уже выставленные на бирже
+        self._current: Dict[str, Tuple[int, bool]] = {}
+        # Монеты с открытой позицией: режим маржи у них сменить нельзя
+        self._position_modes: Dict[str, bool] = {}
+        # coin -> (плечо, is_cross, подписанное действие)
+        self._presigned: Dict[str, Tuple[int, bool, SignedAction]] = {}
+
+    def seed(self, account_state: Dict[str, Any]) -> None:
+        """
+        Запоминает плечо монет с открытыми позициями из clearinghouseState.
+
+        Args:
+            account_state: Состояние аккаунта от API.
+        """
+        current = {}
+        for entry in account_state.get("assetPositions", []):
+            pos = entry.get("position", {})
+            leverage = pos.get("leverage") or {}
+            if not pos.get("coin") or "value" not in leverage:
+                continue
+            current[pos["coin"]] = (int(leverage["value"]), leverage.get("type") != "isolated")
+
+        with self._lock:
+            self._current.update(current)
+            self._position_modes = {coin: is_cross for coin, (_, is_cross) in current.items()}
+
+    def resolve(self, coin: str, requested: int) -> Tuple[int, bool]:
+        """
+        Рассчитывает допустимое плечо и режим маржи для монеты.
+
+        Args:
+            coin: Символ монеты.
+            requested: Плечо из сигнала.
+
+        Returns:
+            (плечо, is_cross).
+        """
+        asset = self._assets.get(coin)
+        leverage = max(1, min(int(requested), asset.max_leverage))
+
+        is_cross = self.margin_mode != "isolated" and not asset.only_isolated
+        # Если по монете уже есть позиция, режим маржи менять нельзя
+        is_cross = self._position_modes.get(coin, is_cross)
+        return leverage, is_cross
+
+    def prepare(self, coin: str, requested: int) -> None:
+        """
+        Заранее подписывает смену плеча, если она понадобится.
+
+        Args:
+            coin: Символ монеты.
+            requested: Плечо из сигнала.
+        """
+        leverage, is_cross = self.resolve(coin, requested)
+        if self._current.get(coin) == (leverage, is_cross):
+            return
+        with self._lock:
+            presigned = self._presigned.get(coin)
+        if presigned is not None and presigned[:2] == (leverage, is_cross) and self._is_fresh(presigned[2]):
+            return
+
+        signed_action = self._client.presign_leverage(
+            leverage, self._assets.get(coin).asset_index, is_cross=is_cross
+        )
+        with self._lock:
+            self._presigned[coin] = (leverage, is_cross, signed_action)
+
+    def ensure(self, coin: str, requested: int) -> int:
+        """
+        Выставляет плечо монеты, если оно отличается от уже выставленного.
+
+        Args:
+            coin: Символ монеты.
+            requested: Плечо из сигнала.
+
+        Returns:
+            Фактически выставленное плечо.
+
+        Raises:
+            RuntimeError: Если биржа отклонила смену плеча.
+        """
+        leverage, is_cross = self.resolve(coin, requested)
+        if self._current.get(coin) == (leverage, is_cross):
+            return leverage
+
+        with self._lock:
+            presigned = self._presigned.pop(coin, None)
+        if presigned is not None and presigned[:2] == (leverage, is_cross) and self._is_fresh(presigned[2]):
+            response = self._client.post_signed(presigned[2])
+        else:
+            response = self._client.update_leverage(
+                leverage, self._assets.get(coin).asset_index, is_cross=is_cross
+            )
+        if not isinstance(response, dict) or response.get("status") != "ok":
+            raise RuntimeError(f"Биржа отклонила плечо {leverage}x для {coin}: {response}")
+
+        with self._lock:
+            self._current[coin] = (leverage, is_cross)
+        return leverage
+
+    @staticmethod
+    def _is_fresh(signed_action: SignedAction) -> bool:
+        return int(time.time() * 1000) - signed_action.nonce < _PRESIGNED_MAX_AGE_MS
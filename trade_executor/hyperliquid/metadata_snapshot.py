@@ -0,0 +1,55 @@
+"""
+Модуль снимка метаданных Hyperliquid на диске.
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, Tuple
+
+
+def save_metadata_snapshot(path: str, meta: Dict[str, Any], spot_meta: Dict[str, Any]) -> None:
+    """
+    Сохраняет meta и spot_meta на диск.
+
+    Файл пишется во временный и подменяется атомарно, чтобы процесс,
+    остановленный посреди записи, не оставил обрезанный снимок.
+
+    Args:
+        path: Путь к файлу снимка.
+        meta: Ответ info.meta().
+        spot_meta: Ответ info.spot_meta().
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"saved_at": time.time(), "meta": meta, "spot_meta": spot_meta}, f)
+    os.replace(tmp_path, path)
+
+
+def load_metadata_snapshot(path: str) -> Tuple[Dict[str, Any], Dict[str, Any], float] | None:
+    """
+    Читает снимок метаданных с диска.
+
+    Args:
+        path: Путь к файлу снимка.
+
+    Returns:
+        (meta, spot_meta, возраст снимка в секундах) или None, если снимка нет
+        или он повреждён.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        meta = snapshot["meta"]
+        spot_meta = snapshot["spot_meta"]
+        age_seconds = time.time() - float(snapshot.get("saved_at", 0))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    if not isinstance(meta, dict) or not isinstance(spot_meta, dict):
+        return None
+    return meta, spot_meta, age_seconds
@@ -0,0 +1,108 @@
+"""
+Модуль кэша mid-цен, обновляемого подпиской allMids по WebSocket.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from ..utils.circuit_breaker import CircuitOpenError
+from .rate_limiter import RateLimitExceeded
+from .websocket_stream import WebsocketStream
+
+
+class MidPriceCache:
+    """
+    Таблица mid-цен в памяти с отметкой времени по каждой монете.
+
+    Цены приходят из подписки allMids. Если цена монеты старше
+    max_age_seconds (или сокет не подключён), делается один REST-запрос
+    all_mids, и таблица обновляется целиком. Если бюджет запросов
+    исчерпан или /info отключён автоматом, возвращается последняя
+    известная цена.
+    """
+
+    def __init__(
+        self,
+        fetch_all_mids: Callable[[], Dict[str, str]],
+        max_age_seconds: float = 3.0
+    ):
+        """
+        Args:
+            fetch_all_mids: REST-запрос всех mid-цен (обычно client.all_mids).
+            max_age_seconds: Максимальный возраст цены, после которого идём в REST.
+        """
+        self._fetch_all_mids = fetch_all_mids
+        self.max_age_seconds = max_age_seconds
+
+        self._lock = threading.Lock()
+        self._prices: Dict[str, Tuple[float, float]] = {}
+
+    def attach(self, stream: WebsocketStream) -> None:
+        """
+        Подписывает кэш на allMids.
+
+        Args:
+            stream: WebSocket-подключение к Hyperliquid.
+        """
+        stream.subscribe({"type": "allMids"}, self._on_all_mids)
+
+    def update(self, mids: Dict[str, Any]) -> None:
+        """
+        Записывает пачку цен с текущей отметкой времени.
+
+        Args:
+            mids: Словарь coin -> mid (строки или числа).
+        """
+        now = time.monotonic()
+        with self._lock:
+            for coin, price in mids.items():
+                try:
+                    self._prices[coin] = (float(price), now)
+                except (ValueError, TypeError):
+                    continue
+
+    def age_seconds(self, coin: str) -> float:
+        """
+        Возвращает возраст цены монеты (inf, если цены нет).
+
+        Args:
+            coin: Символ монеты.
+        """
+        entry = self._prices.get(coin)
+        if entry is None:
+            return float("inf")
+        return time.monotonic() - entry[1]
+
+    def get_mid(self, coin: str) -> float:
+        """
+        Возвращает свежую mid-цену монеты.
+
+        Args:
+            coin: Символ монеты.
+
+        Returns:
+            Mid-цена.
+
+        Raises:
+            KeyError: Если цены монеты нет и в REST-ответе.
+        """
+        entry = self._prices.get(coin)
+        if entry is not None and time.monotonic() - entry[1] <= self.max_age_seconds:
+            return entry[0]
+
+        # Цена устарела или её нет — запасной путь через REST
+        try:
+            self.update(self._fetch_all_mids())
+        except (RateLimitExceeded, CircuitOpenError):
+            if entry is None:
+                raise
+            return entry[0]
+        entry = self._prices.get(coin)
+        if entry is None:
+            raise KeyError(f"Нет mid-цены для монеты {coin}.")
+        return entry[0]
+
+    def _on_all_mids(self, message: Dict[str, Any]) -> None:
+        mids = message.get("data", {}).get("mids", {})
+        self.update(mids)
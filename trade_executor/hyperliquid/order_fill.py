@@ -0,0 +1,134 @@
+"""
+Модуль разбора исполнения ордера из ответа биржи.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Any, Dict
+
+FILL_FILLED = "filled"      # Исполнен полностью
+FILL_PARTIAL = "partial"    # Исполнен частично, остаток снят
+FILL_REJECTED = "rejected"  # Отклонён биржей
+FILL_UNKNOWN = "unknown"    # Ответ не получен: ордер мог исполниться
+
+
+@dataclass(frozen=True)
+class OrderFill:
+    """Исполнение ордера по ответу биржи."""
+
+    coin: str
+    is_buy: bool
+    requested_sz: float  # Объём ордера в монетах
+    state: str  # FILL_FILLED, FILL_PARTIAL, FILL_REJECTED или FILL_UNKNOWN
+    oid: int | None = None
+    filled_sz: float = 0.0  # Исполненный объём в монетах
+    avg_px: float | None = None  # Средняя цена исполнения (None — неизвестна)
+    error: str | None = None  # Ошибка биржи или запроса
+    cloid: str | None = None  # Клиентский id ордера (для orderStatus)
+
+    @property
+    def accepted(self) -> bool:
+        """Ордер исполнен хотя бы частично."""
+        return self.state in (FILL_FILLED, FILL_PARTIAL)
+
+
+def order_fill_from_status(order_request: Dict[str, Any], status: Dict[str, Any]) -> OrderFill:
+    """
+    Разбирает статус ордера из ответа на действие order.
+
+    Ордера executor — IoC: исполнение завершается в момент ответа, и
+    totalSz меньше объёма ордера значит, что остаток уже снят биржей.
+
+    Args:
+        order_request: Ордер из build_market_order_request.
+        status: Статус ордера из parse_order_statuses.
+
+    Returns:
+        Исполнение ордера.
+    """
+    coin = order_request["coin"]
+    is_buy = order_request["is_buy"]
+    requested_sz = float(order_request["sz"])
+
+    filled = status.get("filled")
+    if filled:
+        filled_sz = float(filled.get("totalSz", 0) or 0)
+        avg_px = float(filled["avgPx"]) if filled.get("avgPx") else None
+        return OrderFill(
+            coin=coin,
+            is_buy=is_buy,
+            requested_sz=requested_sz,
+            state=FILL_FILLED if filled_sz >= requested_sz - 1e-12 else FILL_PARTIAL,
+            oid=filled.get("oid"),
+            filled_sz=filled_sz,
+            avg_px=avg_px,
+        )
+
+    return OrderFill(
+        coin=coin,
+        is_buy=is_buy,
+        requested_sz=requested_sz,
+        state=FILL_REJECTED,
+        error=str(status.get("error", status)),
+    )
+
+
+def unknown_order_fill(order_request: Dict[str, Any], error: Exception) -> OrderFill:
+    """
+    Исполнение ордера, ответ на который не получен.
+
+    Args:
+        order_request: Ордер из build_market_order_request.
+        error: Ошибка отправки.
+
+    Returns:
+        Исполнение в состоянии FILL_UNKNOWN.
+    """
+    return OrderFill(
+        coin=order_request["coin"],
+        is_buy=order_request["is_buy"],
+        requested_sz=float(order_request["sz"]),
+        state=FILL_UNKNOWN,
+        error=str(error),
+        cloid=str(order_request["cloid"]) if order_request.get("cloid") is not None else None,
+    )
+
+
+def order_fill_from_order_status(fill: OrderFill, response: Dict[str, Any], final: bool = False) -> OrderFill | None:
+    """
+    Уточняет исполнение ордера без ответа по результату orderStatus.
+
+    orderStatus не возвращает среднюю цену, поэтому avg_px остаётся
+    неизвестной. unknownOid сразу после отправки может значить, что
+    ордер ещё не обработан, поэтому окончательным отказом он считается
+    только при final.
+
+    Args:
+        fill: Исполнение в состоянии FILL_UNKNOWN.
+        response: Ответ orderStatus.
+        final: Последняя попытка: unknownOid значит, что ордер не дошёл до биржи.
+
+    Returns:
+        Уточнённое исполнение или None, если исход пока не известен.
+    """
+    if response.get("status") == "unknownOid":
+        if not final:
+            return None
+        return replace(fill, state=FILL_REJECTED, error="ордер не дошёл до биржи")
+
+    order_status = response.get("order") or {}
+    order = order_status.get("order") or {}
+    status = order_status.get("status")
+    if status == "open" or "origSz" not in order:
+        # IoC на книге не остаётся: ждём завершения, а не открытого ордера
+        return None
+
+    filled_sz = float(order["origSz"]) - float(order.get("sz", 0) or 0)
+    if filled_sz <= 0:
+        return replace(fill, state=FILL_REJECTED, error=f"ордер не исполнен: {status}")
+    return replace(
+        fill,
+        state=FILL_FILLED if filled_sz >= fill.requested_sz - 1e-12 else FILL_PARTIAL,
+        oid=order.get("oid"),
+        filled_sz=filled_sz,
+        error=None,
+    )
@@ -0,0 +1,68 @@
+"""
+Модуль отправки нескольких ордеров одним подписанным действием.
+"""
+
+from typing import Any, Dict, List
+
+from .client import HyperliquidClient
+
+
+def parse_order_statuses(response: Any, count: int) -> List[Dict[str, Any]]:
+    """
+    Извлекает статусы ордеров из ответа exchange API.
+
+    Hyperliquid отвечает 200 даже при ошибке отдельных ордеров: ошибка
+    лежит в статусе конкретного ордера ({"error": "..."}).
+
+    Args:
+        response: Ответ на действие order.
+        count: Сколько ордеров было отправлено.
+
+    Returns:
+        Статус по каждому ордеру в порядке отправки
+        ({"filled": {...}}, {"resting": {...}} или {"error": "..."}).
+    """
+    if not isinstance(response, dict) or response.get("status") != "ok":
+        error = response.get("response") if isinstance(response, dict) else response
+        return [{"error": str(error)} for _ in range(count)]
+
+    data = response.get("response", {}).get("data", {})
+    statuses = list(data.get("statuses", []))
+
+    # На случай, если биржа вернула меньше статусов, чем ордеров
+    while len(statuses) < count:
+        statuses.append({"error": "Нет статуса ордера в ответе биржи"})
+    return statuses[:count]
+
+
+def is_order_accepted(status: Dict[str, Any]) -> bool:
+    """
+    Проверяет, принят ли ордер биржей.
+
+    Args:
+        status: Статус одного ордера.
+
+    Returns:
+        True если ордер исполнен или выставлен.
+    """
+    return "filled" in status or "resting" in status
+
+
+def place_bulk_market_orders(
+    client: HyperliquidClient,
+    order_requests: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Подписывает все ордера одним действием и отправляет одним запросом.
+
+    Args:
+        client: Прогретый клиент Hyperliquid.
+        order_requests: Ордера из build_market_order_request.
+
+    Returns:
+        Статус по каждому ордеру в порядке order_requests.
+    """
+    if not order_requests:
+        return []
+    response = client.bulk_orders(order_requests)
+    return parse_order_statuses(response, len(order_requests))
@@ -2,83 +2,126 @@
 Модуль открытия позиции на Hyperliquid с использованием приватного ключа.
 """
 
+import secrets
 from typing import Dict, Any
-from eth_account import Account
-from hyperliquid.info import Info
-from hyperliquid.exchange import Exchange
 
+from .asset_metadata import AssetMeta, AssetMetadataCache
+from .client import ActionOutcomeUnknown, HyperliquidClient
+from .mid_price_cache import MidPriceCache
+from .order_fill import OrderFill, order_fill_from_status, unknown_order_fill
+from .place_bulk_orders import parse_order_statuses
 
-def place_market_order(
-    api_url: str,
-    private_key: str,
+# Допустимое проскальзывание рыночного ордера от mid
+MARKET_SLIPPAGE = 0.05
+
+
+def slippage_price(asset: AssetMeta, is_buy: bool, slippage: float, mid_price: float) -> float:
+    """
+    Цена агрессивного лимитного ордера с проскальзыванием от mid.
+
+    Повторяет округление SDK для перпетуалов: не больше 5 значащих цифр
+    и не больше 6 - szDecimals знаков после запятой.
+
+    Args:
+        asset: Метаданные актива.
+        is_buy: Покупка (True) или продажа (False).
+        slippage: Доля проскальзывания (0.05 — 5%).
+        mid_price: Текущая mid-цена.
+
+    Returns:
+        Лимитная цена ордера.
+    """
+    px = mid_price * (1 + slippage) if is_buy else mid_price * (1 - slippage)
+    return round(float(f"{px:.5g}"), 6 - asset.sz_decimals)
+
+
+def build_market_order_request(
+    assets: AssetMetadataCache,
+    mids: MidPriceCache,
     coin: str,
     side: str,
-    size_usd: float,
-    leverage: int,
-    timeout: int = 10
+    size_usd: float
 ) -> Dict[str, Any]:
     """
-    Размещает рыночный ордер на Hyperliquid используя официальный SDK.
+    Готовит рыночный ордер (агрессивный лимитный IoC) в формате OrderRequest SDK.
+
+    Индекс актива для провода ордера берётся из того же кэша метаданных,
+    что и szDecimals, — отдельного источника метаданных у клиента нет.
+    Каждый ордер получает случайный cloid: по нему исход ордера можно
+    запросить через orderStatus, если ответ на отправку потерян.
 
     Args:
-        api_url: URL API Hyperliquid.
-        private_key: Приватный ключ (hex строка без 0x или с ним).
+        assets: Кэш метаданных активов.
+        mids: Кэш mid-цен.
         coin: Символ монеты (например, BTC).
         side: Направление сделки ("LONG" или "SHORT").
         size_usd: Размер позиции в USDC.
-        leverage: Плечо (например, 10).
-        timeout: Таймаут запроса.
 
     Returns:
-        Ответ от exchange API.
+        Ордер для client.bulk_orders.
+
+    Raises:
+        KeyError: Если монеты нет в метаданных Hyperliquid.
     """
-    # Нормализуем приватный ключ
-    if not private_key.startswith("0x"):
-        private_key = "0x" + private_key
+    from hyperliquid.utils.types import Cloid
 
-    # Создаём wallet из приватного ключа
-    wallet = Account.from_key(private_key)
-    
-    # Инициализируем Info и Exchange клиенты
-    info = Info(api_url, skip_ws=True)
-    exchange = Exchange(wallet, api_url)
-    
     # Определяем направление: True = Buy (LONG), False = Sell (SHORT)
     is_buy = (side == "LONG")
     
-    # Получаем текущую цену и метаданные для расчёта размера в токенах
-    mid_price = float(info.all_mids()[coin])
-    meta = info.meta()
-    
-    # Находим количество десятичных знаков для этого токена
-    sz_decimals = 8  # По умолчанию
-    for asset in meta['universe']:
-        if asset['name'] == coin:
-            sz_decimals = asset['szDecimals']
-            break
+    # Метаданные актива из кэша (без запроса meta и перебора universe)
+    asset = assets.get(coin)
+
+    # Текущая цена из WebSocket-кэша (REST только если цена устарела)
+    mid_price = mids.get_mid(coin)
     
     # Конвертируем USD в размер позиции в токенах
-    sz = round(size_usd / mid_price, sz_decimals)
+    sz = round(size_usd / mid_price, asset.sz_decimals)
     
-    # Устанавливаем плечо (leverage)
-    # Примечание: update_leverage принимает asset index, а не coin
-    # Находим asset index
-    asset_index = None
-    for idx, asset in enumerate(meta['universe']):
-        if asset['name'] == coin:
-            asset_index = idx
-            break
-    
-    if asset_index is not None:
-        try:
-            # Устанавливаем leverage через asset index и is_cross
-            exchange.update_leverage(leverage, asset_index, is_cross=True)
-        except Exception as e:
-            # Если не получилось установить leverage, продолжаем без него
-            pass
-    
-    # Открываем рыночный ордер с 5% slippage
-    result = exchange.market_open(coin, is_buy, sz, None, 0.05)
-    
-    return result
+    # Рыночный ордер = агрессивный лимитный IoC с 5% slippage от mid
+    limit_px = slippage_price(asset, is_buy, MARKET_SLIPPAGE, mid_price)
+    return {
+        "coin": coin,
+        "asset": asset.asset_index,
+        "is_buy": is_buy,
+        "sz": sz,
+        "limit_px": limit_px,
+        "order_type": {"limit": {"tif": "Ioc"}},
+        "reduce_only": False,
+        "cloid": Cloid.from_int(secrets.randbits(128)),
+    }
+
+
+def place_market_order(
+    client: HyperliquidClient,
+    assets: AssetMetadataCache,
+    mids: MidPriceCache,
+    coin: str,
+    side: str,
+    size_usd: float
+) -> OrderFill:
+    """
+    Размещает рыночный ордер на Hyperliquid используя официальный SDK.
+
+    Плечо должно быть выставлено заранее (LeverageManager.ensure).
+    Hyperliquid отвечает 200 и при отклонённом ордере, поэтому результат —
+    разобранный статус ордера, а не ответ целиком.
 
+    Args:
+        client: Прогретый клиент Hyperliquid.
+        assets: Кэш метаданных активов.
+        mids: Кэш mid-цен.
+        coin: Символ монеты (например, BTC).
+        side: Направление сделки ("LONG" или "SHORT").
+        size_usd: Размер позиции в USDC.
+
+    Returns:
+        Исполнение ордера: объём и средняя цена, ошибка биржи или
+        FILL_UNKNOWN, если ответ на отправку не получен.
+    """
+    order_request = build_market_order_request(assets, mids, coin, side, size_usd)
+    try:
+        response = client.bulk_orders([order_request])
+    except ActionOutcomeUnknown as e:
+        # Ордер мог исполниться: исход уточняется по cloid, а не повтором
+        return unknown_order_fill(order_request, e)
+    return order_fill_from_status(order_request, parse_order_statuses(response, 1)[0])
@@ -0,0 +1,193 @@
+"""
+Модуль бюджета веса запросов к Hyperliquid (token bucket с приоритетами).
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+PRIORITY_ORDER = "order"  # Действия /exchange и всё, что ждёт ордер
+PRIORITY_INFO = "info"    # Фоновые и справочные запросы /info
+
+# Вес запросов /info по типу (лимит Hyperliquid — 1200 веса в минуту на IP)
+_INFO_WEIGHTS = {
+    "allMids": 2,
+    "clearinghouseState": 2,
+    "l2Book": 2,
+    "orderStatus": 2,
+    "spotClearinghouseState": 2,
+    "exchangeStatus": 2,
+    "userRole": 60,
+}
+_DEFAULT_INFO_WEIGHT = 20
+
+_limiter: "RateLimiter | None" = None
+_limiter_lock = threading.Lock()
+
+
+class RateLimitExceeded(Exception):
+    """Запрос не уложился в бюджет веса за отведённое ожидание."""
+
+
+def info_weight(request_type: str) -> int:
+    """
+    Вес запроса /info.
+
+    Args:
+        request_type: Поле type запроса (meta, allMids, clearinghouseState, ...).
+
+    Returns:
+        Вес запроса.
+    """
+    return _INFO_WEIGHTS.get(request_type, _DEFAULT_INFO_WEIGHT)
+
+
+def exchange_weight(action: Dict[str, Any]) -> int:
+    """
+    Вес действия /exchange: 1 плюс 1 за каждые 40 ордеров пачки.
+
+    Args:
+        action: Действие (order, updateLeverage, ...).
+
+    Returns:
+        Вес действия.
+    """
+    return 1 + len(action.get("orders", [])) // 40
+
+
+class RateLimiter:
+    """
+    Token bucket по весу запросов с резервом под ордера.
+
+    Бюджет пополняется равномерно (weight_per_minute / 60 в секунду).
+    Ордера могут выбрать его полностью и ждут, пока вес не накопится;
+    справочные запросы не опускают бюджет ниже доли order_reserve, не
+    обгоняют ждущие ордера и через info_max_wait_seconds ожидания
+    получают RateLimitExceeded — вызывающий обходится без них
+    (устаревшая цена, отложенная сверка).
+    """
+
+    def __init__(
+        self,
+        weight_per_minute: float = 1200,
+        order_reserve: float = 0.25,
+        info_max_wait_seconds: float = 2.0
+    ):
+        """
+        Args:
+            weight_per_minute: Бюджет веса в минуту (на реплику).
+            order_reserve: Доля бюджета, недоступная справочным запросам.
+            info_max_wait_seconds: Сколько справочный запрос ждёт бюджет.
+        """
+        self.capacity = weight_per_minute
+        self.refill_per_second = weight_per_minute / 60
+        self.info_floor = weight_per_minute * order_reserve
+        self.info_max_wait_seconds = info_max_wait_seconds
+
+        self._condition = threading.Condition()
+        self._tokens = float(weight_per_minute)
+        self._updated_at = time.monotonic()
+        self._orders_waiting = 0
+        self._metrics = None
+
+    def attach(self, metrics) -> None:
+        """
+        Подключает метрики: ожидания, отказы и остаток бюджета.
+
+        Args:
+            metrics: Метрики executor.
+        """
+        self._metrics = metrics
+        metrics.gauge(
+            "trade_executor_rate_limit_tokens",
+            "Остаток бюджета веса запросов к Hyperliquid",
+            lambda: self.available,
+        )
+
+    @property
+    def available(self) -> float:
+        """Текущий остаток бюджета."""
+        with self._condition:
+            self._refill()
+            return self._tokens
+
+    def acquire(self, weight: float, priority: str = PRIORITY_INFO) -> None:
+        """
+        Списывает вес запроса, при нехватке бюджета ждёт.
+
+        Args:
+            weight: Вес запроса.
+            priority: PRIORITY_ORDER или PRIORITY_INFO.
+
+        Raises:
+            RateLimitExceeded: Если справочный запрос не дождался бюджета.
+        """
+        is_order = priority == PRIORITY_ORDER
+        floor = 0.0 if is_order else self.info_floor
+        # Запрос тяжелее всего бюджета иначе не прошёл бы никогда
+        weight = min(weight, self.capacity - floor)
+        deadline = None if is_order else time.monotonic() + self.info_max_wait_seconds
+        waited = False
+
+        with self._condition:
+            if is_order:
+                self._orders_waiting += 1
+            try:
+                while True:
+                    self._refill()
+                    if (is_order or self._orders_waiting == 0) and self._tokens - weight >= floor:
+                        self._tokens -= weight
+                        break
+
+                    wait = max((weight + floor - self._tokens) / self.refill_per_second, 0.01)
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            if self._metrics is not None:
+                                self._metrics.rate_limited.inc(priority=priority)
+                            raise RateLimitExceeded(
+                                f"Бюджет запросов Hyperliquid исчерпан: остаток {self._tokens:.0f}, нужно {weight:.0f}"
+                            )
+                        wait = min(wait, remaining)
+                    waited = True
+                    self._condition.wait(wait)
+            finally:
+                if is_order:
+                    self._orders_waiting -= 1
+                    # Справочные запросы ждали, пока ордер заберёт бюджет
+                    self._condition.notify_all()
+
+        if waited and self._metrics is not None:
+            self._metrics.rate_limit_waits.inc(priority=priority)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.refill_per_second)
+        self._updated_at = now
+
+
+def init_rate_limiter(
+    weight_per_minute: float = 1200,
+    order_reserve: float = 0.25
+) -> RateLimiter:
+    """
+    Создаёт общий бюджет запросов процесса (если ещё не создан).
+
+    Args:
+        weight_per_minute: Бюджет веса в минуту (на реплику).
+        order_reserve: Доля бюджета, недоступная справочным запросам.
+
+    Returns:
+        Общий бюджет запросов.
+    """
+    global _limiter
+
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(weight_per_minute=weight_per_minute, order_reserve=order_reserve)
+        return _limiter
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Общий бюджет запросов процесса (с настройками по умолчанию, если не создан)."""
+    return _limiter if _limiter is not None else init_rate_limiter()
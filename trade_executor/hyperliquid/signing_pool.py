@@ -0,0 +1,90 @@
+"""
+Модуль подписи действий Hyperliquid в пуле процессов.
+"""
+
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict
+
+# Кошелёк процесса-подписчика: создаётся один раз при старте процесса
+_wallet = None
+
+
+def _init_worker(private_key: str) -> None:
+    # eth_account и SDK нужны только процессам-подписчикам
+    from eth_account import Account
+
+    global _wallet
+    _wallet = Account.from_key(private_key)
+
+
+def _sign(action: Dict[str, Any], vault_address: str | None, nonce: int, expires_after: int | None, is_mainnet: bool) -> Dict[str, Any]:
+    from hyperliquid.utils.signing import sign_l1_action
+
+    return sign_l1_action(_wallet, action, vault_address, nonce, expires_after, is_mainnet)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class SigningPool:
+    """
+    Пул процессов, подписывающих L1-действия (EIP-712) параллельно.
+
+    Подпись в eth_account — CPU-bound Python и под GIL выполняется по одной,
+    поэтому при пачке сигналов она идёт в отдельных процессах. Ключ передаётся
+    каждому процессу один раз при запуске. Процессы создаются через spawn:
+    fork процесса с запущенными потоками (WebSocket, пул сигналов) небезопасен.
+    """
+
+    def __init__(self, private_key: str, workers: int = 2):
+        """
+        Args:
+            private_key: Приватный ключ (hex строка без 0x или с ним).
+            workers: Число процессов.
+        """
+        if not private_key.startswith("0x"):
+            private_key = "0x" + private_key
+
+        self.workers = workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(private_key,),
+        )
+
+    def warm_up(self) -> None:
+        """Запускает процессы заранее, чтобы первая подпись не ждала старта интерпретатора."""
+        futures = [self._executor.submit(_ping) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def sign(
+        self,
+        action: Dict[str, Any],
+        vault_address: str | None,
+        nonce: int,
+        expires_after: int | None,
+        is_mainnet: bool
+    ) -> Future:
+        """
+        Ставит действие на подпись.
+
+        Args:
+            action: Действие (order, updateLeverage, ...).
+            vault_address: Адрес vault (None для своего аккаунта).
+            nonce: Nonce действия.
+            expires_after: Срок действия (мс) или None.
+            is_mainnet: Подпись для mainnet.
+
+        Returns:
+            Future с подписью {"r", "s", "v"}.
+        """
+        return self._executor.submit(_sign, action, vault_address, nonce, expires_after, is_mainnet)
+
+    def shutdown(self) -> None:
+        """Останавливает процессы."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,137 @@
+"""
+Модуль уточнения исхода ордеров, ответ на которые не получен.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from ..utils.circuit_breaker import CircuitOpenError
+from .order_fill import OrderFill, order_fill_from_order_status
+from .rate_limiter import RateLimitExceeded
+
+
+class UnknownOrderTracker:
+    """
+    Запрашивает orderStatus по cloid для ордеров в состоянии FILL_UNKNOWN.
+
+    Ордер без ответа не повторяется: он мог исполниться. Трекер в своём
+    потоке спрашивает биржу об исходе каждого такого ордера и передаёт
+    уточнённое исполнение в on_resolved — по нему отправляется
+    исправленное уведомление. Если биржа за max_attempts попыток не
+    подтвердила ни исполнение, ни отказ, ордер снимается с отслеживания
+    без уточнения: позиция всё равно сверится с clearinghouseState.
+    """
+
+    def __init__(
+        self,
+        order_status: Callable[[str], Dict[str, Any]],
+        on_resolved: Callable[[OrderFill, Dict[str, Any]], None],
+        interval_seconds: float = 2.0,
+        max_attempts: int = 5,
+    ):
+        """
+        Args:
+            order_status: Функция запроса orderStatus по cloid.
+            on_resolved: Обработчик уточнённого исполнения (исполнение, details из track).
+            interval_seconds: Интервал между запросами статуса в секундах.
+            max_attempts: Сколько раз запрашивать статус одного ордера.
+        """
+        self._order_status = order_status
+        self._on_resolved = on_resolved
+        self.interval_seconds = interval_seconds
+        self.max_attempts = max_attempts
+
+        self._lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._logger = None
+
+    @property
+    def pending(self) -> int:
+        """Сколько ордеров ждут уточнения."""
+        with self._lock:
+            return len(self._pending)
+
+    def track(self, fill: OrderFill, **details: Any) -> None:
+        """
+        Ставит ордер без ответа на уточнение.
+
+        Args:
+            fill: Исполнение в состоянии FILL_UNKNOWN (с cloid).
+            **details: Данные для исправленного уведомления (размер, плечо).
+        """
+        if fill.cloid is None:
+            return
+        with self._lock:
+            self._pending.append({
+                "fill": fill,
+                "details": details,
+                "attempts": 0,
+                "due": time.monotonic() + self.interval_seconds,
+            })
+
+    def start(self, logger=None) -> None:
+        """
+        Запускает фоновое уточнение.
+
+        Args:
+            logger: Logger для ошибок запроса статуса (опционально).
+        """
+        if self._thread is not None:
+            return
+        self._logger = logger
+
+        def _run() -> None:
+            while not self._stop_event.wait(self.interval_seconds):
+                self.poll()
+
+        self._thread = threading.Thread(target=_run, name="unknown-orders", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Останавливает фоновое уточнение."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def poll(self) -> None:
+        """Запрашивает статус ордеров, срок проверки которых наступил."""
+        now = time.monotonic()
+        with self._lock:
+            due = [entry for entry in self._pending if entry["due"] <= now]
+
+        for entry in due:
+            fill = entry["fill"]
+            entry["attempts"] += 1
+            final = entry["attempts"] >= self.max_attempts
+            try:
+                resolved = order_fill_from_order_status(fill, self._order_status(fill.cloid), final=final)
+            except (RateLimitExceeded, CircuitOpenError) as e:
+                # Попытка не расходуется: запрос не дошёл до биржи
+                entry["attempts"] -= 1
+                self._log("warning", f"Уточнение ордера {fill.coin} {fill.cloid} отложено: {e}")
+                continue
+            except Exception as e:
+                resolved = None
+                self._log("error", f"Ошибка запроса статуса ордера {fill.coin} {fill.cloid}: {e}")
+
+            if resolved is None and not final:
+                entry["due"] = time.monotonic() + self.interval_seconds
+                continue
+
+            with self._lock:
+                self._pending.remove(entry)
+            if resolved is None:
+                self._log("error", f"Исход ордера {fill.coin} {fill.cloid} не уточнён за {self.max_attempts} попыток")
+                continue
+            try:
+                self._on_resolved(resolved, entry["details"])
+            except Exception as e:
+                self._log("error", f"Ошибка обработки уточнённого ордера {fill.coin} {fill.cloid}: {e}")
+
+    def _log(self, level: str, message: str) -> None:
+        if self._logger is not None:
+            getattr(self._logger, level)(message)
@@ -0,0 +1,117 @@
+"""
+Модуль WebSocket-подключения к Hyperliquid с автоматическим переподключением.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from hyperliquid.websocket_manager import WebsocketManager
+
+
+class WebsocketStream:
+    """
+    Обёртка над WebsocketManager из SDK.
+
+    SDK не переподключается сам: при обрыве поток менеджера просто
+    завершается. Сторожевой поток пересоздаёт менеджер и повторяет все
+    подписки. URL сокета выводится из api_url так же, как в SDK
+    (http://host -> ws://host/ws), поэтому для тестов достаточно поднять
+    локальный WebSocket-сервер и передать его http-адрес.
+    """
+
+    def __init__(self, api_url: str, reconnect_delay: float = 1.0, logger=None):
+        """
+        Args:
+            api_url: URL API Hyperliquid.
+            reconnect_delay: Пауза между проверками/переподключениями в секундах.
+            logger: Logger (опционально).
+        """
+        self.api_url = api_url
+        self.reconnect_delay = reconnect_delay
+        self._logger = logger
+
+        self._lock = threading.Lock()
+        self._subscriptions: List[Tuple[Dict[str, Any], Callable[[Any], None]]] = []
+        self._manager: "WebsocketManager | None" = None
+        self._stop_event = threading.Event()
+        self._watchdog: threading.Thread | None = None
+
+    def subscribe(self, subscription: Dict[str, Any], callback: Callable[[Any], None]) -> None:
+        """
+        Подписывается на канал. Подписка восстанавливается после переподключения.
+
+        Args:
+            subscription: Описание подписки, например {"type": "allMids"}.
+            callback: Обработчик сообщений канала.
+        """
+        with self._lock:
+            self._subscriptions.append((subscription, callback))
+            if self._manager is not None:
+                self._manager.subscribe(subscription, self._wrap(callback))
+
+    def start(self) -> None:
+        """Открывает сокет и запускает сторожевой поток."""
+        with self._lock:
+            if self._watchdog is not None:
+                return
+            self._connect()
+        self._watchdog = threading.Thread(target=self._watch, name="hl-websocket-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        """Закрывает сокет и останавливает переподключение."""
+        self._stop_event.set()
+        with self._lock:
+            self._close_manager()
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=5)
+            self._watchdog = None
+
+    def _wrap(self, callback: Callable[[Any], None]) -> Callable[[Any], None]:
+        def _on_message(message: Any) -> None:
+            try:
+                callback(message)
+            except Exception as e:
+                if self._logger is not None:
+                    self._logger.error(f"Ошибка обработки сообщения WebSocket: {e}")
+        return _on_message
+
+    def _connect(self) -> None:
+        from hyperliquid.websocket_manager import WebsocketManager
+
+        manager = WebsocketManager(self.api_url)
+        # Потоки SDK не должны мешать завершению процесса
+        manager.daemon = True
+        manager.ping_sender.daemon = True
+        for subscription, callback in self._subscriptions:
+            # До открытия сокета SDK ставит подписки в очередь
+            manager.subscribe(subscription, self._wrap(callback))
+        manager.start()
+        self._manager = manager
+
+    def _close_manager(self) -> None:
+        if self._manager is None:
+            return
+        try:
+            self._manager.stop()
+        except Exception:
+            pass
+        self._manager = None
+
+    def _watch(self) -> None:
+        while not self._stop_event.wait(self.reconnect_delay):
+            manager = self._manager
+            if manager is not None and manager.is_alive():
+                continue
+            if self._logger is not None:
+                self._logger.warning("WebSocket Hyperliquid отключён, переподключаюсь...")
+            with self._lock:
+                if self._stop_event.is_set():
+                    break
+                self._close_manager()
+                try:
+                    self._connect()
+                except Exception as e:
+                    if self._logger is not None:
+                        self._logger.error(f"Ошибка переподключения WebSocket: {e}")
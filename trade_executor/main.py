@@ -3,172 +3,213 @@
 """
 
 import time
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Tuple
 
 from .config.load_env import load_environment
-from .config.get_settings import build_settings
-from .utils.get_logger import get_logger
-from .database.get_connection import get_connection
-from .database.fetch_new_positions import fetch_new_positions
-from .database.delete_position import delete_position
-from .hyperliquid.get_account_state import get_account_state
-from .hyperliquid.get_open_positions import get_open_positions
-from .hyperliquid.calculate_position_size import calculate_position_size_usd
-from .hyperliquid.place_order import place_market_order
-from .positions.check_position_exists import check_position_exists
-from .telegram.send_notification import send_telegram_message, format_position_notification
-
-
-def _process_new_position(
-    position: Dict[str, Any],
-    open_positions: List[Dict[str, Any]],
-    settings,
-    account_state: Dict[str, Any],
-    logger
-) -> bool:
+from .config.get_settings import build_settings, Settings
+from .context import ExecutorContext
+from .utils.get_logger import get_logger, close_logging
+from .utils.http_client import init_http_client, close_http_client
+from .utils.circuit_breaker import init_circuit_breakers
+from .database.get_connection import get_connection, init_connection_pool, close_connection_pool
+from .database.claim_new_positions import ensure_claim_columns
+from .database.listen_new_positions import NewPositionsListener
+from .database.record_processed_signatures import ensure_processed_signatures_table, load_recent_signatures
+from .hyperliquid.get_exchange_metadata import get_exchange_metadata
+from .hyperliquid.metadata_snapshot import load_metadata_snapshot, save_metadata_snapshot
+from .hyperliquid.endpoint_breakers import unavailable_for_seconds
+from .hyperliquid.rate_limiter import init_rate_limiter
+from .metrics.serve_metrics import start_metrics_server
+from .pipeline.build_context import build_context, close_context
+from .pipeline.reconcile_ledger import reconcile_ledger
+from .pipeline.run_single_cycle import run_single_cycle
+
+
+def _wait_for_next_cycle(listener: NewPositionsListener | None, settings, logger) -> None:
     """
-    Обрабатывает одну новую позицию: проверяет существование и открывает, если нужно.
+    Ждёт следующий цикл: NOTIFY от new_positions или истечение интервала опроса.
 
     Args:
-        position: Данные позиции из new_positions.
-        open_positions: Список уже открытых позиций.
+        listener: Слушатель LISTEN/NOTIFY (None в режиме poll).
         settings: Настройки приложения.
-        account_state: Текущее состояние аккаунта.
         logger: Logger.
-
-    Returns:
-        True если позиция была открыта, False если нет.
     """
-    coin = position.get("coin", "")
-    side = position.get("side", "")
-    target_leverage = int(position.get("leverage", "10"))
-
-    logger.info(f"Обработка позиции: {coin} {side} (плечо {target_leverage}x)")
-
-    # Проверяем, есть ли уже такая позиция
-    if check_position_exists(open_positions, coin, side):
-        logger.info(f"  Позиция {coin} {side} уже открыта. Пропускаем.")
-        return False
-
-    # Рассчитываем размер позиции
-    size_usd = calculate_position_size_usd(account_state, settings.position_size_percent)
-    
-    # Дебаг: показываем что получили из API
-    margin_summary = account_state.get("marginSummary", {})
-    logger.info(f"  Баланс аккаунта: accountValue={margin_summary.get('accountValue')}, withdrawable={account_state.get('withdrawable')}")
-    
-    if size_usd <= 0:
-        logger.warning(f"  Недостаточно средств для открытия позиции {coin} {side}. Рассчитанный размер: ${size_usd}")
-        return False
-
-    logger.info(f"  Размер позиции: ${size_usd:.2f} ({settings.position_size_percent}% от баланса)")
-
-    # Пытаемся открыть позицию с указанным плечом
-    # Если не получится, попробуем с меньшим плечом (логика fallback)
-    leverages_to_try = [target_leverage]
-    # Добавляем варианты с уменьшением плеча
-    for lev in [20, 10, 5, 3, 1]:
-        if lev < target_leverage and lev not in leverages_to_try:
-            leverages_to_try.append(lev)
-
-    success = False
-    used_leverage = target_leverage
-
-    for leverage in leverages_to_try:
+    if listener is None:
+        logger.info("Ожидание %s секунд...", settings.poll_interval_seconds)
+        time.sleep(settings.poll_interval_seconds)
+        return
+
+    if not listener.connected:
         try:
-            logger.info(f"  Открываю позицию {coin} {side} с плечом {leverage}x...")
-
-            order_response = place_market_order(
-                api_url=settings.hyperliquid_api_url,
-                private_key=settings.hyperliquid_private_key,
-                coin=coin,
-                side=side,
-                size_usd=size_usd,
-                leverage=leverage,
-                timeout=settings.http_timeout_seconds
-            )
+            listener.connect()
+            logger.info("Подписка LISTEN new_positions восстановлена.")
+        except Exception as e:
+            logger.error(f"Не удалось подписаться на new_positions: {e}")
+            time.sleep(settings.poll_interval_seconds)
+            return
+
+    try:
+        if listener.wait(settings.fallback_poll_seconds):
+            logger.debug("Получено уведомление о новых позициях.")
+        else:
+            logger.debug("Уведомлений не было, страховочный опрос.")
+    except Exception as e:
+        logger.error(f"Ошибка ожидания уведомления: {e}")
+        listener.close()
+        time.sleep(settings.poll_interval_seconds)
 
-            logger.info(f"  ✅ Позиция {coin} {side} открыта успешно с плечом {leverage}x")
-            logger.info(f"  Ответ API: {order_response}")
-            success = True
-            used_leverage = leverage
-            break
 
-        except Exception as e:
-            logger.error(f"  Ошибка открытия позиции {coin} {side} с плечом {leverage}x: {e}")
-            if leverage == leverages_to_try[-1]:
-                logger.error(f"  ❌ Не удалось открыть позицию {coin} {side} ни с одним плечом.")
-            else:
-                logger.info(f"  Пробую с меньшим плечом...")
+def _load_metadata(settings: Settings, logger) -> Tuple[Dict[str, Any], Dict[str, Any]] | None:
+    """
+    Загружает метаданные биржи, при недоступности сети — из снимка на диске.
+
+    Индексы активов в universe не переиспользуются, поэтому устаревший
+    снимок безопасен: новые листинги догрузит AssetMetadataCache при первом сигнале по монете.
+
+    Args:
+        settings: Настройки приложения.
+        logger: Logger.
 
-    # Отправляем уведомление в Telegram
+    Returns:
+        (meta, spot_meta) или None, если нет ни сети, ни снимка.
+    """
     try:
-        message = format_position_notification(coin, side, size_usd, used_leverage, success)
-        send_telegram_message(
-            bot_token=settings.telegram_bot_token,
-            chat_id=settings.telegram_chat_id,
-            message=message,
-            timeout=settings.http_timeout_seconds
-        )
-        logger.info(f"  Уведомление отправлено в Telegram")
+        meta, spot_meta = get_exchange_metadata(settings.hyperliquid_api_url, timeout=settings.http_timeout_seconds)
     except Exception as e:
-        logger.error(f"  Ошибка отправки уведомления в Telegram: {e}")
+        if not settings.meta_snapshot_path:
+            logger.error(f"Ошибка загрузки метаданных Hyperliquid: {e}")
+            return None
+        snapshot = load_metadata_snapshot(settings.meta_snapshot_path)
+        if snapshot is None:
+            logger.error(f"Ошибка загрузки метаданных Hyperliquid, снимка на диске нет: {e}")
+            return None
+        meta, spot_meta, age_seconds = snapshot
+        logger.warning(f"Метаданные Hyperliquid недоступны ({e}), старт со снимка возрастом {age_seconds:.0f} сек")
+        return meta, spot_meta
+
+    if settings.meta_snapshot_path:
+        try:
+            save_metadata_snapshot(settings.meta_snapshot_path, meta, spot_meta)
+        except OSError as e:
+            logger.error(f"Не удалось сохранить снимок метаданных: {e}")
+    return meta, spot_meta
 
-    return success
+
+def _open_database(settings: Settings) -> None:
+    """
+    Открывает пул подключений, проверяет колонки захвата new_positions
+    и таблицу processed_signatures.
+
+    Args:
+        settings: Настройки приложения.
+    """
+    init_connection_pool(
+        settings.database_url,
+        min_size=settings.db_pool_min_size,
+        max_size=settings.db_pool_max_size,
+    )
+    with get_connection(settings.database_url) as conn:
+        ensure_claim_columns(conn)
+        ensure_processed_signatures_table(conn, retention_days=settings.signature_retention_days)
 
 
-def _run_single_cycle(settings, logger) -> None:
+def _warm_up(settings: Settings, logger) -> ExecutorContext:
     """
-    Выполняет один цикл проверки новых позиций.
+    Готовит executor к первому сигналу до входа в цикл.
+
+    Пул БД и загрузка метаданных ждут сети, поэтому идут параллельно
+    с импортом SDK. Затем клиент строится из уже загруженных метаданных
+    без повторных запросов, загружается кошелёк, открываются соединения
+    и реестр позиций сверяется с биржей.
 
     Args:
         settings: Настройки приложения.
         logger: Logger.
+
+    Returns:
+        Контекст executor.
+
+    Raises:
+        Exception: Если БД недоступна.
     """
-    with get_connection(settings.database_url) as conn:
-        # Получаем список новых позиций из БД
-        new_positions = fetch_new_positions(conn)
+    started = time.perf_counter()
+
+    init_http_client(
+        connect_timeout=settings.http_connect_timeout_seconds,
+        read_timeout=settings.http_timeout_seconds,
+        max_retries=settings.http_max_retries,
+        # Соединение на каждый параллельный сигнал плюс фоновые потоки
+        pool_maxsize=settings.max_concurrent_signals + 4,
+    )
+    init_rate_limiter(
+        weight_per_minute=settings.hyperliquid_weight_per_minute,
+        order_reserve=settings.rate_limit_order_reserve,
+    )
+    init_circuit_breakers(
+        failure_rate=settings.circuit_failure_rate,
+        slow_call_seconds=settings.circuit_slow_call_seconds,
+        open_seconds=settings.circuit_open_seconds,
+    )
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="warm-up") as pool:
+        database = pool.submit(_open_database, settings)
+        metadata = pool.submit(_load_metadata, settings, logger)
+        # Импорт SDK и eth_account — CPU-bound, пока потоки ждут сеть
+        import eth_account  # noqa: F401
+        import hyperliquid.utils.signing  # noqa: F401
+
+        database.result()
+        ctx = build_context(settings, logger, metadata=metadata.result())
 
-        if not new_positions:
-            logger.debug("Новых позиций не найдено.")
-            return
+    try:
+        with get_connection(settings.database_url) as conn:
+            ctx.signatures.add(load_recent_signatures(conn, settings.signature_cache_size))
+    except BaseException:
+        # Следующая попытка прогрева построит контекст заново
+        close_context(ctx)
+        raise
+    logger.info(f"Обработанных сигналов в индексе: {len(ctx.signatures)}")
 
-        logger.info(f"Найдено новых позиций: {len(new_positions)}")
+    try:
+        reconcile_ledger(ctx)
+        logger.info(f"Текущих открытых позиций: {len(ctx.ledger.open_positions())}")
+    except Exception as e:
+        # Не критично: реестр заполнится в первом цикле с сигналами
+        logger.error(f"Ошибка загрузки открытых позиций: {e}")
+    # Дальше состояние аккаунта обновляется в фоне, до прихода сигналов
+    ctx.refresher.start(logger)
+    ctx.backlog.start(logger)
 
-        # Получаем текущее состояние аккаунта
-        try:
-            account_state = get_account_state(
-                api_url=settings.hyperliquid_api_url,
-                wallet_address=settings.wallet_address,
-                timeout=settings.http_timeout_seconds
-            )
-        except Exception as e:
-            logger.error(f"Ошибка получения состояния аккаунта: {e}")
-            return
+    logger.info(f"Executor готов к сигналам за {time.perf_counter() - started:.2f} сек")
+    return ctx
 
-        # Получаем список уже открытых позиций
-        open_positions = get_open_positions(account_state)
-        logger.info(f"Текущих открытых позиций: {len(open_positions)}")
 
-        # Обрабатываем каждую новую позицию
-        for position in new_positions:
-            position_id = position.get("id")
-            try:
-                processed = _process_new_position(
-                    position=position,
-                    open_positions=open_positions,
-                    settings=settings,
-                    account_state=account_state,
-                    logger=logger
-                )
-
-                # Удаляем обработанную позицию из new_positions
-                if processed or True:  # Удаляем в любом случае после обработки
-                    delete_position(conn, position_id)
-                    logger.info(f"Позиция ID {position_id} удалена из new_positions.")
+def _warm_up_with_retry(settings: Settings, logger) -> ExecutorContext:
+    """
+    Прогревает executor, повторяя попытки, пока БД или биржа недоступны.
 
-            except Exception as e:
-                logger.error(f"Ошибка обработки позиции ID {position_id}: {e}")
+    Как и ошибка цикла, ошибка прогрева не останавливает процесс:
+    следующая попытка — через POLL_INTERVAL_SECONDS.
+
+    Args:
+        settings: Настройки приложения.
+        logger: Logger.
+
+    Returns:
+        Контекст executor.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return _warm_up(settings, logger)
+        except Exception as e:
+            logger.error(
+                "Ошибка прогрева executor (попытка %s): %s. Повтор через %s сек",
+                attempt, e, settings.poll_interval_seconds,
+            )
+            time.sleep(settings.poll_interval_seconds)
 
 
 def run_executor_loop(env_path: str | None = None) -> None:
@@ -180,30 +221,81 @@ def run_executor_loop(env_path: str | None = None) -> None:
     """
     load_environment(env_path)
     settings = build_settings()
-    logger = get_logger("trade_executor.main")
+    logger = get_logger(
+        "trade_executor.main",
+        level=settings.log_level,
+        json_format=settings.log_format == "json",
+        use_queue=settings.log_queue_enabled,
+        debug_sample_rate=settings.log_debug_sample_rate,
+    )
 
     logger.info("Запуск Trade Executor")
     logger.info(f"Кошелёк: {settings.wallet_address}")
-    logger.info(f"Интервал опроса: {settings.poll_interval_seconds} сек")
+    if settings.intake_mode == "notify":
+        logger.info(f"Режим приёма: LISTEN/NOTIFY (страховочный опрос {settings.fallback_poll_seconds} сек)")
+    else:
+        logger.info(f"Интервал опроса: {settings.poll_interval_seconds} сек")
     logger.info(f"Размер позиции: {settings.position_size_percent}% от баланса")
+    logger.info(f"Параллельных сигналов: до {settings.max_concurrent_signals}")
+
+    try:
+        ctx = _warm_up_with_retry(settings, logger)
+    except KeyboardInterrupt:
+        logger.info("Остановка Trade Executor (Ctrl+C)")
+        close_connection_pool()
+        close_http_client()
+        close_logging()
+        return
+    logger.info(f"ID реплики: {ctx.worker_id}")
+
+    metrics_server = None
+    if settings.metrics_port:
+        try:
+            metrics_server = start_metrics_server(ctx.metrics, settings.metrics_host, settings.metrics_port)
+            logger.info(f"Метрики: http://{settings.metrics_host}:{settings.metrics_port}/metrics")
+        except OSError as e:
+            # Не критично: торговля работает и без метрик
+            logger.error(f"Не удалось запустить эндпоинт метрик: {e}")
+
+    listener = None
+    if settings.intake_mode == "notify":
+        listener = NewPositionsListener(settings.database_url)
+        try:
+            listener.connect()
+        except Exception as e:
+            logger.error(f"Не удалось подписаться на new_positions, работаю опросом: {e}")
 
     iteration = 0
 
     try:
         while True:
             iteration += 1
-            logger.info(f"--- Цикл #{iteration} ---")
+            logger.info("--- Цикл #%s ---", iteration)
 
+            claimed = 0
             try:
-                _run_single_cycle(settings, logger)
+                claimed = run_single_cycle(ctx)
             except KeyboardInterrupt:
                 raise
             except Exception as e:
-                logger.error(f"Ошибка в цикле: {e}")
+                logger.error("Ошибка в цикле: %s", e)
 
-            logger.info(f"Ожидание {settings.poll_interval_seconds} секунд...")
-            time.sleep(settings.poll_interval_seconds)
+            unavailable = unavailable_for_seconds()
+            if unavailable > 0:
+                # Ждём пробного запроса автомата, а не уведомления: после сбоя торговля возобновится за секунды
+                time.sleep(unavailable)
+            # Захватили полную пачку — в очереди, скорее всего, есть ещё
+            elif claimed < settings.claim_batch_size:
+                _wait_for_next_cycle(listener, settings, logger)
 
     except KeyboardInterrupt:
         logger.info("Остановка Trade Executor (Ctrl+C)")
-
+    finally:
+        if listener is not None:
+            listener.close()
+        close_context(ctx)
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        close_connection_pool()
+        close_http_client()
+        close_logging()
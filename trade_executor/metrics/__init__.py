@@ -0,0 +1 @@
+"""Модуль метрик executor в формате Prometheus."""
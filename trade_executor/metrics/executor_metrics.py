@@ -0,0 +1,110 @@
+"""
+Модуль набора метрик executor: этапы жизни сигнала, ордера, ошибки, очереди.
+"""
+
+from datetime import datetime, timezone
+from typing import Any
+
+from .metrics_registry import MetricsRegistry
+
+# Этапы сигнала для метки stage в trade_executor_stage_seconds
+STAGE_FETCH = "fetch"                # detected_at -> захват записи executor
+STAGE_ACCOUNT_STATE = "account_state"  # запрос clearinghouseState
+STAGE_SIZING = "sizing"              # проверка реестра и расчёт размера
+STAGE_LEVERAGE = "leverage"          # смена плеча на бирже
+STAGE_SIGN = "sign"                  # подпись действия
+STAGE_EXCHANGE_ACK = "exchange_ack"  # отправка действия до ответа биржи
+STAGE_TELEGRAM = "telegram"          # постановка в очередь -> отправка в Telegram
+STAGE_DELETE = "delete"              # завершение записей в new_positions
+STAGE_END_TO_END = "end_to_end"      # detected_at -> ответ биржи на ордер
+
+
+def seconds_since(moment: Any) -> float | None:
+    """
+    Считает, сколько секунд прошло с момента из базы.
+
+    Args:
+        moment: datetime (без часового пояса считается UTC).
+
+    Returns:
+        Секунды или None, если момент неизвестен.
+    """
+    if not isinstance(moment, datetime):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - moment).total_seconds()
+
+
+class ExecutorMetrics(MetricsRegistry):
+    """Метрики executor, общие для всех циклов и потоков."""
+
+    def __init__(self):
+        super().__init__()
+        self.stage_seconds = self.histogram(
+            "trade_executor_stage_seconds",
+            "Длительность этапов обработки сигнала (сек)",
+        )
+        self.signals = self.counter(
+            "trade_executor_signals_total",
+            "Обработанные сигналы по итогу (opened, skipped, duplicate, expired, failed, unknown, released)",
+        )
+        self.signals_downsized = self.counter(
+            "trade_executor_signals_downsized_total",
+            "Сигналы, открытые уменьшенным размером из-за возраста или ухода цены",
+        )
+        self.orders = self.counter(
+            "trade_executor_orders_total",
+            "Ордера по ответу биржи (accepted, rejected, error, unknown — ответ не получен)",
+        )
+        self.fills = self.counter(
+            "trade_executor_fills_total",
+            "Итоги исполнения ордеров (filled, partial, rejected, unknown)",
+        )
+        self.unknown_orders_resolved = self.counter(
+            "trade_executor_unknown_orders_resolved_total",
+            "Ордера без ответа биржи, исход которых уточнён по orderStatus (filled, partial, rejected)",
+        )
+        self.order_retries = self.counter(
+            "trade_executor_order_retries_total",
+            "Повторы ордеров, отклонённых в пакете",
+        )
+        self.leverage_updates = self.counter(
+            "trade_executor_leverage_updates_total",
+            "Смены плеча на бирже (ok, error)",
+        )
+        self.rate_limit_waits = self.counter(
+            "trade_executor_rate_limit_waits_total",
+            "Запросы к Hyperliquid, ждавшие бюджет веса (order, info)",
+        )
+        self.rate_limited = self.counter(
+            "trade_executor_rate_limited_total",
+            "Справочные запросы к Hyperliquid, не дождавшиеся бюджета веса",
+        )
+        self.circuit_transitions = self.counter(
+            "trade_executor_circuit_transitions_total",
+            "Переходы автоматов отключения эндпоинтов (open, half_open, closed)",
+        )
+        self.circuit_rejected = self.counter(
+            "trade_executor_circuit_rejected_total",
+            "Запросы, отклонённые разомкнутым автоматом без отправки",
+        )
+        self.telegram = self.counter(
+            "trade_executor_telegram_messages_total",
+            "Отправки в Telegram (sent, failed, retry)",
+        )
+        self.log_records_dropped = self.counter(
+            "trade_executor_log_records_dropped_total",
+            "Записи лога, выброшенные из переполненной очереди логирования",
+        )
+
+    def observe_stage(self, stage: str, seconds: float | None) -> None:
+        """
+        Записывает длительность этапа, если она известна.
+
+        Args:
+            stage: Этап (STAGE_*).
+            seconds: Длительность в секундах.
+        """
+        if seconds is not None and seconds >= 0:
+            self.stage_seconds.observe(seconds, stage=stage)
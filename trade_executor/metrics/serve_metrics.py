@@ -0,0 +1,46 @@
+"""
+Модуль HTTP-эндпоинта /metrics для Prometheus.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .metrics_registry import MetricsRegistry
+
+_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def start_metrics_server(registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9100) -> ThreadingHTTPServer:
+    """
+    Запускает HTTP-сервер метрик в фоновом потоке.
+
+    Args:
+        registry: Метрики для отдачи.
+        host: Адрес, на котором слушать.
+        port: Порт.
+
+    Returns:
+        Запущенный сервер (остановка — server.shutdown()).
+    """
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", _CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Опросы Prometheus не засоряют лог
+            pass
+
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1 @@
+"""Модуль конвейера сигналов: от захвата записи до ордера и уведомления."""
@@ -0,0 +1,229 @@
+"""
+Модуль создания и остановки контекста executor.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Tuple
+
+from ..config.get_settings import Settings
+from ..context import ExecutorContext
+from ..database.claim_new_positions import get_worker_id
+from ..database.claim_prefetcher import ClaimPrefetcher
+from ..database.intake_backlog_sampler import IntakeBacklogSampler
+from ..hyperliquid.asset_metadata import AssetMetadataCache
+from ..hyperliquid.client import HyperliquidClient
+from ..hyperliquid.endpoint_breakers import exchange_breaker, info_breaker
+from ..hyperliquid.leverage_manager import LeverageManager
+from ..hyperliquid.mid_price_cache import MidPriceCache
+from ..hyperliquid.rate_limiter import get_rate_limiter
+from ..hyperliquid.signing_pool import SigningPool
+from ..hyperliquid.unknown_order_tracker import UnknownOrderTracker
+from ..hyperliquid.websocket_stream import WebsocketStream
+from ..metrics.executor_metrics import ExecutorMetrics
+from ..positions.ledger_refresher import LedgerRefresher
+from ..positions.position_ledger import PositionLedger
+from ..positions.signal_scheduler import SignalScheduler
+from ..positions.signature_index import SignatureIndex
+from ..telegram.notification_queue import NotificationQueue
+from ..telegram.send_notification import telegram_breaker
+from ..utils.circuit_breaker import get_circuit_breakers
+from ..utils.get_logger import attach_logging_metrics
+from .reconcile_ledger import reconcile_ledger
+from .report_signal import report_resolved_order
+
+
+def build_context(
+    settings: Settings,
+    logger,
+    metadata: Tuple[Dict[str, Any], Dict[str, Any]] | None = None
+) -> ExecutorContext:
+    """
+    Создаёт и прогревает долгоживущие компоненты executor.
+
+    Args:
+        settings: Настройки приложения.
+        logger: Logger.
+        metadata: Заранее загруженные (meta, spot_meta); без них кэш
+            активов загрузит метаданные сам.
+
+    Returns:
+        Контекст executor.
+    """
+    metrics = ExecutorMetrics()
+    attach_logging_metrics(metrics)
+    get_rate_limiter().attach(metrics)
+    for breaker in (info_breaker(), exchange_breaker(), telegram_breaker()):
+        breaker.attach(metrics, logger)
+    metrics.gauge(
+        "trade_executor_circuits_open",
+        "Сколько автоматов отключения эндпоинтов сейчас разомкнуто",
+        lambda: sum(breaker.is_open for breaker in get_circuit_breakers()),
+    )
+
+    signer = None
+    if settings.signing_workers > 0:
+        signer = SigningPool(settings.hyperliquid_private_key, workers=settings.signing_workers)
+        try:
+            signer.warm_up()
+            logger.info(f"Пул подписи запущен: {settings.signing_workers} процесс(а).")
+        except Exception as e:
+            # Подписываем в потоке сигнала, как без пула
+            logger.error(f"Ошибка запуска пула подписи: {e}")
+            signer.shutdown()
+            signer = None
+
+    client = HyperliquidClient(
+        api_url=settings.hyperliquid_api_url,
+        private_key=settings.hyperliquid_private_key,
+        timeout=settings.http_timeout_seconds,
+        metrics=metrics,
+        signer=signer,
+    )
+
+    assets = AssetMetadataCache(
+        fetch_meta=client.meta,
+        ttl_seconds=settings.meta_ttl_seconds,
+    )
+    try:
+        if metadata:
+            assets.load(metadata[0])
+        else:
+            assets.refresh()
+        logger.info("Метаданные активов загружены.")
+    except Exception as e:
+        # Не критично: загрузятся при первом запросе монеты
+        logger.error(f"Ошибка загрузки метаданных активов: {e}")
+    assets.start(logger)
+
+    mids = MidPriceCache(
+        fetch_all_mids=client.all_mids,
+        max_age_seconds=settings.mids_max_age_seconds,
+    )
+    try:
+        # Заодно открывает keep-alive соединение сессии SDK до первого ордера
+        mids.update(client.all_mids())
+    except Exception as e:
+        # Не критично: цены придут по WebSocket или загрузятся при первом сигнале
+        logger.error(f"Ошибка загрузки цен: {e}")
+
+    leverages = LeverageManager(client, assets, margin_mode=settings.margin_mode)
+    ledger = PositionLedger()
+    signatures = SignatureIndex(max_size=settings.signature_cache_size)
+    scheduler = SignalScheduler(
+        mids,
+        max_age_seconds=settings.signal_max_age_seconds,
+        max_drift_percent=settings.signal_max_drift_percent,
+        downsize_from=settings.signal_downsize_from,
+    )
+
+    stream = None
+    if settings.websocket_enabled:
+        stream = WebsocketStream(settings.hyperliquid_api_url, logger=logger)
+        mids.attach(stream)
+        ledger.attach(stream, settings.wallet_address)
+        try:
+            stream.start()
+            logger.info("Подписки allMids и userFills по WebSocket запущены.")
+        except Exception as e:
+            # Цены будут браться из REST, сторожевой поток не запущен
+            logger.error(f"Ошибка подключения WebSocket: {e}")
+            stream = None
+
+    notifier = NotificationQueue(
+        bot_token=settings.telegram_bot_token,
+        chat_id=settings.telegram_chat_id,
+        timeout=settings.http_timeout_seconds,
+        logger=logger,
+        metrics=metrics,
+    )
+    notifier.start()
+
+    metrics.gauge(
+        "trade_executor_notification_queue_depth",
+        "Уведомления, ожидающие отправки в Telegram",
+        lambda: notifier.depth,
+    )
+    metrics.gauge(
+        "trade_executor_ledger_age_seconds",
+        "Сколько секунд прошло со сверки реестра позиций с REST",
+        lambda: ledger.age_seconds,
+    )
+
+    worker_id = get_worker_id()
+    # Считается в фоне (запускает main после открытия пула БД), gauge читают замер
+    backlog = IntakeBacklogSampler(
+        settings.database_url,
+        worker_id,
+        lease_seconds=settings.claim_lease_seconds,
+        interval_seconds=settings.intake_backlog_seconds,
+    )
+    metrics.gauge(
+        "trade_executor_intake_unclaimed",
+        "Свободные записи new_positions (включая брошенные с истёкшей арендой)",
+        lambda: backlog.unclaimed,
+    )
+    metrics.gauge(
+        "trade_executor_intake_claimed",
+        "Записи new_positions в обработке у этой реплики, включая пачку, захваченную впрок",
+        lambda: backlog.claimed,
+    )
+
+    ctx = ExecutorContext(
+        settings=settings,
+        client=client,
+        assets=assets,
+        mids=mids,
+        leverages=leverages,
+        ledger=ledger,
+        signatures=signatures,
+        scheduler=scheduler,
+        metrics=metrics,
+        stream=stream,
+        worker_id=worker_id,
+        claims=ClaimPrefetcher(
+            settings.database_url,
+            worker_id,
+            limit=settings.claim_batch_size,
+            lease_seconds=settings.claim_lease_seconds,
+        ),
+        notifier=notifier,
+        workers=ThreadPoolExecutor(
+            max_workers=settings.max_concurrent_signals,
+            thread_name_prefix="signal-worker",
+        ),
+        logger=logger,
+        backlog=backlog,
+    )
+    # Сверке нужен весь контекст: клиент, реестр, плечи и метрики
+    ctx.refresher = LedgerRefresher(
+        lambda: reconcile_ledger(ctx),
+        interval_seconds=settings.ledger_reconcile_seconds,
+    )
+    ctx.unknown_orders = UnknownOrderTracker(
+        order_status=lambda cloid: client.order_status(settings.wallet_address, cloid),
+        on_resolved=lambda fill, details: report_resolved_order(fill, details, ctx),
+    )
+    ctx.unknown_orders.start(logger)
+    return ctx
+
+
+def close_context(ctx: ExecutorContext) -> None:
+    """
+    Останавливает фоновые потоки и процессы контекста.
+
+    Args:
+        ctx: Контекст executor.
+    """
+    ctx.workers.shutdown(wait=True)
+    ctx.unknown_orders.stop()
+    # Захваченное впрок возвращаем в очередь, пока пул подключений открыт
+    ctx.claims.close()
+    # Досылаем уведомления, накопленные перед остановкой
+    ctx.notifier.close()
+    ctx.assets.stop()
+    ctx.refresher.stop()
+    ctx.backlog.stop()
+    if ctx.stream is not None:
+        ctx.stream.stop()
+    if ctx.client.signer is not None:
+        ctx.client.signer.shutdown()
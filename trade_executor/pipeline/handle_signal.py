@@ -0,0 +1,69 @@
+"""
+Модуль обработки одного сигнала обычным (не пакетным) путём.
+"""
+
+from typing import Any, Dict
+
+from ..context import ExecutorContext
+from .open_position import open_position
+from .prepare_position import prepare_position
+from .report_signal import follow_up_unknown_order, notify_position, record_signal
+from .signal_fields import signal_fields
+
+
+def _process_new_position(position: Dict[str, Any], ctx: ExecutorContext) -> bool:
+    """
+    Обрабатывает одну новую позицию: проверяет существование и открывает, если нужно.
+
+    Args:
+        position: Данные позиции из new_positions.
+        ctx: Контекст executor.
+
+    Returns:
+        True если позиция была открыта, False если нет.
+    """
+    size_usd = prepare_position(position, ctx)
+    if size_usd is None:
+        return False
+
+    coin = position.get("coin", "")
+    side = position.get("side", "")
+    target_leverage = int(position.get("leverage", "10"))
+
+    try:
+        fill, used_leverage = open_position(coin, side, size_usd, target_leverage, ctx)
+    finally:
+        ctx.ledger.release(coin, side)
+    record_signal(position, fill, ctx)
+
+    if fill is not None:
+        ctx.metrics.fills.inc(state=fill.state)
+    # Уведомление в Telegram — по фактическому исполнению
+    notify_position(coin, side, size_usd, used_leverage, fill, ctx)
+    follow_up_unknown_order(position, size_usd, used_leverage, fill, ctx)
+
+    return fill is not None and fill.accepted
+
+
+def handle_signal(position: Dict[str, Any], ctx: ExecutorContext) -> bool:
+    """
+    Обрабатывает сигнал. Не бросает исключений.
+
+    Args:
+        position: Данные позиции из new_positions.
+        ctx: Контекст executor.
+
+    Returns:
+        True если обработка завершена и запись можно удалить,
+        False если сигнал нужно вернуть в очередь.
+    """
+    position_id = position.get("id")
+    try:
+        _process_new_position(position=position, ctx=ctx)
+        # Удаляем в любом случае после обработки
+        return True
+
+    except Exception as e:
+        ctx.metrics.signals.inc(outcome="released")
+        ctx.logger.error("Ошибка обработки позиции ID %s: %s", position_id, e, extra=signal_fields(position))
+        return False
@@ -0,0 +1,80 @@
+"""
+Модуль открытия позиции одним ордером с выставлением плеча.
+"""
+
+from typing import Tuple
+
+from ..context import ExecutorContext
+from ..hyperliquid.order_fill import FILL_UNKNOWN, OrderFill
+from ..hyperliquid.place_order import place_market_order
+from ..utils.circuit_breaker import CircuitOpenError
+
+
+def open_position(
+    coin: str,
+    side: str,
+    size_usd: float,
+    target_leverage: int,
+    ctx: ExecutorContext
+) -> Tuple[OrderFill | None, int]:
+    """
+    Открывает позицию одним ордером с плечом, ограниченным лимитами актива.
+
+    Args:
+        coin: Монета.
+        side: Направление (LONG/SHORT).
+        size_usd: Размер в USD.
+        target_leverage: Плечо из сигнала.
+        ctx: Контекст executor.
+
+    Returns:
+        (исполнение ордера или None, если ордер не отправлен; использованное плечо).
+        Исполнение FILL_UNKNOWN значит, что ответ биржи не получен.
+    """
+    logger = ctx.logger
+    leverage = target_leverage
+    fields = {"coin": coin, "side": side}
+
+    try:
+        # update_leverage уходит на биржу, только если плечо монеты меняется
+        leverage = ctx.leverages.ensure(coin, target_leverage)
+        if leverage != target_leverage:
+            logger.info("  Плечо %sx ограничено лимитом %s: %sx", target_leverage, coin, leverage, extra=fields)
+
+        logger.info("  Открываю позицию %s %s с плечом %sx...", coin, side, leverage, extra=fields)
+
+        fill = place_market_order(
+            client=ctx.client,
+            assets=ctx.assets,
+            mids=ctx.mids,
+            coin=coin,
+            side=side,
+            size_usd=size_usd
+        )
+
+        if fill.state == FILL_UNKNOWN:
+            # Ордер мог исполниться: реестр сверится с биржей до следующих сигналов
+            ctx.ledger.mark_stale()
+            ctx.metrics.orders.inc(result="unknown")
+            logger.error("  ❓ Ответ на ордер %s %s не получен: %s", coin, side, fill.error, extra=fields)
+            return fill, leverage
+        if not fill.accepted:
+            ctx.metrics.orders.inc(result="rejected")
+            logger.error("  ❌ Ордер %s %s отклонён биржей: %s", coin, side, fill.error, extra=fields)
+            return fill, leverage
+        ctx.metrics.orders.inc(result="accepted")
+        ctx.ledger.apply_fill(fill, leverage)
+
+        logger.info(
+            "  ✅ Позиция %s %s открыта с плечом %sx: %s, исполнено %g по %s",
+            coin, side, leverage, fill.state, fill.filled_sz, fill.avg_px, extra=fields,
+        )
+        return fill, leverage
+
+    except CircuitOpenError:
+        # Биржа отключена автоматом: сигнал вернётся в очередь, а не будет провален
+        raise
+    except Exception as e:
+        ctx.metrics.orders.inc(result="error")
+        logger.error("  ❌ Ошибка открытия позиции %s %s с плечом %sx: %s", coin, side, leverage, e, extra=fields)
+        return None, leverage
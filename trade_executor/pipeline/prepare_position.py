@@ -0,0 +1,82 @@
+"""
+Модуль подготовки позиции: проверка реестра и расчёт размера.
+"""
+
+import time
+from typing import Any, Dict
+
+from ..context import ExecutorContext
+from ..hyperliquid.calculate_position_size import calculate_position_size_usd
+from ..metrics.executor_metrics import STAGE_SIZING
+from .signal_fields import signal_fields
+
+
+def prepare_position(position: Dict[str, Any], ctx: ExecutorContext) -> float | None:
+    """
+    Проверяет, нужно ли открывать позицию, и рассчитывает её размер.
+
+    Если позицию нужно открывать, (coin, side) остаётся зарезервированным
+    в реестре: вызывающий снимает резерв после отправки ордера.
+
+    Args:
+        position: Данные позиции из new_positions.
+        ctx: Контекст executor.
+
+    Returns:
+        Размер позиции в USD или None, если позицию открывать не нужно.
+    """
+    settings = ctx.settings
+    logger = ctx.logger
+    started = time.perf_counter()
+
+    coin = position.get("coin", "")
+    side = position.get("side", "")
+    target_leverage = int(position.get("leverage", "10"))
+
+    fields = signal_fields(position)
+
+    # На горячем пути — %-форматирование: отброшенная по уровню запись не форматируется
+    logger.info("Обработка позиции: %s %s (плечо %sx)", coin, side, target_leverage, extra=fields)
+
+    # Проверяем по реестру, есть ли уже такая позиция (или её открывает другой сигнал)
+    if not ctx.ledger.try_reserve(coin, side):
+        logger.info("  Позиция %s %s уже открыта. Пропускаем.", coin, side, extra=fields)
+        ctx.metrics.signals.inc(outcome="skipped")
+        return None
+
+    try:
+        # Рассчитываем размер позиции
+        account_state = ctx.ledger.account_state()
+        size_usd = calculate_position_size_usd(account_state, settings.position_size_percent)
+    except Exception:
+        ctx.ledger.release(coin, side)
+        raise
+
+    # Дебаг: показываем что получили из API
+    margin_summary = account_state.get("marginSummary", {})
+    logger.debug(
+        "  Баланс аккаунта: accountValue=%s, withdrawable=%s",
+        margin_summary.get("accountValue"), account_state.get("withdrawable"), extra=fields,
+    )
+
+    if size_usd <= 0:
+        logger.warning(
+            "  Недостаточно средств для открытия позиции %s %s. Рассчитанный размер: $%s",
+            coin, side, size_usd, extra=fields,
+        )
+        ctx.ledger.release(coin, side)
+        ctx.metrics.signals.inc(outcome="skipped")
+        return None
+
+    size_factor = position.get("size_factor", 1.0)
+    if size_factor < 1.0:
+        # Сигнал близок к сроку годности: копируем меньшим размером
+        size_usd *= size_factor
+        logger.info("  Размер уменьшен до %.0f%%: сигнал устаревает", size_factor * 100, extra=fields)
+
+    logger.info(
+        "  Размер позиции: $%.2f (%s%% от баланса)",
+        size_usd, settings.position_size_percent, extra=fields,
+    )
+    ctx.metrics.observe_stage(STAGE_SIZING, time.perf_counter() - started)
+    return size_usd
@@ -0,0 +1,84 @@
+"""
+Модуль обработки захваченных сигналов цикла.
+"""
+
+from typing import Any, Dict, List
+
+from ..context import ExecutorContext
+from ..utils.run_grouped import run_grouped
+from .handle_signal import handle_signal
+from .run_batch import run_batch
+from .signal_fields import signal_fields
+
+
+def process_signals(new_positions: List[Dict[str, Any]], ctx: ExecutorContext) -> List[bool]:
+    """
+    Обрабатывает захваченные сигналы цикла в порядке срока годности.
+
+    Просроченные сигналы (старые или с ушедшей ценой) пропускаются,
+    близкие к сроку открываются уменьшенным размером.
+
+    Args:
+        new_positions: Позиции из new_positions.
+        ctx: Контекст executor.
+
+    Returns:
+        Для каждого сигнала: True если обработан, False если вернуть в очередь.
+    """
+    results = [True] * len(new_positions)
+    indexes = []
+    positions = []
+    for index, plan in ctx.scheduler.schedule(new_positions):
+        position = new_positions[index]
+        if plan.expired:
+            if plan.drift_percent is None:
+                message, drift = "Сигнал ID %s просрочен (возраст %.1f сек, уход цены %s). Пропускаем.", "нет цены"
+            else:
+                message, drift = "Сигнал ID %s просрочен (возраст %.1f сек, уход цены %.2f%%). Пропускаем.", plan.drift_percent
+            ctx.logger.info(message, position.get("id"), plan.age_seconds, drift, extra=signal_fields(position))
+            ctx.metrics.signals.inc(outcome="expired")
+            continue
+        if plan.size_factor < 1.0:
+            ctx.metrics.signals_downsized.inc()
+            position = dict(position, size_factor=plan.size_factor)
+        indexes.append(index)
+        positions.append(position)
+
+    for index, done in zip(indexes, _dispatch_signals(positions, ctx)):
+        results[index] = done
+    return results
+
+
+def _dispatch_signals(new_positions: List[Dict[str, Any]], ctx: ExecutorContext) -> List[bool]:
+    """
+    Отправляет сигналы на обработку: пачкой или параллельно по монетам.
+
+    Args:
+        new_positions: Позиции из new_positions.
+        ctx: Контекст executor.
+
+    Returns:
+        Для каждого сигнала: True если обработан, False если вернуть в очередь.
+    """
+    if ctx.client.signer is not None:
+        # Смену плеча подписываем в пуле сразу, пока идёт расчёт размеров
+        for position in new_positions:
+            try:
+                ctx.leverages.prepare(position.get("coin", ""), int(position.get("leverage", "10")))
+            except Exception as e:
+                ctx.logger.debug(
+                    "Не удалось заранее подписать плечо для позиции ID %s: %s", position.get("id"), e,
+                    extra=signal_fields(position),
+                )
+
+    if ctx.settings.bulk_orders_enabled and len(new_positions) > 1:
+        # Пачку сигналов отправляем одним подписанным запросом
+        return run_batch(new_positions, ctx)
+
+    # Обрабатываем позиции параллельно; сигналы по одной монете — по очереди
+    return run_grouped(
+        executor=ctx.workers,
+        items=new_positions,
+        key=lambda position: position.get("coin", ""),
+        worker=lambda position: handle_signal(position, ctx),
+    )
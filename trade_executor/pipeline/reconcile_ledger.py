@@ -0,0 +1,32 @@
+"""
+Модуль сверки реестра позиций и плеч с состоянием аккаунта.
+"""
+
+import time
+
+from ..context import ExecutorContext
+from ..hyperliquid.get_account_state import get_account_state
+from ..metrics.executor_metrics import STAGE_ACCOUNT_STATE
+
+
+def reconcile_ledger(ctx: ExecutorContext) -> None:
+    """
+    Сверяет реестр позиций и плечи с clearinghouseState.
+
+    Args:
+        ctx: Контекст executor.
+    """
+    settings = ctx.settings
+    requested_at = time.monotonic()
+    with ctx.metrics.stage_seconds.time(stage=STAGE_ACCOUNT_STATE):
+        account_state = get_account_state(
+            api_url=settings.hyperliquid_api_url,
+            wallet_address=settings.wallet_address,
+            timeout=settings.http_timeout_seconds
+        )
+    drift = ctx.ledger.reconcile(account_state, requested_at=requested_at)
+    ctx.leverages.seed(account_state)
+
+    if drift:
+        ctx.logger.warning("Реестр позиций расходился с биржей: %s", drift)
+    ctx.logger.debug("Текущих открытых позиций: %s", len(ctx.ledger.open_positions()))
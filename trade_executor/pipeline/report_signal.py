@@ -0,0 +1,134 @@
+"""
+Модуль итога сигнала: метрики, лог и уведомление в Telegram.
+"""
+
+from typing import Any, Dict
+
+from ..context import ExecutorContext
+from ..hyperliquid.order_fill import FILL_FILLED, FILL_UNKNOWN, OrderFill
+from ..metrics.executor_metrics import STAGE_END_TO_END, seconds_since
+from ..telegram.send_notification import format_position_notification
+from .signal_fields import signal_fields
+
+
+def record_signal(position: Dict[str, Any], fill: OrderFill | None, ctx: ExecutorContext) -> None:
+    """
+    Учитывает итог сигнала в метриках.
+
+    Args:
+        position: Данные позиции из new_positions.
+        fill: Исполнение ордера (None, если ордер не отправлен).
+        ctx: Контекст executor.
+    """
+    success = fill is not None and fill.accepted
+    if success:
+        outcome = "opened"
+    elif fill is not None and fill.state == FILL_UNKNOWN:
+        outcome = "unknown"
+    else:
+        outcome = "failed"
+    end_to_end = seconds_since(position.get("detected_at"))
+    ctx.metrics.signals.inc(outcome=outcome)
+    if success:
+        # Задержка копирования: от обнаружения сделки до ответа биржи
+        ctx.metrics.observe_stage(STAGE_END_TO_END, end_to_end)
+    ctx.logger.info(
+        "Сигнал ID %s: %s", position.get("id"), outcome,
+        extra=dict(
+            signal_fields(position),
+            outcome=outcome,
+            end_to_end_seconds=end_to_end,
+            fill_state=fill.state if fill is not None else None,
+            filled_sz=fill.filled_sz if fill is not None else None,
+            avg_px=fill.avg_px if fill is not None else None,
+        ),
+    )
+
+
+def notify_position(
+    coin: str,
+    side: str,
+    size_usd: float,
+    leverage: int,
+    fill: OrderFill | None,
+    ctx: ExecutorContext
+) -> None:
+    """
+    Ставит в очередь уведомление о результате открытия позиции в Telegram.
+
+    Args:
+        coin: Монета.
+        side: Направление (LONG/SHORT).
+        size_usd: Размер в USD.
+        leverage: Плечо.
+        fill: Исполнение ордера (None, если ордер не отправлен).
+        ctx: Контекст executor.
+    """
+    # Открыта — если что-то исполнено, а не если не было исключения
+    success = fill is not None and fill.filled_sz > 0
+    message = format_position_notification(
+        coin, side, size_usd, leverage, success,
+        filled_sz=fill.filled_sz if fill is not None else None,
+        avg_px=fill.avg_px if fill is not None else None,
+        partial=fill is not None and fill.state != FILL_FILLED,
+        unknown=fill is not None and fill.state == FILL_UNKNOWN,
+    )
+    # Только ставим в очередь: отправкой занимается фоновый поток
+    ctx.notifier.put(message)
+
+
+def follow_up_unknown_order(
+    position: Dict[str, Any],
+    size_usd: float,
+    leverage: int,
+    fill: OrderFill | None,
+    ctx: ExecutorContext
+) -> None:
+    """
+    Ставит ордер без ответа биржи на уточнение исхода по cloid.
+
+    Args:
+        position: Данные позиции из new_positions.
+        size_usd: Размер в USD.
+        leverage: Плечо.
+        fill: Исполнение ордера (None, если ордер не отправлен).
+        ctx: Контекст executor.
+    """
+    if fill is None or fill.state != FILL_UNKNOWN or ctx.unknown_orders is None:
+        return
+    ctx.unknown_orders.track(
+        fill,
+        signal_id=position.get("id"),
+        side=position.get("side", ""),
+        size_usd=size_usd,
+        leverage=leverage,
+    )
+
+
+def report_resolved_order(fill: OrderFill, details: Dict[str, Any], ctx: ExecutorContext) -> None:
+    """
+    Сообщает уточнённый исход ордера, ответ на который не был получен.
+
+    Реестр позиций здесь не меняется: после ActionOutcomeUnknown он уже
+    помечен устаревшим и сверится с clearinghouseState.
+
+    Args:
+        fill: Исполнение, уточнённое по orderStatus.
+        details: Данные ордера из UnknownOrderTracker.track (signal_id, side, size_usd, leverage).
+        ctx: Контекст executor.
+    """
+    side = details.get("side", "LONG" if fill.is_buy else "SHORT")
+    fields = {"signal_id": details.get("signal_id"), "coin": fill.coin, "side": side}
+    ctx.metrics.unknown_orders_resolved.inc(state=fill.state)
+    ctx.logger.info(
+        "Исход ордера %s %s без ответа уточнён: %s, исполнено %g",
+        fill.coin, side, fill.state, fill.filled_sz, extra=fields,
+    )
+    message = format_position_notification(
+        fill.coin, side, details.get("size_usd", 0.0), details.get("leverage"), fill.filled_sz > 0,
+        filled_sz=fill.filled_sz,
+        avg_px=fill.avg_px,
+        partial=fill.state != FILL_FILLED,
+        resolved=True,
+    )
+    ctx.notifier.put(message)
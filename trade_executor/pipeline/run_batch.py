@@ -0,0 +1,207 @@
+"""
+Модуль отправки сигналов цикла одним пакетным ордером.
+
+В пакет не попадают сигналы, ордер которых не удалось подготовить, и
+сигналы с плечом, отличным от плеча первого сигнала той же монеты: они
+обрабатываются по одному (handle_signal) с тем плечом, что указано в
+сигнале. Ордер, отклонённый в пакете или не ушедший на биржу вместе с
+пакетом, повторяется по одному (open_position) — один раз, без подбора
+другого плеча. Ордер без ответа биржи не повторяется.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+from ..context import ExecutorContext
+from ..hyperliquid.client import ActionOutcomeUnknown
+from ..hyperliquid.order_fill import FILL_UNKNOWN, OrderFill, order_fill_from_status, unknown_order_fill
+from ..hyperliquid.place_bulk_orders import is_order_accepted, place_bulk_market_orders
+from ..hyperliquid.place_order import build_market_order_request
+from ..utils.run_grouped import run_grouped
+from .handle_signal import handle_signal
+from .open_position import open_position
+from .prepare_position import prepare_position
+from .report_signal import follow_up_unknown_order, notify_position, record_signal
+from .signal_fields import signal_fields
+
+
+def _finish_batch_leg(
+    position: Dict[str, Any],
+    size_usd: float,
+    leverage: int | None,
+    fill: OrderFill,
+    ctx: ExecutorContext
+) -> bool:
+    """
+    Завершает обработку сигнала из пакетного ордера. Не бросает исключений.
+
+    Ордер, отклонённый биржей или не ушедший с пакетом, повторяется один
+    раз отдельным ордером (open_position) с тем же плечом. Ордер без
+    ответа не повторяется: пакет мог исполниться, и повтор открыл бы
+    позицию второй раз; его исход уточняется по cloid в фоне. Снимает
+    резерв (coin, side) в реестре позиций.
+
+    Args:
+        position: Данные позиции из new_positions.
+        size_usd: Размер позиции в USD.
+        leverage: Выставленное плечо (None, если выставить не удалось).
+        fill: Исполнение ордера из пакетного ответа.
+        ctx: Контекст executor.
+
+    Returns:
+        True если обработка завершена, False если сигнал нужно вернуть в очередь.
+    """
+    logger = ctx.logger
+    position_id = position.get("id")
+    coin = position.get("coin", "")
+    side = position.get("side", "")
+    target_leverage = int(position.get("leverage", "10"))
+
+    fields = signal_fields(position)
+
+    try:
+        if fill.state == FILL_UNKNOWN:
+            logger.error(
+                "  ❓ Исход ордера %s %s в пакете неизвестен: %s. Не повторяю: исход уточнится по статусу ордера.",
+                coin, side, fill.error, extra=fields,
+            )
+            used_leverage = leverage
+        elif fill.accepted:
+            ctx.ledger.apply_fill(fill, leverage)
+            logger.info(
+                "  ✅ Позиция %s %s открыта в пакете с плечом %sx: %s, исполнено %g по %s",
+                coin, side, leverage, fill.state, fill.filled_sz, fill.avg_px, extra=fields,
+            )
+            used_leverage = leverage
+        else:
+            logger.error(
+                "  Ордер %s %s отклонён в пакете: %s. Повторяю отдельно.",
+                coin, side, fill.error, extra=fields,
+            )
+            ctx.metrics.order_retries.inc()
+            fill, used_leverage = open_position(coin, side, size_usd, target_leverage, ctx)
+
+        record_signal(position, fill, ctx)
+        if fill is not None:
+            ctx.metrics.fills.inc(state=fill.state)
+        notify_position(coin, side, size_usd, used_leverage, fill, ctx)
+        follow_up_unknown_order(position, size_usd, used_leverage, fill, ctx)
+        return True
+
+    except Exception as e:
+        ctx.metrics.signals.inc(outcome="released")
+        logger.error("Ошибка обработки позиции ID %s: %s", position_id, e, extra=fields)
+        return False
+    finally:
+        ctx.ledger.release(coin, side)
+
+
+def run_batch(new_positions: List[Dict[str, Any]], ctx: ExecutorContext) -> List[bool]:
+    """
+    Отправляет все подходящие сигналы цикла одним подписанным действием order.
+
+    Плечо выставляется по монетам до пакета; монета, плечо которой выставить
+    не удалось, в пакет не идёт, а её ордера повторяются по одному.
+
+    Args:
+        new_positions: Позиции из new_positions.
+        ctx: Контекст executor.
+
+    Returns:
+        Для каждого сигнала: True если обработан, False если вернуть в очередь.
+    """
+    logger = ctx.logger
+
+    # Отбираем сигналы и готовим ордера (локально, без запросов к бирже).
+    # action: "skip" — открывать не нужно, "batch" — в пакет, "single" — отдельным ордером через handle_signal
+    legs = []
+    for position in new_positions:
+        leg = {"position": position, "action": "single", "size_usd": None, "order": None, "fill": None}
+        try:
+            leg["size_usd"] = prepare_position(position, ctx)
+            if leg["size_usd"] is None:
+                leg["action"] = "skip"
+            else:
+                leg["order"] = build_market_order_request(
+                    ctx.assets, ctx.mids,
+                    position.get("coin", ""), position.get("side", ""), leg["size_usd"]
+                )
+                leg["action"] = "batch"
+        except Exception as e:
+            # Такой сигнал уйдёт отдельным ордером и зарезервирует позицию заново
+            if leg["size_usd"] is not None:
+                ctx.ledger.release(position.get("coin", ""), position.get("side", ""))
+            logger.error(
+                "Не удалось подготовить ордер для позиции ID %s: %s", position.get("id"), e,
+                extra=signal_fields(position),
+            )
+        legs.append(leg)
+
+    batch = [leg for leg in legs if leg["action"] == "batch"]
+
+    # Плечо — отдельное действие; выставляем его по монетам параллельно.
+    # Плечо одно на монету: сигнал с другим плечом по той же монете идёт отдельным ордером
+    leverage_by_coin = {}
+    for leg in batch:
+        position = leg["position"]
+        coin = position.get("coin", "")
+        leverage = int(position.get("leverage", "10"))
+        if leverage_by_coin.setdefault(coin, leverage) != leverage:
+            ctx.ledger.release(coin, position.get("side", ""))
+            leg["action"] = "single"
+    batch = [leg for leg in batch if leg["action"] == "batch"]
+
+    def _set_leverage(item: Tuple[str, int]) -> Tuple[str, int | None]:
+        coin, leverage = item
+        try:
+            return coin, ctx.leverages.ensure(coin, leverage)
+        except Exception as e:
+            logger.error("  Ошибка установки плеча %sx для %s: %s", leverage, coin, e, extra={"coin": coin})
+            return coin, None
+
+    leverage_set = dict(ctx.workers.map(_set_leverage, leverage_by_coin.items()))
+
+    # Без выставленного плеча ордер монеты в пакет не идёт, а повторяется отдельно
+    for leg in batch:
+        coin = leg["position"].get("coin", "")
+        leg["leverage"] = leverage_set.get(coin)
+        if leg["leverage"] is None:
+            leg["fill"] = order_fill_from_status(leg["order"], {"error": f"плечо для {coin} не выставлено"})
+    batch = [leg for leg in batch if leg["leverage"] is not None]
+
+    if batch:
+        logger.info("Отправляю пакет из %s ордеров одним запросом...", len(batch))
+        try:
+            statuses = place_bulk_market_orders(ctx.client, [leg["order"] for leg in batch])
+        except ActionOutcomeUnknown as e:
+            # Пакет мог исполниться: не повторяем, а сверяем реестр с биржей
+            logger.error("Ответ на пакет ордеров не получен: %s", e)
+            ctx.metrics.orders.inc(len(batch), result="unknown")
+            ctx.ledger.mark_stale()
+            for leg in batch:
+                leg["fill"] = unknown_order_fill(leg["order"], e)
+        except Exception as e:
+            # Пакет не ушёл на биржу (автомат, подключение, подпись): ордера повторятся по одному
+            logger.error("Ошибка отправки пакета ордеров: %s", e)
+            ctx.metrics.orders.inc(len(batch), result="error")
+            for leg in batch:
+                leg["fill"] = order_fill_from_status(leg["order"], {"error": str(e)})
+        else:
+            for leg, status in zip(batch, statuses):
+                ctx.metrics.orders.inc(result="accepted" if is_order_accepted(status) else "rejected")
+                leg["fill"] = order_fill_from_status(leg["order"], status)
+
+    def _finish(leg: Dict[str, Any]) -> bool:
+        position = leg["position"]
+        if leg["action"] == "batch":
+            return _finish_batch_leg(position, leg["size_usd"], leg["leverage"], leg["fill"], ctx)
+        if leg["action"] == "single":
+            return handle_signal(position, ctx)
+        return True
+
+    # Уведомления и повтор отклонённых ордеров — параллельно по монетам
+    return run_grouped(
+        executor=ctx.workers,
+        items=legs,
+        key=lambda leg: leg["position"].get("coin", ""),
+        worker=_finish,
+    )
@@ -0,0 +1,134 @@
+"""
+Модуль одного цикла executor: захват, обработка и завершение записей new_positions.
+"""
+
+from typing import Any, Dict, List
+
+from ..context import ExecutorContext
+from ..hyperliquid.endpoint_breakers import unavailable_for_seconds
+from ..hyperliquid.rate_limiter import RateLimitExceeded
+from ..metrics.executor_metrics import STAGE_DELETE, STAGE_FETCH, seconds_since
+from .process_signals import process_signals
+from .reconcile_ledger import reconcile_ledger
+from .signal_fields import signal_fields
+
+
+def _find_duplicates(new_positions: List[Dict[str, Any]], ctx: ExecutorContext) -> List[bool]:
+    """
+    Отмечает сигналы, чья position_signature уже обработана.
+
+    Подписи, которых нет в индексе в памяти, проверяются одним запросом
+    к processed_signatures: там же подписи других реплик и вытесненные
+    из памяти. Повтор подписи внутри пачки — тоже дубликат.
+
+    Args:
+        new_positions: Позиции из new_positions.
+        ctx: Контекст executor.
+
+    Returns:
+        Для каждого сигнала: True если это дубликат.
+    """
+    signatures = [position.get("position_signature") for position in new_positions]
+    unknown = {signature for signature in signatures if signature and signature not in ctx.signatures}
+    if unknown:
+        ctx.signatures.add(ctx.claims.find_processed(list(unknown)))
+
+    seen = set()
+    duplicates = []
+    for signature in signatures:
+        duplicates.append(bool(signature) and (signature in ctx.signatures or signature in seen))
+        seen.add(signature)
+    return duplicates
+
+
+def run_single_cycle(ctx: ExecutorContext) -> int:
+    """
+    Выполняет один цикл: захватывает новые позиции, обрабатывает и завершает их.
+
+    Args:
+        ctx: Контекст executor.
+
+    Returns:
+        Сколько записей было захвачено.
+    """
+    settings = ctx.settings
+    logger = ctx.logger
+
+    unavailable = unavailable_for_seconds()
+    if unavailable > 0:
+        # Не захватываем то, что заведомо не отправится: сигналы ждут в очереди
+        ctx.claims.release()
+        logger.warning("Hyperliquid отключён автоматом, сигналы остаются в очереди ещё %.1f сек", unavailable)
+        return 0
+
+    # Пачка, захваченная впрок прошлым циклом, или новая
+    new_positions = ctx.claims.take()
+    if not new_positions:
+        logger.debug("Новых позиций не найдено.")
+        return 0
+
+    logger.info("Найдено новых позиций: %s", len(new_positions))
+    for position in new_positions:
+        ctx.metrics.observe_stage(STAGE_FETCH, seconds_since(position.get("detected_at")))
+    results = [False] * len(new_positions)
+    duplicates = [False] * len(new_positions)
+    aborted = False
+
+    try:
+        if len(new_positions) == settings.claim_batch_size:
+            # Очередь не разобрана: следующая пачка захватывается, пока идут ордера этой
+            ctx.claims.prefetch()
+        duplicates = _find_duplicates(new_positions, ctx)
+
+        fresh_indexes = []
+        for index, (position, duplicate) in enumerate(zip(new_positions, duplicates)):
+            if duplicate:
+                # Уже обработан: удаляем, не доходя до расчёта размера и биржи
+                logger.info(
+                    "Сигнал %s уже обработан. Пропускаем.", position.get("position_signature"),
+                    extra=signal_fields(position),
+                )
+                ctx.metrics.signals.inc(outcome="duplicate")
+                results[index] = True
+            else:
+                fresh_indexes.append(index)
+
+        # Сверку делает фоновый поток, цикл ждёт REST только если она давно не удавалась
+        if ctx.ledger.age_seconds >= settings.ledger_max_age_seconds:
+            try:
+                reconcile_ledger(ctx)
+            except RateLimitExceeded as e:
+                # Реестр и так обновляется по сделкам: сверка подождёт, ордера — нет
+                logger.warning("Сверка реестра позиций отложена: %s", e)
+            except Exception as e:
+                logger.error("Ошибка получения состояния аккаунта: %s", e)
+                # Сигналы вернутся в очередь; ждём следующего цикла, а не крутимся вхолостую
+                ctx.claims.release(notify=False)
+                return 0
+
+        fresh_results = process_signals([new_positions[index] for index in fresh_indexes], ctx)
+        for index, done in zip(fresh_indexes, fresh_results):
+            results[index] = done
+        return len(new_positions)
+
+    except BaseException:
+        # Цикл прерван: захваченное впрок возвращаем в очередь, а не держим до истечения аренды
+        aborted = True
+        ctx.claims.release()
+        raise
+
+    finally:
+        # Обработанные удаляем и запоминаем их подписи, остальные возвращаем в очередь — одной транзакцией.
+        # Необработанные из прерванного цикла другие реплики забирают сразу; сигналы,
+        # упавшие с ошибкой, повторяются на следующем цикле, а не по своему же NOTIFY
+        done_ids = [p["id"] for p, done in zip(new_positions, results) if done]
+        released_ids = [p["id"] for p, done in zip(new_positions, results) if not done]
+        processed = [
+            p["position_signature"]
+            for p, done, duplicate in zip(new_positions, results, duplicates)
+            if done and not duplicate and p.get("position_signature")
+        ]
+        with ctx.metrics.stage_seconds.time(stage=STAGE_DELETE):
+            ctx.claims.complete(done_ids, released_ids, processed, notify=aborted)
+        ctx.signatures.add(processed)
+        logger.info("Завершено позиций: %s, возвращено в очередь: %s", len(done_ids), len(released_ids))
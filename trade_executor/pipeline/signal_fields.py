@@ -0,0 +1,10 @@
+"""
+Модуль полей сигнала для структурированного лога.
+"""
+
+from typing import Any, Dict
+
+
+def signal_fields(position: Dict[str, Any]) -> Dict[str, Any]:
+    """Поля сигнала для структурированного лога (extra)."""
+    return {"signal_id": position.get("id"), "coin": position.get("coin"), "side": position.get("side")}
@@ -0,0 +1,64 @@
+"""
+Модуль фоновой сверки реестра позиций с REST.
+"""
+
+import threading
+from typing import Callable
+
+from ..hyperliquid.rate_limiter import RateLimitExceeded
+from ..utils.circuit_breaker import CircuitOpenError
+
+
+class LedgerRefresher:
+    """
+    Сверяет реестр позиций и маржи с clearinghouseState в своём потоке.
+
+    Сверка раз в interval_seconds идёт между сигналами, поэтому к приходу
+    сигнала снимок аккаунта уже свежий и цикл не ждёт запрос к REST.
+    Неудачная сверка повторяется через тот же интервал; если снимок
+    всё же устарел сверх допустимого, цикл сверяется сам.
+    """
+
+    def __init__(self, reconcile: Callable[[], None], interval_seconds: float = 30.0):
+        """
+        Args:
+            reconcile: Функция сверки (запрос состояния аккаунта и обновление реестра).
+            interval_seconds: Интервал сверки в секундах.
+        """
+        self._reconcile = reconcile
+        self.interval_seconds = interval_seconds
+
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, logger=None) -> None:
+        """
+        Запускает фоновую сверку.
+
+        Args:
+            logger: Logger для ошибок сверки (опционально).
+        """
+        if self._thread is not None:
+            return
+
+        def _run() -> None:
+            while not self._stop_event.wait(self.interval_seconds):
+                try:
+                    self._reconcile()
+                except (RateLimitExceeded, CircuitOpenError) as e:
+                    # Реестр обновляется по сделкам, сверка подождёт следующего интервала
+                    if logger is not None:
+                        logger.warning(f"Фоновая сверка реестра позиций отложена: {e}")
+                except Exception as e:
+                    if logger is not None:
+                        logger.error(f"Ошибка фоновой сверки реестра позиций: {e}")
+
+        self._thread = threading.Thread(target=_run, name="ledger-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Останавливает фоновую сверку."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,289 @@
+"""
+Модуль локального реестра позиций и маржи аккаунта.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Set, Tuple
+
+from ..hyperliquid.get_open_positions import get_open_positions
+from ..hyperliquid.order_fill import OrderFill
+
+# Сколько последних ордеров/сделок помнить для защиты от двойного учёта
+_MAX_TRACKED_IDS = 10_000
+
+
+class PositionLedger:
+    """
+    Реестр открытых позиций в памяти с O(1) поиском по (coin, side).
+
+    Заполняется из clearinghouseState при старте и при сверках с REST,
+    между сверками обновляется по сделкам: из ответов на ордера и из
+    подписки userFills. Одна и та же сделка не учитывается дважды:
+    ордер, учтённый по ответу биржи, пропускается в userFills, и наоборот.
+
+    Маржа аккаунта тоже ведётся по сделкам, а не только по сверке:
+    изменение позиции сдвигает занятую маржу (изменение нотионала / плечо)
+    и withdrawable, комиссия и closedPnl из userFills — accountValue.
+    Так второй сигнал пачки считает размер по марже после первого, без
+    запроса к REST после каждой пачки. Плечо монеты берётся из ордера
+    executor или из последнего снимка; если оно неизвестно (сделка по
+    новой монете не от executor) или нет цены исполнения, реестр
+    помечается устаревшим и маржа уточняется сверкой.
+
+    Сверка может идти в фоне параллельно с ордерами: монеты, по которым
+    сделка учтена после запроса снимка, сохраняют локальное значение —
+    снимок о них ещё не знает. Так же поверх снимка заново применяются
+    изменения маржи по сделкам после его запроса.
+
+    Кроме позиций, реестр резервирует (coin, side) на время обработки
+    сигнала, чтобы два сигнала одной пачки не открыли одну позицию дважды.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._positions: Dict[Tuple[str, str], float] = {}
+        self._pending: Set[Tuple[str, str]] = set()
+        self._account_state: Dict[str, Any] = {}
+        # coin -> плечо позиции (из снимка и ордеров executor)
+        self._leverages: Dict[str, float] = {}
+        # Изменения маржи по сделкам: (monotonic, accountValue, withdrawable, totalMarginUsed, totalNtlPos)
+        self._margin_changes: List[Tuple[float, float, float, float, float]] = []
+        self._reconciled_at = 0.0
+        # coin -> когда позиция по монете последний раз менялась по сделке (monotonic)
+        self._changed_at: Dict[str, float] = {}
+        # oid -> источник учёта ("response" или "ws"), tid учтённых сделок
+        self._oid_sources: "OrderedDict[int, str]" = OrderedDict()
+        self._seen_tids: "OrderedDict[int, None]" = OrderedDict()
+
+    def attach(self, stream, wallet_address: str) -> None:
+        """
+        Подписывает реестр на сделки аккаунта.
+
+        Args:
+            stream: WebSocket-подключение к Hyperliquid.
+            wallet_address: Адрес кошелька.
+        """
+        stream.subscribe({"type": "userFills", "user": wallet_address}, self._on_user_fills)
+
+    def reconcile(
+        self,
+        account_state: Dict[str, Any],
+        requested_at: float | None = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Заменяет реестр данными clearinghouseState.
+
+        Args:
+            account_state: Состояние аккаунта от API.
+            requested_at: Когда запрошен снимок (time.monotonic); сделки после
+                этого момента в снимке не отражены и сохраняются.
+
+        Returns:
+            Ключи (coin, side), по которым реестр расходился с биржей.
+        """
+        positions = {
+            (pos["coin"], pos["side"]): pos["size"]
+            for pos in get_open_positions(account_state)
+        }
+        with self._lock:
+            if requested_at is not None:
+                for coin, changed_at in self._changed_at.items():
+                    if changed_at < requested_at:
+                        continue
+                    for key in ((coin, "LONG"), (coin, "SHORT")):
+                        positions.pop(key, None)
+                        if key in self._positions:
+                            positions[key] = self._positions[key]
+                self._changed_at = {
+                    coin: changed_at for coin, changed_at in self._changed_at.items()
+                    if changed_at >= requested_at
+                }
+                self._margin_changes = [change for change in self._margin_changes if change[0] >= requested_at]
+            else:
+                self._changed_at = {}
+                self._margin_changes = []
+
+            drift = [
+                key for key in set(positions) | set(self._positions)
+                if abs(positions.get(key, 0.0) - self._positions.get(key, 0.0)) > 1e-9
+            ]
+            self._positions = positions
+            self._account_state = {
+                "marginSummary": dict(account_state.get("marginSummary", {})),
+                "withdrawable": account_state.get("withdrawable"),
+                "assetPositions": account_state.get("assetPositions", []),
+            }
+            for item in self._account_state["assetPositions"]:
+                position = item.get("position", {})
+                leverage = (position.get("leverage") or {}).get("value")
+                if leverage:
+                    self._leverages[position.get("coin", "")] = float(leverage)
+            # Сделки после запроса снимка в нём не отражены
+            for change in self._margin_changes:
+                self._shift_margin(*change[1:])
+            self._reconciled_at = time.monotonic()
+        return drift
+
+    @property
+    def age_seconds(self) -> float:
+        """Сколько секунд прошло с последней сверки с REST."""
+        return time.monotonic() - self._reconciled_at
+
+    def mark_stale(self) -> None:
+        """Помечает сверку устаревшей: следующий цикл сверится с REST до обработки сигналов."""
+        with self._lock:
+            self._reconciled_at = 0.0
+
+    def account_state(self) -> Dict[str, Any]:
+        """Маржа аккаунта в формате clearinghouseState (для расчёта размера)."""
+        with self._lock:
+            # Копия: маржа меняется по сделкам из других потоков
+            return dict(self._account_state, marginSummary=dict(self._account_state.get("marginSummary", {})))
+
+    def open_positions(self) -> List[Dict[str, Any]]:
+        """Список открытых позиций с полями coin, side, size."""
+        with self._lock:
+            return [
+                {"coin": coin, "side": side, "size": size}
+                for (coin, side), size in self._positions.items()
+            ]
+
+    def try_reserve(self, coin: str, side: str) -> bool:
+        """
+        Резервирует (coin, side) под обработку сигнала.
+
+        Args:
+            coin: Монета.
+            side: Направление (LONG/SHORT).
+
+        Returns:
+            False если позиция уже открыта или обрабатывается другим сигналом.
+        """
+        key = (coin, side)
+        with self._lock:
+            if key in self._positions or key in self._pending:
+                return False
+            self._pending.add(key)
+            return True
+
+    def release(self, coin: str, side: str) -> None:
+        """
+        Снимает резерв (coin, side) после обработки сигнала.
+
+        Args:
+            coin: Монета.
+            side: Направление (LONG/SHORT).
+        """
+        with self._lock:
+            self._pending.discard((coin, side))
+
+    def apply_fill(self, fill: OrderFill, leverage: float | None = None) -> None:
+        """
+        Учитывает исполнение ордера из ответа биржи.
+
+        Комиссии в ответе на ордер нет: она учитывается по userFills.
+
+        Args:
+            fill: Исполнение ордера.
+            leverage: Плечо, с которым открыт ордер (None — из последнего снимка).
+        """
+        if fill.filled_sz <= 0:
+            return
+
+        with self._lock:
+            if leverage:
+                self._leverages[fill.coin] = float(leverage)
+            if fill.oid is not None:
+                if fill.oid in self._oid_sources:
+                    # Уже учтено по userFills
+                    return
+                self._remember(self._oid_sources, fill.oid, "response")
+            self._apply_trade(fill.coin, fill.filled_sz if fill.is_buy else -fill.filled_sz, fill.avg_px)
+
+    def _on_user_fills(self, message: Dict[str, Any]) -> None:
+        data = message.get("data", {})
+        # Снимок истории при подписке уже отражён в clearinghouseState
+        if data.get("isSnapshot"):
+            return
+
+        with self._lock:
+            for fill in data.get("fills", []):
+                tid = fill.get("tid")
+                oid = fill.get("oid")
+                if tid is not None:
+                    if tid in self._seen_tids:
+                        continue
+                    self._remember(self._seen_tids, tid, None)
+
+                # Комиссия и реализованный PnL есть только в userFills
+                realized = float(fill.get("closedPnl", 0) or 0) - float(fill.get("fee", 0) or 0)
+                if realized:
+                    self._record_margin(realized, realized, 0.0, 0.0)
+
+                if oid is not None:
+                    if self._oid_sources.get(oid) == "response":
+                        continue
+                    self._remember(self._oid_sources, oid, "ws")
+
+                coin = fill.get("coin", "")
+                size = float(fill.get("sz", 0) or 0)
+                delta = size if fill.get("side") == "B" else -size
+                px = float(fill["px"]) if fill.get("px") else None
+                if fill.get("startPosition") is not None:
+                    # startPosition — позиция до сделки по данным биржи: точнее, чем сумма дельт
+                    start = float(fill["startPosition"])
+                    self._set_szi(coin, start + delta)
+                    self._adjust_margin(coin, start, start + delta, px)
+                else:
+                    self._apply_trade(coin, delta, px)
+
+    def _get_szi(self, coin: str) -> float:
+        return self._positions.get((coin, "LONG"), 0.0) - self._positions.get((coin, "SHORT"), 0.0)
+
+    def _set_szi(self, coin: str, szi: float) -> None:
+        self._changed_at[coin] = time.monotonic()
+        self._positions.pop((coin, "LONG"), None)
+        self._positions.pop((coin, "SHORT"), None)
+        if szi > 1e-12:
+            self._positions[(coin, "LONG")] = szi
+        elif szi < -1e-12:
+            self._positions[(coin, "SHORT")] = -szi
+
+    def _apply_trade(self, coin: str, delta: float, px: float | None) -> None:
+        before = self._get_szi(coin)
+        self._set_szi(coin, before + delta)
+        self._adjust_margin(coin, before, before + delta, px)
+
+    def _adjust_margin(self, coin: str, before: float, after: float, px: float | None) -> None:
+        leverage = self._leverages.get(coin)
+        if not leverage or px is None:
+            # Маржу не посчитать: уточнится сверкой до следующих сигналов
+            self._reconciled_at = 0.0
+            return
+        notional = (abs(after) - abs(before)) * px
+        self._record_margin(0.0, -notional / leverage, notional / leverage, notional)
+
+    def _record_margin(self, account_value: float, withdrawable: float, margin_used: float, ntl_pos: float) -> None:
+        self._margin_changes.append((time.monotonic(), account_value, withdrawable, margin_used, ntl_pos))
+        if len(self._margin_changes) > _MAX_TRACKED_IDS:
+            del self._margin_changes[0]
+        self._shift_margin(account_value, withdrawable, margin_used, ntl_pos)
+
+    def _shift_margin(self, account_value: float, withdrawable: float, margin_used: float, ntl_pos: float) -> None:
+        if not self._account_state:
+            # Снимка ещё нет: сдвигать нечего, изменения применятся поверх первого
+            return
+        summary = self._account_state["marginSummary"]
+        for key, delta in (("accountValue", account_value), ("totalMarginUsed", margin_used), ("totalNtlPos", ntl_pos)):
+            if delta and key in summary:
+                summary[key] = str(float(summary[key]) + delta)
+        if withdrawable and self._account_state.get("withdrawable") is not None:
+            self._account_state["withdrawable"] = str(float(self._account_state["withdrawable"]) + withdrawable)
+
+    @staticmethod
+    def _remember(store: "OrderedDict", key: Any, value: Any) -> None:
+        store[key] = value
+        while len(store) > _MAX_TRACKED_IDS:
+            store.popitem(last=False)
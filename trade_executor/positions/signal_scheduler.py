@@ -0,0 +1,119 @@
+"""
+Модуль планирования сигналов по сроку годности (возраст и уход цены).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from ..hyperliquid.mid_price_cache import MidPriceCache
+from ..metrics.executor_metrics import seconds_since
+
+
+@dataclass(frozen=True)
+class SignalPlan:
+    """Решение планировщика по одному сигналу."""
+
+    remaining: float  # Остаток срока годности: 1 — свежий, <= 0 — просрочен
+    size_factor: float  # Множитель размера позиции (1 — полный размер)
+    age_seconds: float  # Возраст сигнала от detected_at
+    drift_percent: float | None  # Уход цены от entry_price против направления (%)
+
+    @property
+    def expired(self) -> bool:
+        """Сигнал просрочен и копировать его не стоит."""
+        return self.remaining <= 0
+
+
+class SignalScheduler:
+    """
+    Считает для каждого сигнала, сколько у него осталось срока годности.
+
+    Срок расходуют два фактора: возраст сигнала (max_age_seconds от
+    detected_at) и уход mid-цены от entry_price против направления сделки
+    (max_drift_percent). Остаток — меньший из двух. Просроченный сигнал
+    пропускается, сигнал с остатком меньше downsize_from открывается
+    пропорционально меньшим размером. Сигналы обрабатываются от самых
+    свежих к самым старым: при очереди мощность тратится на копии,
+    которые ещё имеет смысл открывать.
+    """
+
+    def __init__(
+        self,
+        mids: MidPriceCache,
+        max_age_seconds: float = 0.0,
+        max_drift_percent: float = 0.0,
+        downsize_from: float = 0.5
+    ):
+        """
+        Args:
+            mids: Кэш mid-цен.
+            max_age_seconds: Возраст, после которого сигнал просрочен (0 — не ограничен).
+            max_drift_percent: Уход цены, после которого сигнал просрочен (0 — не ограничен).
+            downsize_from: Остаток срока, ниже которого размер уменьшается (0 — не уменьшать).
+        """
+        self._mids = mids
+        self.max_age_seconds = max_age_seconds
+        self.max_drift_percent = max_drift_percent
+        self.downsize_from = downsize_from
+
+    def plan(self, position: Dict[str, Any]) -> SignalPlan:
+        """
+        Оценивает сигнал.
+
+        Args:
+            position: Данные позиции из new_positions.
+
+        Returns:
+            Решение по сигналу.
+        """
+        age_seconds = max(0.0, seconds_since(position.get("detected_at")) or 0.0)
+        drift_percent = self._drift_percent(position)
+
+        remaining = 1.0
+        if self.max_age_seconds > 0:
+            remaining = min(remaining, 1 - age_seconds / self.max_age_seconds)
+        if self.max_drift_percent > 0 and drift_percent is not None:
+            remaining = min(remaining, 1 - max(drift_percent, 0.0) / self.max_drift_percent)
+
+        size_factor = 1.0
+        if self.downsize_from > 0 and 0 < remaining < self.downsize_from:
+            size_factor = remaining / self.downsize_from
+
+        return SignalPlan(
+            remaining=remaining,
+            size_factor=size_factor,
+            age_seconds=age_seconds,
+            drift_percent=drift_percent,
+        )
+
+    def schedule(self, positions: List[Dict[str, Any]]) -> List[Tuple[int, SignalPlan]]:
+        """
+        Оценивает сигналы и упорядочивает их по остатку срока.
+
+        Args:
+            positions: Позиции из new_positions.
+
+        Returns:
+            (индекс сигнала, решение) от самых свежих к просроченным.
+        """
+        plans = [(index, self.plan(position)) for index, position in enumerate(positions)]
+        # sorted устойчив: при равном остатке сохраняется порядок захвата
+        return sorted(plans, key=lambda item: item[1].remaining, reverse=True)
+
+    def _drift_percent(self, position: Dict[str, Any]) -> float | None:
+        try:
+            entry_price = float(position.get("entry_price") or 0)
+        except (ValueError, TypeError):
+            return None
+        if entry_price <= 0:
+            return None
+
+        try:
+            mid = self._mids.get_mid(position.get("coin", ""))
+        except Exception:
+            # Без цены срок считается только по возрасту
+            return None
+
+        drift = (mid - entry_price) / entry_price * 100
+        # Для LONG против нас — рост цены, для SHORT — падение
+        return drift if position.get("side") != "SHORT" else -drift
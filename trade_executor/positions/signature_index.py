@@ -0,0 +1,47 @@
+"""
+Модуль индекса уже обработанных сигналов (position_signature).
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+
+class SignatureIndex:
+    """
+    Множество обработанных position_signature в памяти с вытеснением
+    самых старых записей сверх max_size.
+
+    Источник истины — таблица processed_signatures: индекс заполняется
+    из неё при старте и избавляет горячий путь от запроса в БД для
+    повторов, которые эта реплика уже видела.
+    """
+
+    def __init__(self, max_size: int = 100_000):
+        """
+        Args:
+            max_size: Сколько подписей держать в памяти.
+        """
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._signatures: "OrderedDict[str, None]" = OrderedDict()
+
+    def __contains__(self, signature: str) -> bool:
+        return signature in self._signatures
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, signatures: Iterable[str]) -> None:
+        """
+        Запоминает подписи обработанных сигналов.
+
+        Args:
+            signatures: Подписи в порядке обработки (последние — самые свежие).
+        """
+        with self._lock:
+            for signature in signatures:
+                self._signatures[signature] = None
+                self._signatures.move_to_end(signature)
+            while len(self._signatures) > self.max_size:
+                self._signatures.popitem(last=False)
@@ -0,0 +1 @@
+"""Модуль воспроизведения записанных сигналов на симулированной бирже."""
@@ -0,0 +1,37 @@
+"""
+Модуль загрузки записанного потока new_positions.
+"""
+
+import csv
+import json
+from typing import Any, Dict, List
+
+from .price_series import parse_timestamp
+
+
+def load_recorded_positions(path: str) -> List[Dict[str, Any]]:
+    """
+    Читает записи new_positions из JSON Lines или CSV (колонки как в таблице).
+
+    Args:
+        path: Путь к файлу.
+
+    Returns:
+        Записи по возрастанию detected_at; в поле recorded_at — detected_at
+        в unix-времени, id проставляется по порядку, если его нет.
+    """
+    with open(path, encoding="utf-8") as file:
+        if path.endswith(".csv"):
+            rows = list(csv.DictReader(file))
+        else:
+            rows = [json.loads(line) for line in file if line.strip()]
+
+    positions = []
+    for index, row in enumerate(rows, start=1):
+        position = dict(row)
+        position.setdefault("id", index)
+        position["recorded_at"] = parse_timestamp(row["detected_at"])
+        positions.append(position)
+
+    positions.sort(key=lambda position: position["recorded_at"])
+    return positions
@@ -0,0 +1,105 @@
+"""
+Модуль записанного ряда цен для симулированной биржи.
+"""
+
+import bisect
+import csv
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+
+def parse_timestamp(value: Any) -> float:
+    """
+    Переводит момент из записи в unix-время.
+
+    Args:
+        value: ISO-строка, unix-время в секундах или миллисекундах, либо datetime.
+
+    Returns:
+        Unix-время в секундах.
+    """
+    if isinstance(value, datetime):
+        moment = value
+    elif isinstance(value, (int, float)) or (isinstance(value, str) and value.replace(".", "", 1).isdigit()):
+        number = float(value)
+        # Миллисекунды (как в API Hyperliquid)
+        return number / 1000 if number > 1e11 else number
+    else:
+        moment = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+class PriceSeries:
+    """
+    Цены монет во времени: цена в момент t — последняя записанная не позже t
+    (до первой записи — первая).
+    """
+
+    def __init__(self):
+        self._series: Dict[str, Tuple[List[float], List[float]]] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "PriceSeries":
+        """
+        Загружает ряд из CSV (колонки time, coin, price) или JSON Lines
+        (поля time, coin, price).
+
+        Args:
+            path: Путь к файлу.
+
+        Returns:
+            Ряд цен.
+        """
+        series = cls()
+        with open(path, encoding="utf-8") as file:
+            if path.endswith(".csv"):
+                rows = list(csv.DictReader(file))
+            else:
+                rows = [json.loads(line) for line in file if line.strip()]
+        for row in rows:
+            series.add(row["coin"], parse_timestamp(row["time"]), float(row["price"]))
+        return series
+
+    def add(self, coin: str, at: float, price: float) -> None:
+        """
+        Добавляет точку ряда.
+
+        Args:
+            coin: Монета.
+            at: Unix-время.
+            price: Цена.
+        """
+        times, prices = self._series.setdefault(coin, ([], []))
+        index = bisect.bisect_right(times, at)
+        times.insert(index, at)
+        prices.insert(index, price)
+
+    @property
+    def coins(self) -> List[str]:
+        """Монеты, для которых есть цены."""
+        return list(self._series)
+
+    def has(self, coin: str) -> bool:
+        """Есть ли цены для монеты."""
+        return coin in self._series
+
+    def price_at(self, coin: str, at: float) -> float:
+        """
+        Цена монеты в момент at.
+
+        Args:
+            coin: Монета.
+            at: Unix-время.
+
+        Returns:
+            Цена.
+
+        Raises:
+            KeyError: Если для монеты нет цен.
+        """
+        times, prices = self._series[coin]
+        index = bisect.bisect_right(times, at) - 1
+        return prices[max(index, 0)]
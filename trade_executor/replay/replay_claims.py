@@ -0,0 +1,131 @@
+"""
+Модуль очереди new_positions в памяти для воспроизведения.
+"""
+
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Set
+
+from ..hyperliquid.mid_price_cache import MidPriceCache
+
+# Сколько раз сигнал, возвращённый в очередь, подаётся повторно
+_MAX_ATTEMPTS = 3
+
+
+class ReplayClaims:
+    """
+    Заменяет ClaimPrefetcher в контексте воспроизведения.
+
+    Цикл run_single_cycle забирает сигналы, поступившие к его началу,
+    пачкой до limit, как claim_new_positions, и завершает их через
+    complete: возвращённые в очередь подаются снова (до _MAX_ATTEMPTS
+    раз), остальные попадают в signals для отчёта.
+    """
+
+    def __init__(self, clock, price: Callable[[str], float], mids: MidPriceCache, limit: int = 50):
+        """
+        Args:
+            clock: Время симуляции (ReplayClock).
+            price: Цена монеты в текущий момент симуляции.
+            mids: Кэш mid-цен executor (обновляется при выдаче пачки, как от allMids).
+            limit: Размер пачки.
+        """
+        self.clock = clock
+        self.price = price
+        self.mids = mids
+        self.limit = limit
+
+        self.ready: deque = deque()
+        self.batch: List[Dict[str, Any]] = []  # Пачка последнего цикла
+        self.signals: List[Dict[str, Any]] = []  # Завершённые сигналы
+        self.queue_delays: List[float] = []
+        self.backlogs: List[int] = []
+        self._processed: Set[str] = set()
+
+    def put(self, position: Dict[str, Any], due_at: float) -> None:
+        """
+        Ставит записанный сигнал в очередь.
+
+        Args:
+            position: Запись из load_recorded_positions.
+            due_at: Момент поступления сигнала (monotonic).
+        """
+        self.ready.append({"position": position, "due_at": due_at, "attempts": 0})
+
+    def take(self) -> List[Dict[str, Any]]:
+        """
+        Пачка сигналов, поступивших к этому моменту.
+
+        Returns:
+            Позиции с detected_at — реальным моментом поступления.
+        """
+        if not self.ready:
+            self.batch = []
+            return []
+        now = time.monotonic()
+        self.backlogs.append(len(self.ready))
+        self.batch = [self.ready.popleft() for _ in range(min(self.limit, len(self.ready)))]
+
+        mids = {}
+        positions = []
+        for item in self.batch:
+            position = item["position"]
+            item["attempts"] += 1
+            if item["attempts"] == 1:
+                self.queue_delays.append(now - item["due_at"])
+            self.clock.anchor(position["coin"], position["recorded_at"], item["due_at"])
+            mids[position["coin"]] = str(self.price(position["coin"]))
+            # detected_at — реальный момент поступления, чтобы метрики executor считали задержку верно
+            positions.append(
+                dict(position, detected_at=datetime.now(timezone.utc) - timedelta(seconds=now - item["due_at"]))
+            )
+        # Свежие цены, как от подписки allMids
+        self.mids.update(mids)
+        return positions
+
+    def prefetch(self) -> None:
+        """Захвата впрок нет: очередь уже в памяти."""
+
+    def release(self, notify: bool = True) -> None:
+        """Захваченного впрок нет: возвращать нечего."""
+
+    def find_processed(self, signatures: List[str]) -> Set[str]:
+        """
+        Подписи, уже завершённые в этом воспроизведении.
+
+        Args:
+            signatures: Подписи для проверки.
+
+        Returns:
+            Множество уже обработанных подписей.
+        """
+        return self._processed.intersection(signatures)
+
+    def complete(
+        self,
+        done_ids: List[int],
+        released_ids: List[int],
+        processed: List[str],
+        notify: bool = True
+    ) -> None:
+        """
+        Завершает пачку: возвращённые сигналы встают в очередь снова.
+
+        Args:
+            done_ids: ID обработанных записей.
+            released_ids: ID записей, которые нужно вернуть в очередь.
+            processed: Подписи обработанных сигналов.
+            notify: Не используется (в памяти уведомлять некого).
+        """
+        self._processed.update(processed)
+        released = set(released_ids)
+        for item in self.batch:
+            if item["position"]["id"] in released and item["attempts"] < _MAX_ATTEMPTS:
+                # Как возврат в очередь new_positions: заберётся следующим циклом
+                self.ready.append(item)
+            else:
+                self.signals.append(item)
+
+    def close(self) -> None:
+        """Фоновых потоков нет."""
@@ -0,0 +1,274 @@
+"""
+Модуль воспроизведения записанного потока new_positions на симулированной бирже.
+"""
+
+import dataclasses
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+from ..config.get_settings import Settings
+from ..hyperliquid.endpoint_breakers import unavailable_for_seconds
+from ..pipeline.build_context import build_context, close_context
+from ..pipeline.reconcile_ledger import reconcile_ledger
+from ..pipeline.run_single_cycle import run_single_cycle
+from ..utils.circuit_breaker import init_circuit_breakers
+from ..utils.percentile import percentile
+from .price_series import PriceSeries
+from .replay_claims import ReplayClaims
+from .simulated_exchange import SimulatedExchange
+
+
+class DiscardingNotifier:
+    """Очередь уведомлений без Telegram: сообщения выбрасываются."""
+
+    depth = 0
+
+    def start(self) -> None:
+        pass
+
+    def put(self, message: str) -> None:
+        pass
+
+    def close(self, timeout: float = 30.0) -> None:
+        pass
+
+
+class ReplayClock:
+    """
+    Время симуляции.
+
+    Паузы между записанными сигналами сжимаются в speed раз. Время после
+    выдачи сигнала идёт в реальном масштабе: цена исполнения монеты берётся
+    на момент detected_at + (сколько executor реально ждал и обрабатывал),
+    поэтому сжатие не искажает проскальзывание.
+    """
+
+    def __init__(self, start_at: float, speed: float):
+        """
+        Args:
+            start_at: detected_at первого сигнала (unix-время).
+            speed: Во сколько раз сжимать паузы между сигналами.
+        """
+        self.start_at = start_at
+        self.speed = speed
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        # coin -> (detected_at сигнала, момент его выдачи по monotonic)
+        self._anchors: Dict[str, Tuple[float, float]] = {}
+
+    def due_at(self, recorded_at: float) -> float:
+        """Момент (monotonic), когда сигнал должен поступить в executor."""
+        return self.started + (recorded_at - self.start_at) / self.speed
+
+    def anchor(self, coin: str, recorded_at: float, due_at: float) -> None:
+        """Привязывает время монеты к сигналу, который по ней обрабатывается."""
+        with self._lock:
+            self._anchors[coin] = (recorded_at, due_at)
+
+    def now(self, coin: str) -> float:
+        """Время симуляции для цены монеты (unix-время)."""
+        anchor = self._anchors.get(coin)
+        if anchor is not None:
+            recorded_at, due_at = anchor
+            return recorded_at + (time.monotonic() - due_at)
+        return self.start_at + (time.monotonic() - self.started) * self.speed
+
+
+def run_replay(
+    positions: List[Dict[str, Any]],
+    prices: PriceSeries,
+    settings: Settings,
+    logger,
+    speed: float = 60.0,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    reject_rate: float = 0.0,
+    error_rate: float = 0.0,
+    account_value: float = 100_000.0,
+    sz_decimals: Dict[str, int] | None = None
+) -> Dict[str, Any]:
+    """
+    Подаёт записанные сигналы в конвейер обработки executor с сохранением
+    интервалов detected_at (сжатых в speed раз) против симулированной биржи.
+
+    Сигналы проходят через run_single_cycle, как в основном цикле, но
+    вместо PostgreSQL очередь new_positions — ReplayClaims в памяти:
+    сигналы, пришедшие к моменту очередного цикла, забираются пачкой до
+    CLAIM_BATCH_SIZE, как это делает claim_new_positions.
+
+    Args:
+        positions: Записи из load_recorded_positions.
+        prices: Записанный ряд цен.
+        settings: Настройки executor.
+        logger: Logger.
+        speed: Во сколько раз сжимать паузы между сигналами.
+        latency_ms: Задержка ответа биржи (мс).
+        jitter_ms: Случайная добавка к задержке (мс).
+        reject_rate: Доля ордеров, отклоняемых биржей.
+        error_rate: Доля запросов /exchange, отвечающих 500.
+        account_value: Баланс аккаунта.
+        sz_decimals: szDecimals монет (по умолчанию 5).
+
+    Returns:
+        Отчёт: задержки, проскальзывание, пропускная способность и очередь.
+    """
+    if not positions:
+        raise ValueError("Нет сигналов для воспроизведения.")
+
+    # Монетам без записанных цен — цена входа из первого сигнала
+    fallback_prices = {}
+    for position in positions:
+        fallback_prices.setdefault(position["coin"], float(position.get("entry_price") or 0))
+
+    clock = ReplayClock(positions[0]["recorded_at"], speed)
+
+    def _price(coin: str) -> float:
+        if prices.has(coin):
+            return prices.price_at(coin, clock.now(coin))
+        return fallback_prices[coin]
+
+    coins = sorted(set(fallback_prices) | set(prices.coins))
+    exchange = SimulatedExchange(
+        coins=coins,
+        price_at=_price,
+        sz_decimals={coin: 5 for coin in coins} | (sz_decimals or {}),
+        account_value=account_value,
+        latency_ms=latency_ms,
+        jitter_ms=jitter_ms,
+        reject_rate=reject_rate,
+        error_rate=error_rate,
+    )
+    exchange.start()
+
+    settings = dataclasses.replace(
+        settings,
+        hyperliquid_api_url=exchange.url,
+        websocket_enabled=False,
+        metrics_port=0,
+    )
+
+    init_circuit_breakers(
+        failure_rate=settings.circuit_failure_rate,
+        slow_call_seconds=settings.circuit_slow_call_seconds,
+        open_seconds=settings.circuit_open_seconds,
+    )
+
+    try:
+        ctx = build_context(settings, logger)
+        try:
+            ctx.notifier.close()
+            ctx.notifier = DiscardingNotifier()
+            ctx.claims.close()
+            ctx.claims = claims = ReplayClaims(clock, _price, ctx.mids, limit=settings.claim_batch_size)
+            reconcile_ledger(ctx)
+            ctx.refresher.start(logger)
+
+            upcoming = deque(positions)
+            clock.started = time.monotonic()
+            started = clock.started
+
+            while upcoming or claims.ready:
+                now = time.monotonic()
+                while upcoming and clock.due_at(upcoming[0]["recorded_at"]) <= now:
+                    position = upcoming.popleft()
+                    claims.put(position, clock.due_at(position["recorded_at"]))
+
+                if not claims.ready:
+                    time.sleep(max(0.0, clock.due_at(upcoming[0]["recorded_at"]) - now))
+                    continue
+
+                fills_before = len(exchange.fills)
+                run_single_cycle(ctx)
+                _match_fills(claims.batch, exchange.fills[fills_before:])
+
+                unavailable = unavailable_for_seconds()
+                if unavailable > 0:
+                    # Как основной цикл: пока биржа отключена автоматом, очередь не разбирается
+                    time.sleep(unavailable)
+
+            elapsed = time.monotonic() - started
+        finally:
+            close_context(ctx)
+    finally:
+        exchange.stop()
+
+    return _build_report(positions, claims.signals, exchange, prices, claims.queue_delays, claims.backlogs, elapsed, ctx)
+
+
+def _match_fills(batch: List[Dict[str, Any]], fills: List[Dict[str, Any]]) -> None:
+    """
+    Сопоставляет исполнения цикла его сигналам.
+
+    Реестр позиций пропускает повторы (coin, side) внутри цикла, поэтому
+    исполнение по ключу принадлежит первому ещё не исполненному сигналу цикла.
+    """
+    for fill in fills:
+        side = "LONG" if fill["is_buy"] else "SHORT"
+        for item in batch:
+            position = item["position"]
+            if "fill" not in item and position["coin"] == fill["coin"] and position.get("side") == side:
+                item["fill"] = fill
+                break
+
+
+def _build_report(
+    positions: List[Dict[str, Any]],
+    signals: List[Dict[str, Any]],
+    exchange: SimulatedExchange,
+    prices: PriceSeries,
+    queue_delays: List[float],
+    backlogs: List[int],
+    elapsed: float,
+    ctx
+) -> Dict[str, Any]:
+    latencies = []
+    slippage_entry = []
+    slippage_signal = []
+    for item in signals:
+        fill = item.get("fill")
+        if fill is None:
+            continue
+        position = item["position"]
+        direction = 1 if fill["is_buy"] else -1
+        latencies.append(fill["at"] - item["due_at"])
+
+        entry_price = float(position.get("entry_price") or 0)
+        if entry_price:
+            slippage_entry.append((fill["px"] - entry_price) / entry_price * 10_000 * direction)
+        if prices.has(position["coin"]):
+            signal_price = prices.price_at(position["coin"], position["recorded_at"])
+            slippage_signal.append((fill["px"] - signal_price) / signal_price * 10_000 * direction)
+
+    recorded_span = positions[-1]["recorded_at"] - positions[0]["recorded_at"]
+    outcomes = ctx.metrics.signals
+
+    def _stats(values: List[float]) -> Dict[str, Any]:
+        return {
+            "p50": percentile(values, 50),
+            "p99": percentile(values, 99),
+            "max": max(values) if values else None,
+            "mean": sum(values) / len(values) if values else None,
+            "count": len(values),
+        }
+
+    return {
+        "signals": len(positions),
+        "filled": len(latencies),
+        "outcomes": {
+            outcome: outcomes.value(outcome=outcome)
+            for outcome in ("opened", "skipped", "expired", "failed", "unknown", "released")
+        },
+        "recorded_span_seconds": recorded_span,
+        "replay_seconds": elapsed,
+        "signals_per_sec": len(positions) / elapsed if elapsed else None,
+        # Задержка от поступления сигнала до исполнения, включая ожидание в очереди
+        "latency_seconds": _stats(latencies),
+        "queue_delay_seconds": _stats(queue_delays),
+        "max_backlog": max(backlogs) if backlogs else 0,
+        # Положительное значение — исполнение хуже цены (для LONG дороже, для SHORT дешевле)
+        "slippage_vs_entry_bps": _stats(slippage_entry),
+        "slippage_vs_signal_price_bps": _stats(slippage_signal),
+        "exchange_requests": dict(exchange.requests),
+    }
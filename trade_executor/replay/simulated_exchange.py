@@ -0,0 +1,205 @@
+"""
+Модуль симулированной биржи: HTTP-заглушка /info и /exchange Hyperliquid.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Tuple
+
+_NO_MATCH_ERROR = "Order could not immediately match against any resting orders. asset={asset}"
+
+
+class SimulatedExchange:
+    """
+    Локальный HTTP-сервер в формате API Hyperliquid в фоновом потоке.
+
+    Отвечает настолько, насколько это нужно SDK и executor: meta, spotMeta,
+    allMids, clearinghouseState, действия order и updateLeverage. Цена монеты
+    берётся из price_at(coin) в момент запроса; IoC-ордер исполняется по ней
+    целиком, если она не хуже лимитной цены ордера, иначе отклоняется.
+    Позиции аккаунта ведутся по исполнениям. Задержка ответа и отказы
+    (отклонение ордера, 500 на /exchange) настраиваются.
+    """
+
+    def __init__(
+        self,
+        coins: List[str],
+        price_at: Callable[[str], float],
+        sz_decimals: Dict[str, int] | None = None,
+        max_leverage: int = 50,
+        account_value: float = 1_000_000.0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        reject_rate: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None
+    ):
+        """
+        Args:
+            coins: Монеты perp-вселенной (индекс монеты = индекс в списке).
+            price_at: Текущая цена монеты.
+            sz_decimals: szDecimals монет (по умолчанию 2).
+            max_leverage: maxLeverage всех монет.
+            account_value: Баланс аккаунта в clearinghouseState.
+            latency_ms: Задержка ответа на каждый запрос (мс).
+            jitter_ms: Случайная добавка к задержке, от 0 до jitter_ms (мс).
+            reject_rate: Доля ордеров, отклоняемых биржей.
+            error_rate: Доля запросов /exchange, отвечающих 500.
+            seed: Seed генератора случайных чисел.
+        """
+        self.coins = list(coins)
+        self.price_at = price_at
+        self.sz_decimals = sz_decimals or {}
+        self.max_leverage = max_leverage
+        self.account_value = account_value
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.reject_rate = reject_rate
+        self.error_rate = error_rate
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._next_oid = 1
+        self._server: ThreadingHTTPServer | None = None
+        # coin -> szi (знаковый размер позиции)
+        self._positions: Dict[str, float] = {}
+        self.requests: Dict[str, int] = {}
+        self.fills: List[Dict[str, Any]] = []
+
+    @property
+    def url(self) -> str:
+        """Базовый URL (аналог https://api.hyperliquid.xyz)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Запускает сервер в фоновом потоке."""
+        exchange = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                status, body = exchange.handle(self.path, payload)
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="simulated-exchange", daemon=True).start()
+
+    def stop(self) -> None:
+        """Останавливает сервер."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def handle(self, path: str, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        """
+        Обрабатывает один запрос.
+
+        Args:
+            path: Путь (/info или /exchange).
+            payload: Тело запроса.
+
+        Returns:
+            (HTTP статус, тело ответа).
+        """
+        kind = payload.get("type") or payload.get("action", {}).get("type", "")
+        with self._lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+            delay = self.latency_ms + self._random.random() * self.jitter_ms
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        if path == "/info":
+            return 200, self._info(payload)
+        if path == "/exchange":
+            with self._lock:
+                failed = self._random.random() < self.error_rate
+            if failed:
+                return 500, {"error": "injected failure"}
+            return 200, self._exchange(payload["action"])
+        return 404, {"error": f"unknown path {path}"}
+
+    def _info(self, payload: Dict[str, Any]) -> Any:
+        kind = payload.get("type")
+        if kind == "meta":
+            return {
+                "universe": [
+                    {"name": coin, "szDecimals": self.sz_decimals.get(coin, 2), "maxLeverage": self.max_leverage}
+                    for coin in self.coins
+                ]
+            }
+        if kind == "spotMeta":
+            return {"tokens": [], "universe": []}
+        if kind == "allMids":
+            return {coin: str(self.price_at(coin)) for coin in self.coins}
+        if kind == "clearinghouseState":
+            return self._clearinghouse_state()
+        return None
+
+    def _clearinghouse_state(self) -> Dict[str, Any]:
+        value = str(self.account_value)
+        with self._lock:
+            positions = [
+                {"type": "oneWay", "position": {"coin": coin, "szi": str(szi), "leverage": {"type": "cross", "value": 1}}}
+                for coin, szi in self._positions.items()
+                if szi != 0
+            ]
+        summary = {"accountValue": value, "totalMarginUsed": "0", "totalNtlPos": "0", "totalRawUsd": value}
+        return {
+            "marginSummary": summary,
+            "crossMarginSummary": summary,
+            "withdrawable": value,
+            "assetPositions": positions,
+        }
+
+    def _exchange(self, action: Dict[str, Any]) -> Any:
+        if action.get("type") == "updateLeverage":
+            return {"status": "ok", "response": {"type": "default"}}
+        if action.get("type") != "order":
+            return {"status": "err", "response": f"Unsupported action {action.get('type')}"}
+
+        statuses = [self._fill(order) for order in action.get("orders", [])]
+        return {"status": "ok", "response": {"type": "order", "data": {"statuses": statuses}}}
+
+    def _fill(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        asset = order["a"]
+        coin = self.coins[asset]
+        is_buy = order["b"]
+        size = float(order["s"])
+        price = self.price_at(coin)
+
+        with self._lock:
+            if self._random.random() < self.reject_rate:
+                return {"error": "Injected rejection"}
+            # IoC по лимитной цене: исполняется, только если рынок не хуже лимита
+            if (is_buy and price > float(order["p"])) or (not is_buy and price < float(order["p"])):
+                return {"error": _NO_MATCH_ERROR.format(asset=asset)}
+
+            oid = self._next_oid
+            self._next_oid += 1
+            self._positions[coin] = self._positions.get(coin, 0.0) + (size if is_buy else -size)
+            self.fills.append({
+                "oid": oid,
+                "coin": coin,
+                "is_buy": is_buy,
+                "sz": size,
+                "px": price,
+                "at": time.monotonic(),
+            })
+        return {"filled": {"totalSz": order["s"], "avgPx": str(price), "oid": oid}}
@@ -0,0 +1,110 @@
+"""
+CLI воспроизведения записанного потока new_positions на симулированной бирже.
+
+Пример:
+
+    python -m trade_executor.replay_cli signals.jsonl --prices prices.csv --speed 120
+"""
+
+import argparse
+import json
+import logging
+import os
+
+from .config.get_settings import build_settings
+from .config.load_env import load_environment
+from .replay.load_recorded_positions import load_recorded_positions
+from .replay.price_series import PriceSeries
+from .replay.run_replay import run_replay
+from .utils.get_logger import get_logger
+
+# Заглушки обязательных переменных: replay не ходит ни в базу, ни в Telegram,
+# а ордера подписывает ключом, который знает только симулированная биржа
+_REPLAY_DEFAULTS = {
+    "DATABASE_URL": "postgresql://replay",
+    "HYPERLIQUID_PRIVATE_KEY": "0x" + "11" * 32,
+    "WALLET_ADDRESS": "0x0000000000000000000000000000000000000000",
+    "TELEGRAM_BOT_TOKEN": "replay",
+    "TELEGRAM_CHAT_ID": "0",
+}
+
+
+def _format_ms(stats) -> str:
+    if not stats["count"]:
+        return "нет данных"
+    return f"p50 {stats['p50'] * 1000:.1f} ms, p99 {stats['p99'] * 1000:.1f} ms, max {stats['max'] * 1000:.1f} ms"
+
+
+def _format_bps(stats) -> str:
+    if not stats["count"]:
+        return "нет данных"
+    return f"p50 {stats['p50']:.1f} bps, среднее {stats['mean']:.1f} bps, p99 {stats['p99']:.1f} bps"
+
+
+def main():
+    """Воспроизводит записанные сигналы и печатает отчёт."""
+    parser = argparse.ArgumentParser(description="Воспроизведение new_positions на симулированной бирже")
+    parser.add_argument("signals", help="Записанные строки new_positions (JSON Lines или CSV)")
+    parser.add_argument("--prices", help="Ряд цен: time, coin, price (CSV или JSON Lines)")
+    parser.add_argument("--speed", type=float, default=60.0, help="Во сколько раз сжимать паузы между сигналами")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Задержка ответа биржи")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="Случайная добавка к задержке")
+    parser.add_argument("--reject-rate", type=float, default=0.0, help="Доля отклоняемых ордеров")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Доля ответов 500 на /exchange")
+    parser.add_argument("--account-value", type=float, default=100_000.0, help="Баланс аккаунта")
+    parser.add_argument("--meta", help="Ответ /info meta в JSON для szDecimals монет")
+    parser.add_argument("--concurrency", type=int, help="MAX_CONCURRENT_SIGNALS (по умолчанию из окружения)")
+    parser.add_argument("--no-bulk", action="store_true", help="Отключить пакетную отправку ордеров")
+    parser.add_argument("--output", help="Куда сохранить отчёт в JSON")
+    args = parser.parse_args()
+
+    load_environment()
+    for name, value in _REPLAY_DEFAULTS.items():
+        os.environ.setdefault(name, value)
+    settings = build_settings()
+    if args.concurrency:
+        settings.max_concurrent_signals = args.concurrency
+    if args.no_bulk:
+        settings.bulk_orders_enabled = False
+
+    logger = get_logger("trade_executor.replay")
+    logger.setLevel(logging.WARNING)
+
+    positions = load_recorded_positions(args.signals)
+    prices = PriceSeries.load(args.prices) if args.prices else PriceSeries()
+
+    sz_decimals = None
+    if args.meta:
+        with open(args.meta, encoding="utf-8") as file:
+            meta = json.load(file)
+        sz_decimals = {asset["name"]: asset["szDecimals"] for asset in meta["universe"]}
+
+    report = run_replay(
+        positions,
+        prices,
+        settings,
+        logger,
+        speed=args.speed,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        reject_rate=args.reject_rate,
+        error_rate=args.error_rate,
+        account_value=args.account_value,
+        sz_decimals=sz_decimals,
+    )
+
+    print(f"Сигналов: {report['signals']}, исполнено: {report['filled']}, итоги: {report['outcomes']}")
+    print(f"Записано за {report['recorded_span_seconds']:.1f} сек, воспроизведено за {report['replay_seconds']:.1f} сек "
+          f"({report['signals_per_sec']:.1f} сигналов/сек)")
+    print(f"Задержка до исполнения: {_format_ms(report['latency_seconds'])}")
+    print(f"Ожидание в очереди: {_format_ms(report['queue_delay_seconds'])}, максимум в очереди: {report['max_backlog']}")
+    print(f"Проскальзывание к entry_price: {_format_bps(report['slippage_vs_entry_bps'])}")
+    print(f"Проскальзывание к цене в момент сигнала: {_format_bps(report['slippage_vs_signal_price_bps'])}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Модуль фоновой очереди уведомлений в Telegram.
+"""
+
+import queue
+import threading
+import time
+from typing import List, Tuple
+
+import requests
+
+from ..metrics.executor_metrics import ExecutorMetrics, STAGE_TELEGRAM
+from ..utils.circuit_breaker import CircuitOpenError
+from .send_notification import send_telegram_message, telegram_breaker
+
+# Telegram режет сообщения длиннее 4096 символов
+_MAX_MESSAGE_LENGTH = 4096
+
+
+class NotificationQueue:
+    """
+    Очередь уведомлений, которую разбирает фоновый поток.
+
+    Торговый путь только кладёт текст в очередь и не ждёт Telegram.
+    Отправитель склеивает накопившиеся сообщения в одно, держит паузу
+    min_interval_seconds между отправками в чат, на 429 ждёт retry_after
+    из ответа, на прочие ошибки — экспоненциальный backoff. Пока
+    автомат Telegram разомкнут, сообщение ждёт, не тратя попыток, но не
+    дольше circuit_max_wait_seconds и не после close(): дальше оно
+    считается неотправленным (failed), и поток берёт следующее.
+    """
+
+    def __init__(
+        self,
+        bot_token: str,
+        chat_id: str,
+        timeout: int = 10,
+        min_interval_seconds: float = 1.0,
+        coalesce_seconds: float = 0.5,
+        max_retries: int = 5,
+        circuit_max_wait_seconds: float = 300.0,
+        logger=None,
+        metrics: ExecutorMetrics | None = None
+    ):
+        """
+        Args:
+            bot_token: Токен Telegram бота.
+            chat_id: ID чата для отправки.
+            timeout: Таймаут запроса.
+            min_interval_seconds: Минимальная пауза между сообщениями в чат.
+            coalesce_seconds: Сколько ждать после первого сообщения, собирая пачку.
+            max_retries: Сколько раз повторять отправку пачки.
+            circuit_max_wait_seconds: Сколько сообщение ждёт замыкания автомата Telegram.
+            logger: Logger (опционально).
+            metrics: Метрики executor (опционально).
+        """
+        self.bot_token = bot_token
+        self.chat_id = chat_id
+        self.timeout = timeout
+        self.min_interval_seconds = min_interval_seconds
+        self.coalesce_seconds = coalesce_seconds
+        self.max_retries = max_retries
+        self.circuit_max_wait_seconds = circuit_max_wait_seconds
+        self._logger = logger
+        self._metrics = metrics
+
+        # (момент постановки в очередь, текст) или None для остановки
+        self._queue: "queue.Queue[Tuple[float, str] | None]" = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._last_sent_at = 0.0
+
+    def start(self) -> None:
+        """Запускает фоновый поток отправки."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="telegram-sender", daemon=True)
+        self._thread.start()
+
+    def put(self, message: str) -> None:
+        """
+        Кладёт сообщение в очередь. Не блокирует.
+
+        Args:
+            message: Текст сообщения.
+        """
+        self._queue.put((time.monotonic(), message))
+
+    def close(self, timeout: float = 30.0) -> None:
+        """
+        Отправляет всё, что осталось в очереди, и останавливает поток.
+
+        Сообщения, ждущие замыкания автомата Telegram, не досылаются:
+        ожидание прерывается, и они учитываются как failed.
+
+        Args:
+            timeout: Сколько максимум ждать досылки.
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    @property
+    def depth(self) -> int:
+        """Число сообщений в очереди."""
+        return self._queue.qsize()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            # Собираем пачку: всё, что пришло за coalesce_seconds
+            batch = [first]
+            deadline = time.monotonic() + self.coalesce_seconds
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            for text in self._coalesce([message for _, message in batch]):
+                self._send_with_retry(text)
+
+            if self._metrics is not None:
+                # Задержка от постановки в очередь до отправки всей пачки
+                sent_at = time.monotonic()
+                for enqueued_at, _ in batch:
+                    self._metrics.observe_stage(STAGE_TELEGRAM, sent_at - enqueued_at)
+
+    def _coalesce(self, batch: List[str]) -> List[str]:
+        # Склеиваем сообщения, не превышая лимит длины Telegram
+        texts = []
+        current = ""
+        for message in batch:
+            candidate = f"{current}\n\n{message}" if current else message
+            if current and len(candidate) > _MAX_MESSAGE_LENGTH:
+                texts.append(current)
+                current = message
+            else:
+                current = candidate
+        if current:
+            texts.append(current)
+        return texts
+
+    def _send_with_retry(self, text: str) -> None:
+        delay = 1.0
+        attempt = 1
+        circuit_deadline = None
+        while attempt <= self.max_retries:
+            # Пауза между сообщениями в один чат
+            wait = self.min_interval_seconds - (time.monotonic() - self._last_sent_at)
+            if wait > 0:
+                time.sleep(wait)
+
+            try:
+                send_telegram_message(
+                    bot_token=self.bot_token,
+                    chat_id=self.chat_id,
+                    message=text,
+                    timeout=self.timeout
+                )
+                self._last_sent_at = time.monotonic()
+                self._count("sent")
+                if self._logger is not None:
+                    self._logger.info("Уведомление отправлено в Telegram")
+                return
+            except CircuitOpenError:
+                # Telegram отключён автоматом: сообщение ждёт пробного запроса, попытка не тратится
+                now = time.monotonic()
+                if circuit_deadline is None:
+                    circuit_deadline = now + self.circuit_max_wait_seconds
+                wait = min(max(telegram_breaker().retry_in, self.min_interval_seconds), circuit_deadline - now)
+                if wait <= 0 or self._stop_event.wait(wait):
+                    self._count("failed")
+                    if self._logger is not None:
+                        self._logger.error("Уведомление в Telegram не отправлено: автомат Telegram разомкнут.")
+                    return
+                continue
+            except requests.HTTPError as e:
+                self._last_sent_at = time.monotonic()
+                status_code = e.response.status_code if e.response is not None else None
+                if status_code is not None and 400 <= status_code < 500 and status_code != 429:
+                    # Ошибка в самом запросе (токен, chat_id, разметка) — повтор не поможет
+                    self._count("failed")
+                    if self._logger is not None:
+                        self._logger.error(f"Ошибка отправки уведомления в Telegram: {e}")
+                    return
+                retry_after = _get_retry_after(e.response)
+                if retry_after is not None:
+                    # 429: Telegram сам говорит, сколько ждать
+                    delay = retry_after
+                error = e
+            except Exception as e:
+                self._last_sent_at = time.monotonic()
+                error = e
+
+            if self._logger is not None:
+                self._logger.error(f"Ошибка отправки уведомления в Telegram (попытка {attempt}): {error}")
+            if attempt < self.max_retries:
+                self._count("retry")
+                time.sleep(delay)
+                delay = min(delay * 2, 60.0)
+            attempt += 1
+
+        self._count("failed")
+        if self._logger is not None:
+            self._logger.error("Уведомление в Telegram не отправлено, попытки исчерпаны.")
+
+    def _count(self, result: str) -> None:
+        if self._metrics is not None:
+            self._metrics.telegram.inc(result=result)
+
+
+def _get_retry_after(response: requests.Response | None) -> float | None:
+    """Достаёт parameters.retry_after из ответа 429."""
+    if response is None or response.status_code != 429:
+        return None
+    try:
+        return float(response.json().get("parameters", {}).get("retry_after"))
+    except (ValueError, TypeError, AttributeError):
+        return None
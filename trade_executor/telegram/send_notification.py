@@ -2,9 +2,18 @@
 Модуль отправки уведомлений в Telegram.
 """
 
-import requests
 from typing import Dict, Any
 
+from ..utils.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from ..utils.http_client import get_http_client
+
+TELEGRAM_ENDPOINT = "telegram"
+
+
+def telegram_breaker() -> CircuitBreaker:
+    """Автомат отключения Telegram Bot API."""
+    return get_circuit_breaker(TELEGRAM_ENDPOINT)
+
 
 def send_telegram_message(bot_token: str, chat_id: str, message: str, timeout: int = 10) -> Dict[str, Any]:
     """
@@ -18,6 +27,9 @@ def send_telegram_message(bot_token: str, chat_id: str, message: str, timeout: i
 
     Returns:
         Ответ от Telegram API.
+
+    Raises:
+        CircuitOpenError: Если Telegram отключён автоматом.
     """
     url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
     payload = {
@@ -26,27 +38,52 @@ def send_telegram_message(bot_token: str, chat_id: str, message: str, timeout: i
         "parse_mode": "HTML"
     }
 
-    response = requests.post(url, json=payload, timeout=timeout)
-    response.raise_for_status()
+    # sendMessage не идемпотентен: повтор дошедшего запроса продублирует сообщение
+    with telegram_breaker().guard():
+        response = get_http_client().post(url, json=payload, idempotent=False, timeout=timeout)
+        response.raise_for_status()
     return response.json()
 
 
-def format_position_notification(coin: str, side: str, size_usd: float, leverage: int, success: bool) -> str:
+def format_position_notification(
+    coin: str,
+    side: str,
+    size_usd: float,
+    leverage: int,
+    success: bool,
+    filled_sz: float | None = None,
+    avg_px: float | None = None,
+    partial: bool = False,
+    unknown: bool = False,
+    resolved: bool = False
+) -> str:
     """
     Форматирует сообщение об открытии позиции.
 
     Args:
         coin: Монета.
         side: Направление (LONG/SHORT).
-        size_usd: Размер в USD.
+        size_usd: Запрошенный размер в USD.
         leverage: Плечо.
         success: Успешно ли открыта позиция.
+        filled_sz: Исполненный объём в монетах (None — не показывать).
+        avg_px: Средняя цена исполнения.
+        partial: Ордер исполнен не полностью.
+        unknown: Ответ биржи не получен, исход ордера неизвестен.
+        resolved: Исход ордера без ответа уточнён по orderStatus
+            (исправление уведомления с unknown).
 
     Returns:
         Форматированное сообщение для Telegram.
     """
     status_emoji = "✅" if success else "❌"
     status_text = "ОТКРЫТА" if success else "ОШИБКА"
+    if success and partial:
+        status_emoji, status_text = "⚠️", "ОТКРЫТА ЧАСТИЧНО"
+    if unknown:
+        status_emoji, status_text = "❓", "НЕ ПОДТВЕРЖДЕНА (нет ответа биржи)"
+    if resolved:
+        status_text += " (уточнено по статусу ордера)"
 
     message = f"""
 {status_emoji} <b>Позиция {status_text}</b>
@@ -57,5 +94,11 @@ def format_position_notification(coin: str, side: str, size_usd: float, leverage
 <b>Плечо:</b> {leverage}x
     """.strip()
 
+    if filled_sz is not None and success:
+        if avg_px:
+            message += f"\n<b>Исполнено:</b> {filled_sz:g} {coin} по {avg_px:g} (${filled_sz * avg_px:.2f})"
+        else:
+            message += f"\n<b>Исполнено:</b> {filled_sz:g} {coin}"
+
     return message
 
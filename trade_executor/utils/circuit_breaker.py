@@ -0,0 +1,226 @@
+"""
+Модуль автоматов отключения (circuit breaker) для внешних эндпоинтов.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+_breakers: Dict[str, "CircuitBreaker"] = {}
+_defaults: Dict[str, Any] = {}
+_breakers_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """Эндпоинт отключён автоматом: запрос не отправлялся."""
+
+
+def is_endpoint_failure(error: BaseException) -> bool:
+    """
+    Считается ли ошибка отказом эндпоинта.
+
+    Ошибки самого запроса (4xx, кроме 429) говорят о запросе, а не о
+    состоянии сервиса, и автомат не размыкают.
+
+    Args:
+        error: Исключение вызова.
+    """
+    if not isinstance(error, Exception):
+        # KeyboardInterrupt и т.п. — не про эндпоинт
+        return False
+    # requests.HTTPError хранит ответ, ошибки SDK — сам код
+    status_code = getattr(getattr(error, "response", None), "status_code", None)
+    if status_code is None:
+        status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code >= 500 or status_code == 429
+    return True
+
+
+class CircuitBreaker:
+    """
+    Автомат отключения эндпоинта по доле ошибок и медленных ответов.
+
+    Замкнут: запросы идут, исход последних window_size запросов
+    запоминается (ошибка или ответ дольше slow_call_seconds — неудача).
+    Размыкается, когда неудач не меньше failure_rate при хотя бы
+    min_calls запросах в окне. Разомкнут: запросы сразу получают
+    CircuitOpenError, не тратя таймаут. Через open_seconds пропускает
+    один пробный запрос (half-open): успех замыкает автомат, неудача
+    размыкает его снова.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 5.0,
+        open_seconds: float = 5.0
+    ):
+        """
+        Args:
+            name: Имя эндпоинта (метка в логах и метриках).
+            window_size: Сколько последних запросов учитывать.
+            min_calls: Минимум запросов в окне для размыкания.
+            failure_rate: Доля неудач, при которой автомат размыкается.
+            slow_call_seconds: Ответ дольше этого считается неудачей (0 — не учитывать).
+            open_seconds: Сколько автомат разомкнут до пробного запроса.
+        """
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+
+        self._lock = threading.Lock()
+        self._outcomes: deque = deque(maxlen=window_size)
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._metrics = None
+        self._logger = None
+
+    def attach(self, metrics, logger=None) -> None:
+        """
+        Подключает метрики и логирование переходов.
+
+        Args:
+            metrics: Метрики executor.
+            logger: Logger (опционально).
+        """
+        self._metrics = metrics
+        self._logger = logger
+
+    @property
+    def state(self) -> str:
+        """Состояние автомата: closed, open или half_open."""
+        with self._lock:
+            if self._state == STATE_OPEN and self.retry_in <= 0:
+                return STATE_HALF_OPEN
+            return self._state
+
+    @property
+    def retry_in(self) -> float:
+        """Через сколько секунд разомкнутый автомат пропустит пробный запрос."""
+        if self._state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    @property
+    def is_open(self) -> bool:
+        """Запросы сейчас отклоняются без отправки."""
+        return self.state == STATE_OPEN
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """
+        Пропускает вызов через автомат и учитывает его исход.
+
+        Raises:
+            CircuitOpenError: Если автомат разомкнут.
+        """
+        self._before_call()
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self._after_call(success=not is_endpoint_failure(e))
+            raise
+        elapsed = time.monotonic() - started
+        self._after_call(success=not (self.slow_call_seconds and elapsed > self.slow_call_seconds))
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return
+            if self._state == STATE_OPEN and self.retry_in > 0:
+                rejected = True
+            elif self._probe_in_flight:
+                # Пробный запрос уже идёт — остальные ждут его исхода
+                rejected = True
+            else:
+                self._transition(STATE_HALF_OPEN)
+                self._probe_in_flight = True
+                rejected = False
+
+        if rejected:
+            if self._metrics is not None:
+                self._metrics.circuit_rejected.inc(endpoint=self.name)
+            raise CircuitOpenError(f"Эндпоинт {self.name} отключён автоматом после серии ошибок")
+
+    def _after_call(self, success: bool) -> None:
+        with self._lock:
+            if self._state == STATE_HALF_OPEN:
+                self._probe_in_flight = False
+                if success:
+                    self._outcomes.clear()
+                    self._transition(STATE_CLOSED)
+                else:
+                    self._open()
+                return
+
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (
+                self._state == STATE_CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._open()
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._transition(STATE_OPEN)
+
+    def _transition(self, state: str) -> None:
+        if state == self._state:
+            return
+        self._state = state
+        if self._metrics is not None:
+            self._metrics.circuit_transitions.inc(endpoint=self.name, state=state)
+        if self._logger is not None:
+            self._logger.warning(f"Автомат {self.name}: {state}")
+
+
+def init_circuit_breakers(**params: Any) -> None:
+    """
+    Задаёт параметры автоматов, создаваемых get_circuit_breaker.
+
+    Args:
+        **params: Аргументы CircuitBreaker (window_size, failure_rate, ...).
+    """
+    with _breakers_lock:
+        _defaults.update(params)
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """
+    Автомат эндпоинта (создаётся при первом обращении).
+
+    Args:
+        name: Имя эндпоинта.
+
+    Returns:
+        Общий для процесса автомат.
+    """
+    breaker = _breakers.get(name)
+    if breaker is not None:
+        return breaker
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **_defaults)
+        return _breakers[name]
+
+
+def get_circuit_breakers() -> List[CircuitBreaker]:
+    """Все созданные автоматы."""
+    with _breakers_lock:
+        return list(_breakers.values())
@@ -2,36 +2,185 @@
 Модуль настройки логирования.
 """
 
+import json
 import logging
+import queue
+import random
 import sys
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import List
 
+# Атрибуты, которые есть у любой LogRecord; остальные пришли через extra
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
 
-def get_logger(name: str) -> logging.Logger:
+# Как часто напоминать в stderr о выброшенных записях (сек)
+_DROP_WARNING_INTERVAL = 60.0
+
+_listeners: List[QueueListener] = []
+_queue_handlers: List["_DeferredQueueHandler"] = []
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Одна JSON-строка на запись: время, уровень, logger, сообщение и поля
+    из extra (signal_id, coin, stage, seconds и т.п.) отдельными ключами.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DebugSampler(logging.Filter):
+    """Пропускает только долю sample_rate записей DEBUG; записи выше уровнем — все."""
+
+    def __init__(self, sample_rate: float):
+        """
+        Args:
+            sample_rate: Доля пропускаемых записей DEBUG (1 — все, 0 — ни одной).
+        """
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.sample_rate >= 1:
+            return True
+        return random.random() < self.sample_rate
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler без форматирования в вызывающем потоке.
+
+    Стандартный prepare() собирает сообщение до постановки в очередь —
+    вся работа остаётся на горячем пути. Здесь запись уходит как есть и
+    форматируется потоком QueueListener; аргументы записи после вызова
+    logger не изменяются. При переполненной очереди запись выбрасывается,
+    а не блокирует обработку сигнала: выброшенные записи считаются в
+    метрике (attach_logging_metrics) и не чаще раза в минуту упоминаются
+    в stderr — мимо переполненного лога.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.metrics = None
+        self._warned_at = 0.0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # enqueue вызывается под блокировкой handler
+            self.dropped += 1
+            if self.metrics is not None:
+                self.metrics.log_records_dropped.inc()
+            now = time.monotonic()
+            if now - self._warned_at >= _DROP_WARNING_INTERVAL:
+                self._warned_at = now
+                sys.stderr.write(f"Очередь логирования переполнена, выброшено записей: {self.dropped}\n")
+
+
+class _DrainingQueueListener(QueueListener):
+    """QueueListener, который при остановке ждёт место в очереди, а не падает на полной."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+def get_logger(
+    name: str,
+    level: str = "INFO",
+    json_format: bool = False,
+    use_queue: bool = False,
+    debug_sample_rate: float = 1.0,
+    queue_size: int = 10_000
+) -> logging.Logger:
     """
     Создаёт и настраивает logger с выводом в stdout.
 
+    В режиме очереди вызов logger только кладёт запись в очередь, а
+    форматирование и запись в stdout делает фоновый поток (останавливается
+    close_logging).
+
     Args:
         name: Имя логгера.
+        level: Уровень логирования (DEBUG, INFO, WARNING, ...).
+        json_format: Писать записи JSON-строками.
+        use_queue: Писать в stdout из фонового потока.
+        debug_sample_rate: Доля записей DEBUG, попадающих в лог.
+        queue_size: Сколько записей держать в очереди до выбрасывания.
 
     Returns:
         Настроенный logger.
     """
     logger = logging.getLogger(name)
-    
+
     # Отключаем propagate, чтобы избежать дублирования с root logger
     logger.propagate = False
 
     if not logger.handlers:
-        logger.setLevel(logging.INFO)
+        # Уровень на logger: отброшенные записи не создаются и не форматируются
+        logger.setLevel(level.upper())
         handler = logging.StreamHandler(sys.stdout)
-        handler.setLevel(logging.INFO)
-        # Убираем levelname из формата — Railway красит INFO в красный
-        formatter = logging.Formatter(
-            "%(asctime)s,%(msecs)03d | %(name)s | %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
+        if json_format:
+            formatter = JsonFormatter()
+        else:
+            # Убираем levelname из формата — Railway красит INFO в красный
+            formatter = logging.Formatter(
+                "%(asctime)s,%(msecs)03d | %(name)s | %(message)s",
+                datefmt="%Y-%m-%d %H:%M:%S"
+            )
         handler.setFormatter(formatter)
-        logger.addHandler(handler)
+
+        if use_queue:
+            log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+            front: logging.Handler = _DeferredQueueHandler(log_queue)
+            listener = _DrainingQueueListener(log_queue, handler)
+            listener.start()
+            _listeners.append(listener)
+            _queue_handlers.append(front)
+        else:
+            front = handler
+        if debug_sample_rate < 1:
+            front.addFilter(DebugSampler(debug_sample_rate))
+        logger.addHandler(front)
 
     return logger
 
+
+def attach_logging_metrics(metrics) -> None:
+    """
+    Публикует число выброшенных записей лога в метриках.
+
+    Args:
+        metrics: Метрики executor (ExecutorMetrics).
+    """
+    for handler in _queue_handlers:
+        with handler.lock:
+            handler.metrics = metrics
+            # Выброшенные до подключения метрик
+            if handler.dropped:
+                metrics.log_records_dropped.inc(handler.dropped)
+
+
+def close_logging() -> None:
+    """Дописывает записи из очереди и останавливает фоновый поток логирования."""
+    while _listeners:
+        _listeners.pop().stop()
+    _queue_handlers.clear()
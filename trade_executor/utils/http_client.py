@@ -0,0 +1,176 @@
+"""
+Модуль общего HTTP клиента с keep-alive соединениями и повторами.
+"""
+
+import random
+import threading
+import time
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+# Статусы, после которых идемпотентный запрос имеет смысл повторить
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_client: "HttpClient | None" = None
+_client_lock = threading.Lock()
+
+
+class HttpClient:
+    """
+    Одна requests.Session на процесс: соединения к каждому хосту живут
+    в пуле и переиспользуются, TCP/TLS рукопожатие платится один раз.
+
+    Таймаут раздельный: короткий на подключение, отдельный на ответ.
+    Повторы учитывают идемпотентность запроса: чтение (/info) повторяется
+    при обрыве, таймауте и 429/5xx; неидемпотентный запрос (ордер,
+    сообщение в Telegram) — только если он точно не ушёл на сервер
+    (не удалось подключиться). Пауза между попытками — экспоненциальная
+    со случайным разбросом, чтобы реплики не повторяли запросы синхронно.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 10.0,
+        max_retries: int = 2,
+        backoff_seconds: float = 0.2,
+        max_backoff_seconds: float = 2.0,
+        pool_maxsize: int = 10
+    ):
+        """
+        Args:
+            connect_timeout: Таймаут подключения в секундах.
+            read_timeout: Таймаут ответа в секундах (по умолчанию для запросов).
+            max_retries: Сколько раз повторять запрос после первой попытки.
+            backoff_seconds: Базовая пауза перед первым повтором.
+            max_backoff_seconds: Максимальная пауза между попытками.
+            pool_maxsize: Сколько соединений держать открытыми к одному хосту.
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+
+        self.session = requests.Session()
+        # Повторы делает post(), адаптер их не добавляет
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def post(
+        self,
+        url: str,
+        json: Any = None,
+        idempotent: bool = False,
+        timeout: float | None = None
+    ) -> requests.Response:
+        """
+        Отправляет POST с JSON телом.
+
+        Args:
+            url: Адрес.
+            json: Тело запроса.
+            idempotent: Можно ли безопасно повторить запрос, дошедший до сервера.
+            timeout: Таймаут ответа (по умолчанию read_timeout).
+
+        Returns:
+            Ответ последней попытки (статус не проверяется).
+
+        Raises:
+            requests.RequestException: Если попытки исчерпаны или повтор небезопасен.
+        """
+        timeouts = (self.connect_timeout, timeout or self.read_timeout)
+        attempt = 0
+        while True:
+            try:
+                response = self.session.post(url, json=json, timeout=timeouts)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries or not (idempotent or was_not_sent(e)):
+                    raise
+                self._sleep(attempt, None)
+            else:
+                if not idempotent or response.status_code not in _RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                self._sleep(attempt, response.headers.get("Retry-After"))
+            attempt += 1
+
+    def close(self) -> None:
+        """Закрывает соединения пула."""
+        self.session.close()
+
+    def _sleep(self, attempt: int, retry_after: str | None) -> None:
+        delay = random.uniform(0, min(self.max_backoff_seconds, self.backoff_seconds * 2 ** attempt))
+        if retry_after is not None:
+            try:
+                delay = max(delay, min(float(retry_after), self.max_backoff_seconds))
+            except ValueError:
+                pass
+        time.sleep(delay)
+
+
+def was_not_sent(error: requests.RequestException) -> bool:
+    """
+    Проверяет, что запрос точно не дошёл до сервера: соединение не было установлено.
+
+    Args:
+        error: Ошибка запроса.
+
+    Returns:
+        True если сервер запрос не получал и его можно безопасно повторить.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    # requests оборачивает MaxRetryError, причина — в его reason
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, NewConnectionError)
+
+
+def init_http_client(
+    connect_timeout: float = 3.0,
+    read_timeout: float = 10.0,
+    max_retries: int = 2,
+    pool_maxsize: int = 10
+) -> HttpClient:
+    """
+    Создаёт общий HTTP клиент процесса (если ещё не создан).
+
+    Args:
+        connect_timeout: Таймаут подключения в секундах.
+        read_timeout: Таймаут ответа в секундах.
+        max_retries: Сколько раз повторять запрос после первой попытки.
+        pool_maxsize: Сколько соединений держать открытыми к одному хосту.
+
+    Returns:
+        Общий HTTP клиент.
+    """
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                max_retries=max_retries,
+                pool_maxsize=pool_maxsize,
+            )
+        return _client
+
+
+def get_http_client() -> HttpClient:
+    """Общий HTTP клиент процесса (с настройками по умолчанию, если не создан)."""
+    return _client if _client is not None else init_http_client()
+
+
+def close_http_client() -> None:
+    """Закрывает общий HTTP клиент."""
+    global _client
+
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
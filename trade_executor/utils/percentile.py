@@ -0,0 +1,24 @@
+"""
+Модуль расчёта перцентилей по выборке.
+"""
+
+import math
+from typing import List
+
+
+def percentile(values: List[float], percent: float) -> float | None:
+    """
+    Перцентиль по методу ближайшего ранга.
+
+    Args:
+        values: Наблюдения.
+        percent: Перцентиль от 0 до 100.
+
+    Returns:
+        Значение перцентиля или None для пустого списка.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
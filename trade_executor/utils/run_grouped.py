@@ -0,0 +1,44 @@
+"""
+Модуль параллельной обработки элементов с последовательностью внутри группы.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Hashable, List, TypeVar
+
+T = TypeVar("T")
+
+
+def run_grouped(
+    executor: Executor,
+    items: List[T],
+    key: Callable[[T], Hashable],
+    worker: Callable[[T], Any]
+) -> List[Any]:
+    """
+    Обрабатывает элементы в пуле потоков: разные группы параллельно,
+    элементы одной группы — строго по очереди в исходном порядке.
+
+    Args:
+        executor: Пул, ограничивающий число одновременных задач.
+        items: Элементы для обработки.
+        key: Ключ группы (например, монета сигнала).
+        worker: Обработчик одного элемента. Не должен бросать исключения.
+
+    Returns:
+        Результаты worker в порядке исходных элементов.
+    """
+    groups: Dict[Hashable, List[int]] = OrderedDict()
+    for index, item in enumerate(items):
+        groups.setdefault(key(item), []).append(index)
+
+    def _run_group(indices: List[int]) -> List[Any]:
+        return [worker(items[index]) for index in indices]
+
+    futures = [(executor.submit(_run_group, indices), indices) for indices in groups.values()]
+
+    results: List[Any] = [None] * len(items)
+    for future, indices in futures:
+        for index, result in zip(indices, future.result()):
+            results[index] = result
+    return results